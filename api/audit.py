@@ -0,0 +1,454 @@
+"""
+Journal d'audit medical en ecriture differee (write-behind).
+
+Les consultations (AuditMiddleware: GET reussi d'un objet du dossier
+patient) et les ecritures (signaux post_save/post_delete de suivi_patient,
+appels explicites a auditer() apres bulk_create et QuerySet.update())
+produisent des evenements compacts (horodatage, personnel, action, modele,
+objet, patient) ajoutes a un tampon en memoire: la requete n'attend ni
+Redis ni la base.
+- un thread du processus vide le tampon par lots (AUDIT_BUFFER_SIZE
+  evenements ou toutes les AUDIT_FLUSH_SECONDS) dans une liste Redis;
+- la tache Celery ecrire_journal_audit transfere les lots de Redis vers la
+  table EvenementAudit (bulk_create, partitions mensuelles sur PostgreSQL);
+- si Redis est injoignable, le lot est ecrit directement en base; si la
+  base l'est aussi, il est remis dans le tampon (borne a AUDIT_BUFFER_MAX).
+Le patient d'un evenement est resolu sans requete quand les relations sont
+deja chargees, sinon au moment de l'ecriture (une requete par modele et
+par lot); pour une suppression, avant qu'elle n'aboutisse (une requete par
+modele parent de la cascade).
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import atexit
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone as tz
+
+import orjson
+import redis
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+CLE_REDIS = 'audit:evenements'
+
+_requete_courante = contextvars.ContextVar('audit_requete', default=None)
+
+_tampon = deque()
+_verrou = threading.Lock()
+_reveil = threading.Event()
+_thread = None
+_pid = None
+
+_client = None
+_client_lock = threading.Lock()
+
+# Objets en cours de suppression (pre_delete), resolus en bloc au premier post_delete
+_suppressions = threading.local()
+
+
+def actif():
+    """Vrai si le journal d'audit est active (AUDIT_ENABLED)."""
+    return getattr(settings, 'AUDIT_ENABLED', True)
+
+
+def get_client():
+    """Client Redis adosse a un pool du processus (cree au premier appel)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                timeout = getattr(settings, 'AUDIT_REDIS_TIMEOUT', 0.5)
+                _client = redis.Redis(connection_pool=redis.ConnectionPool.from_url(
+                    settings.AUDIT_REDIS_URL,
+                    socket_connect_timeout=timeout,
+                    socket_timeout=timeout,
+                ))
+    return _client
+
+
+def chemin_patient(modele):
+    """Chemin du modele vers le patient, ou None si le modele n'est pas audite."""
+    from apps.suivi_patient.models.audit import CHEMINS_PATIENT
+
+    return CHEMINS_PATIENT.get(modele._meta.label_lower)
+
+
+def patient_de(instance):
+    """
+    Identifiant du patient d'un objet audite, sans requete: None si une
+    relation intermediaire n'est pas deja chargee.
+    """
+    chemin = chemin_patient(type(instance))
+    if chemin is None:
+        return None
+    if chemin == 'id':
+        return instance.pk
+    *relations, dernier = chemin.split('__')
+    objet = instance
+    for nom in relations:
+        if not objet._meta.get_field(nom).is_cached(objet):
+            return None
+        objet = getattr(objet, nom)
+        if objet is None:
+            return None
+    return getattr(objet, objet._meta.get_field(dernier).attname)
+
+
+def personnel_courant():
+    """Personnel authentifie de la requete en cours, ou None (taches, shell)."""
+    request = _requete_courante.get()
+    utilisateur = getattr(request, 'user', None)
+    if utilisateur is None or not utilisateur.is_authenticated:
+        return None
+    return utilisateur.pk
+
+
+def enregistrer(action, modele, objet_id, id_patient=None, id_personnel=None):
+    """
+    Ajoute un evenement au tampon du processus (sans E/S).
+
+    Args:
+        action (str): consultation, creation, modification ou suppression
+        modele (str): Label du modele ('suivi_patient.patient')
+        objet_id: Cle primaire de l'objet
+        id_patient (int): Patient concerne (resolu a l'ecriture si absent)
+        id_personnel (int): Auteur (defaut: utilisateur de la requete en cours)
+    """
+    if not actif():
+        return
+    if id_personnel is None:
+        id_personnel = personnel_courant()
+    evenement = (time.time(), id_personnel, action, modele, str(objet_id), id_patient)
+    with _verrou:
+        if len(_tampon) >= getattr(settings, 'AUDIT_BUFFER_MAX', 10000):
+            _tampon.popleft()
+            logger.error('Tampon du journal d\'audit plein: evenement le plus ancien perdu')
+        _tampon.append(evenement)
+        plein = len(_tampon) >= getattr(settings, 'AUDIT_BUFFER_SIZE', 200)
+    _demarrer_thread()
+    if plein:
+        _reveil.set()
+
+
+def auditer(action, modele, objets, using=None):
+    """
+    Ajoute au journal, apres la validation de la transaction, les
+    evenements des objets [(objet_id, id_patient)] d'un modele. Pour les
+    ecritures sans signal (bulk_create, QuerySet.update()).
+    """
+    if not actif():
+        return
+    objets = list(objets)
+    if not objets:
+        return
+    id_personnel = personnel_courant()
+
+    def ajouter():
+        for objet_id, id_patient in objets:
+            enregistrer(action, modele, objet_id, id_patient, id_personnel)
+    transaction.on_commit(ajouter, using=using)
+
+
+def auditer_instances(action, instances, using=None):
+    """auditer() pour des instances d'un meme modele (bulk_create)."""
+    instances = list(instances)
+    if instances:
+        auditer(
+            action,
+            instances[0]._meta.label_lower,
+            [(instance.pk, patient_de(instance)) for instance in instances],
+            using,
+        )
+
+
+def _patients_en_bloc(instances):
+    """
+    {(modele, pk): id_patient} d'instances auditees: colonnes deja chargees
+    sinon une requete par modele parent (premiere relation du chemin).
+    """
+    patients = {}
+    par_parent = defaultdict(list)
+    for instance in instances:
+        cle = (instance._meta.label_lower, instance.pk)
+        id_patient = patient_de(instance)
+        chemin = chemin_patient(type(instance))
+        if id_patient is not None or chemin is None or '__' not in chemin:
+            patients[cle] = id_patient
+            continue
+        premiere, reste = chemin.split('__', 1)
+        champ = instance._meta.get_field(premiere)
+        par_parent[(champ.related_model, reste)].append((cle, getattr(instance, champ.attname)))
+
+    for (parent, reste), cles in par_parent.items():
+        valeurs = dict(
+            parent._default_manager.filter(pk__in={id_parent for _, id_parent in cles})
+            .order_by().values_list('pk', reste)
+        )
+        for cle, id_parent in cles:
+            patients[cle] = valeurs.get(id_parent)
+    return patients
+
+
+def preparer_suppression(instance):
+    """pre_delete: l'instance sera resolue avec les autres objets de la suppression."""
+    if actif():
+        if not hasattr(_suppressions, 'en_attente'):
+            _suppressions.en_attente, _suppressions.patients = [], {}
+        _suppressions.en_attente.append(instance)
+
+
+def patient_supprime(instance):
+    """
+    post_delete: patient de l'objet supprime. Au premier appel d'une
+    suppression (cascade comprise), tous les objets annonces par pre_delete
+    sont resolus en bloc: les parents ne sont supprimes qu'apres leurs
+    enfants et existent encore.
+    """
+    en_attente = getattr(_suppressions, 'en_attente', None)
+    if en_attente:
+        _suppressions.patients.update(_patients_en_bloc(en_attente))
+        en_attente.clear()
+    patients = getattr(_suppressions, 'patients', {})
+    return patients.pop((instance._meta.label_lower, instance.pk), patient_de(instance))
+
+
+def enregistrer_consultation(request, response):
+    """
+    Enregistre la consultation d'un objet du dossier patient: GET reussi
+    d'une vue de detail (parametre pk) dont le modele est audite (attribut
+    modele_audite du viewset, sinon modele de son queryset).
+    """
+    match = getattr(request, 'resolver_match', None)
+    if (
+        match is None or 'pk' not in match.kwargs
+        or request.method != 'GET' or not 200 <= response.status_code < 300
+    ):
+        return
+    classe = getattr(match.func, 'cls', None)
+    modele = getattr(classe, 'modele_audite', None)
+    if modele is None:
+        modele = getattr(getattr(classe, 'queryset', None), 'model', None)
+    if modele is None or chemin_patient(modele) is None:
+        return
+    objet_id = str(match.kwargs['pk'])
+    # Consultation d'un patient: l'objet est le patient
+    id_patient = int(objet_id) if chemin_patient(modele) == 'id' and objet_id.isdigit() else None
+    enregistrer('consultation', modele._meta.label_lower, objet_id, id_patient)
+
+
+def _extraire():
+    """Retire et retourne le contenu du tampon."""
+    with _verrou:
+        lot = list(_tampon)
+        _tampon.clear()
+    return lot
+
+
+def _remettre(lot):
+    """Remet un lot non ecrit en tete du tampon (dans la limite de AUDIT_BUFFER_MAX)."""
+    with _verrou:
+        place = max(getattr(settings, 'AUDIT_BUFFER_MAX', 10000) - len(_tampon), 0)
+        if place < len(lot):
+            logger.error('Tampon du journal d\'audit plein: %d evenement(s) perdu(s)', len(lot) - place)
+            lot = lot[len(lot) - place:]
+        _tampon.extendleft(reversed(lot))
+
+
+def vider_tampon():
+    """Envoie le tampon dans Redis, ou directement en base si Redis est injoignable."""
+    lot = _extraire()
+    if not lot:
+        return 0
+    try:
+        get_client().rpush(CLE_REDIS, orjson.dumps(lot))
+        return len(lot)
+    except redis.RedisError as e:
+        logger.warning('Redis injoignable pour le journal d\'audit, ecriture directe: %s', e)
+    try:
+        ecrire_evenements(lot)
+    except Exception:
+        logger.exception('Ecriture du journal d\'audit impossible, lot remis dans le tampon')
+        _remettre(lot)
+        return 0
+    return len(lot)
+
+
+def _boucle():
+    """Corps du thread de vidage."""
+    intervalle = getattr(settings, 'AUDIT_FLUSH_SECONDS', 2)
+    while True:
+        _reveil.wait(intervalle)
+        _reveil.clear()
+        try:
+            vider_tampon()
+        except Exception:
+            logger.exception('Vidage du tampon du journal d\'audit impossible')
+        finally:
+            # Connexion du thread ouverte par l'ecriture directe
+            connections.close_all()
+
+
+def _demarrer_thread():
+    """Demarre le thread de vidage (une fois par processus, y compris apres fork)."""
+    global _thread, _pid
+    if _pid == os.getpid():
+        return
+    with _verrou:
+        if _pid == os.getpid():
+            return
+        _thread = threading.Thread(target=_boucle, name='journal-audit', daemon=True)
+        _thread.start()
+        _pid = os.getpid()
+
+
+def _resoudre_patients(lot):
+    """Complete le patient des evenements qui n'en ont pas (une requete par modele)."""
+    from apps.suivi_patient.models.audit import CHEMINS_PATIENT
+
+    a_resoudre = defaultdict(set)
+    for _, _, _, modele, objet_id, id_patient in lot:
+        if id_patient is None and modele in CHEMINS_PATIENT:
+            a_resoudre[modele].add(objet_id)
+
+    patients = {}
+    for modele, ids in a_resoudre.items():
+        classe = apps.get_model(modele)
+        for pk, id_patient in (
+            classe._default_manager.filter(pk__in=ids).order_by()
+            .values_list('pk', CHEMINS_PATIENT[modele])
+        ):
+            patients[(modele, str(pk))] = id_patient
+    return patients
+
+
+def ecrire_evenements(lot):
+    """
+    Ecrit un lot d'evenements (tuples de enregistrer()) dans la table
+    EvenementAudit.
+
+    Returns:
+        int: Nombre d'evenements ecrits
+    """
+    from apps.suivi_patient.models import EvenementAudit
+
+    patients = _resoudre_patients(lot)
+    evenements = [
+        EvenementAudit(
+            horodatage=datetime.fromtimestamp(horodatage, tz=tz.utc),
+            id_personnel=id_personnel,
+            action=action,
+            modele=modele,
+            objet_id=objet_id,
+            id_patient=id_patient if id_patient is not None else patients.get((modele, objet_id)),
+        )
+        for horodatage, id_personnel, action, modele, objet_id, id_patient in lot
+    ]
+    EvenementAudit.objects.bulk_create(evenements, batch_size=getattr(settings, 'AUDIT_BATCH_SIZE', 1000))
+    return len(evenements)
+
+
+def transferer_vers_base():
+    """
+    Transfere les lots en attente dans Redis vers la base, par paquets de
+    AUDIT_BATCH_SIZE lots. Un paquet non ecrit est remis dans Redis.
+
+    Returns:
+        int: Nombre d'evenements ecrits
+    """
+    client = get_client()
+    taille = getattr(settings, 'AUDIT_BATCH_SIZE', 1000)
+    total = 0
+    while True:
+        # Lecture et retrait atomiques (MULTI): un autre worker ne relit pas ces lots
+        lots, _ = client.pipeline().lrange(CLE_REDIS, 0, taille - 1).ltrim(CLE_REDIS, taille, -1).execute()
+        if not lots:
+            return total
+        try:
+            total += ecrire_evenements([tuple(e) for lot in lots for e in orjson.loads(lot)])
+        except Exception:
+            client.lpush(CLE_REDIS, *reversed(lots))
+            raise
+
+
+def _nom_partition(mois):
+    return f'{_table()}_p{mois:%Y%m}'
+
+
+def _table():
+    from apps.suivi_patient.models import EvenementAudit
+
+    return EvenementAudit._meta.db_table
+
+
+def creer_partitions(mois_a_venir=None):
+    """
+    Cree les partitions mensuelles manquantes (mois courant et mois_a_venir
+    suivants) de la table du journal. PostgreSQL uniquement.
+
+    Returns:
+        list: Noms des partitions creees
+    """
+    if connection.vendor != 'postgresql':
+        return []
+    if mois_a_venir is None:
+        mois_a_venir = getattr(settings, 'AUDIT_PARTITIONS_AHEAD', 3)
+
+    table = _table()
+    creees = []
+    debut = timezone.now().date().replace(day=1)
+    with connection.cursor() as cursor:
+        for _ in range(mois_a_venir + 1):
+            fin = (debut.replace(day=28) + timedelta(days=4)).replace(day=1)
+            nom = _nom_partition(debut)
+            cursor.execute('SELECT to_regclass(%s)', [nom])
+            if cursor.fetchone()[0] is None:
+                cursor.execute(
+                    f"CREATE TABLE {nom} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{debut.isoformat()}') TO ('{fin.isoformat()}')"
+                )
+                creees.append(nom)
+            debut = fin
+    return creees
+
+
+class AuditMiddleware:
+    """
+    Rend la requete en cours disponible aux signaux (auteur des ecritures)
+    et enregistre les consultations d'objets du dossier patient.
+
+    A placer apres AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not actif():
+            return self.get_response(request)
+        jeton = _requete_courante.set(request)
+        try:
+            response = self.get_response(request)
+            enregistrer_consultation(request, response)
+            return response
+        finally:
+            _requete_courante.reset(jeton)
+
+
+@atexit.register
+def _vider_a_l_arret():
+    """Vide le tampon a l'arret du processus."""
+    if _tampon:
+        vider_tampon()
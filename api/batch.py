@@ -0,0 +1,222 @@
+"""
+Endpoint de requetes groupees: POST /api/batch/.
+
+Les ecrans d'accueil (infirmier, medecin) chargent une dizaine de listes
+au demarrage. Un lot execute ces sous-requetes dans le processus, via le
+resolveur d'URL, sans repasser par les middlewares ni par
+l'authentification: l'utilisateur authentifie une seule fois pour le lot
+est transmis a chaque vue (permissions et limitations de debit de chaque
+vue appliquees normalement).
+
+Avec 'parallele', un lot ne contenant que des lectures (GET) s'execute
+sur un pool de BATCH_MAX_WORKERS threads; sinon les sous-requetes
+s'executent dans l'ordre. Les reponses sont retournees dans l'ordre des
+sous-requetes.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from io import BytesIO
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import orjson
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.urls import Resolver404, resolve
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework import serializers, status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+from api.audit import enregistrer_consultation
+from api.db_router import lecture_seule
+
+
+logger = logging.getLogger(__name__)
+
+METHODES_LECTURE = ('GET', 'HEAD')
+PREFIXE_API = '/api/'
+# En-tetes propres a la requete de lot, non transmis aux sous-requetes
+ENTETES_NON_TRANSMIS = ('HTTP_IDEMPOTENCY_KEY', 'CONTENT_TYPE', 'CONTENT_LENGTH')
+
+
+class SousRequeteSerializer(serializers.Serializer):
+    """Une sous-requete du lot."""
+
+    methode = serializers.ChoiceField(
+        choices=['GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE'],
+        default='GET'
+    )
+    chemin = serializers.CharField(max_length=500, help_text='Ex: /api/sessions/en-cours/')
+    parametres = serializers.DictField(
+        required=False,
+        default=dict,
+        help_text='Parametres de la query string (valeur ou liste de valeurs)'
+    )
+    corps = serializers.JSONField(required=False, help_text='Corps JSON (POST, PUT, PATCH)')
+
+    def validate_chemin(self, value):
+        chemin = urlsplit(value).path
+        if not chemin.startswith(PREFIXE_API):
+            raise serializers.ValidationError(f'Le chemin doit commencer par {PREFIXE_API}.')
+        if chemin.rstrip('/') == '/api/batch':
+            raise serializers.ValidationError('Un lot ne peut pas contenir /api/batch/.')
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    """Lot de sous-requetes."""
+
+    requetes = SousRequeteSerializer(many=True, allow_empty=False)
+    parallele = serializers.BooleanField(
+        default=False,
+        help_text='Executer les lectures en parallele (lot de GET uniquement)'
+    )
+
+    def validate_requetes(self, value):
+        maximum = getattr(settings, 'BATCH_MAX_REQUETES', 20)
+        if len(value) > maximum:
+            raise serializers.ValidationError(f'Un lot contient au plus {maximum} sous-requetes.')
+        return value
+
+
+def _paires_parametres(parametres):
+    """{'a': 1, 'b': [2, 3]} -> [('a', '1'), ('b', '2'), ('b', '3')]."""
+    paires = []
+    for nom, valeur in parametres.items():
+        valeurs = valeur if isinstance(valeur, (list, tuple)) else [valeur]
+        paires += [(nom, '' if v is None else str(v)) for v in valeurs]
+    return paires
+
+
+def _sous_requete(request, sous):
+    """Construit la requete Django d'une sous-requete, authentifiee comme le lot."""
+    url = urlsplit(sous['chemin'])
+    parametres = parse_qsl(url.query, keep_blank_values=True)
+    parametres += _paires_parametres(sous['parametres'])
+    corps = orjson.dumps(sous['corps']) if 'corps' in sous else b''
+
+    environ = {cle: valeur for cle, valeur in request.META.items() if cle not in ENTETES_NON_TRANSMIS}
+    environ.update({
+        'REQUEST_METHOD': sous['methode'],
+        'SCRIPT_NAME': '',
+        'PATH_INFO': url.path,
+        'QUERY_STRING': urlencode(parametres),
+        'CONTENT_LENGTH': str(len(corps)),
+        'wsgi.input': BytesIO(corps),
+    })
+    if corps:
+        environ['CONTENT_TYPE'] = 'application/json'
+
+    sous_requete = WSGIRequest(environ)
+    # Authentification forcee par DRF (rest_framework.request.Request)
+    sous_requete._force_auth_user = request.user
+    sous_requete._force_auth_token = request.auth
+    sous_requete.user = request.user
+    return sous_requete
+
+
+def _executer(request, sous):
+    """Execute une sous-requete et retourne son resultat {chemin, statut, data}."""
+    resultat = {'methode': sous['methode'], 'chemin': sous['chemin']}
+    sous_requete = _sous_requete(request, sous)
+    try:
+        correspondance = resolve(sous_requete.path_info)
+    except Resolver404:
+        resultat.update(statut=status.HTTP_404_NOT_FOUND, data={
+            'error': 'Chemin introuvable',
+            'detail': f'Aucun endpoint ne correspond a {sous_requete.path_info}.'
+        })
+        return resultat
+
+    sous_requete.resolver_match = correspondance
+    try:
+        reponse = correspondance.func(sous_requete, *correspondance.args, **correspondance.kwargs)
+    except Exception as e:
+        logger.exception('Erreur dans la sous-requete %s %s', sous['methode'], sous['chemin'])
+        resultat.update(statut=status.HTTP_500_INTERNAL_SERVER_ERROR, data={
+            'error': 'Erreur lors de l\'execution de la sous-requete',
+            'detail': str(e)
+        })
+        return resultat
+
+    # Les sous-requetes ne traversent pas AuditMiddleware
+    enregistrer_consultation(sous_requete, reponse)
+    if hasattr(reponse, 'data'):
+        # Reponse DRF: donnees rendues une seule fois avec le lot
+        data = reponse.data
+    else:
+        contenu = reponse.content if hasattr(reponse, 'content') else b''
+        try:
+            data = orjson.loads(contenu) if contenu else None
+        except orjson.JSONDecodeError:
+            data = contenu.decode(reponse.charset or 'utf-8', errors='replace')
+    resultat.update(statut=reponse.status_code, data=data)
+    return resultat
+
+
+def _executer_dans_thread(request, sous):
+    """Execute une sous-requete dans un thread du pool puis ferme ses connexions."""
+    try:
+        return _executer(request, sous)
+    finally:
+        connections.close_all()
+
+
+@extend_schema(
+    request=BatchSerializer,
+    responses={
+        200: OpenApiResponse(description='Reponses des sous-requetes, dans l\'ordre'),
+        400: OpenApiResponse(description='Lot invalide'),
+    },
+    tags=['Batch'],
+    description=(
+        'Execute plusieurs requetes API en un seul appel (une seule authentification). '
+        'Chaque element de data contient le statut HTTP et le corps de la sous-requete.'
+    )
+)
+@api_view(['POST'])
+def batch_view(request):
+    """Execute un lot de sous-requetes."""
+    serializer = BatchSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(
+            {
+                'error': 'Donnees invalides',
+                'detail': 'Veuillez verifier les donnees fournies.',
+                'erreurs': serializer.errors
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    requetes = serializer.validated_data['requetes']
+    lectures = all(sous['methode'] in METHODES_LECTURE for sous in requetes)
+    # Un lot de lectures est route comme une requete GET (replique)
+    with lecture_seule(request._request) if lectures else nullcontext():
+        if lectures and serializer.validated_data['parallele'] and len(requetes) > 1:
+            workers = min(getattr(settings, 'BATCH_MAX_WORKERS', 4), len(requetes))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch') as pool:
+                # Chaque thread recoit une copie du contexte (routage des lectures)
+                futures = [
+                    pool.submit(contextvars.copy_context().run, _executer_dans_thread, request, sous)
+                    for sous in requetes
+                ]
+                resultats = [future.result() for future in futures]
+        else:
+            resultats = [_executer(request, sous) for sous in requetes]
+
+    return Response(
+        {
+            'success': True,
+            'count': len(resultats),
+            'data': resultats
+        },
+        status=status.HTTP_200_OK
+    )
@@ -8,6 +8,7 @@ Date: 2025-12-14
 """
 import os
 from celery import Celery
+from celery.signals import task_postrun, task_prerun, worker_init, worker_process_shutdown
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings.development')
 
@@ -18,6 +19,24 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 
+@worker_init.connect
+def connecter_metriques(**kwargs):
+    """
+    Mesure la duree des taches et, si CELERY_METRICS_PORT est defini,
+    expose les metriques du worker (tous processus confondus) sur ce port.
+    """
+    from api import metrics
+
+    task_prerun.connect(metrics.tache_demarree, weak=False)
+    task_postrun.connect(metrics.tache_terminee, weak=False)
+    worker_process_shutdown.connect(metrics.processus_termine, weak=False)
+
+    port = os.getenv('CELERY_METRICS_PORT')
+    if port:
+        from prometheus_client import start_http_server
+        start_http_server(int(port), registry=metrics.get_registry())
+
+
 @app.task(bind=True)
 def debug_task(self):
     """Tache de debug pour tester Celery."""
@@ -0,0 +1,124 @@
+"""
+Champs a la demande pour les viewsets: ?fields= et ?expand=.
+
+- ?fields=id,nom,date_heure limite la reponse a ces champs. Le queryset
+  est elague en consequence: select_related() ne garde que les relations
+  encore lues, .only() ne charge que les colonnes utiles (les serializers
+  values() de fast_serializers ne selectionnent que ces colonnes).
+- ?expand=id_patient remplace l'identifiant d'une relation declaree dans
+  champs_extensibles par l'objet imbrique (jointure ajoutee au queryset).
+
+Sans ces parametres, la reponse est inchangee. S'applique aux actions
+de actions_champs_dynamiques (lectures), jamais aux ecritures. Les noms de
+champs inconnus sont ignores.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from rest_framework.serializers import ListSerializer, Serializer
+
+from api.optimisation import METHODES_LECTURE, OptimisationRequetesMixin, _dependances
+
+
+def _liste(valeur):
+    """'a, b,,c' -> ['a', 'b', 'c']; None si le parametre est absent ou vide."""
+    if not valeur:
+        return None
+    return [nom.strip() for nom in valeur.split(',') if nom.strip()] or None
+
+
+def elaguer_queryset(queryset, champs):
+    """
+    Restreint select_related(), prefetch_related() et les colonnes chargees
+    (.only()) a ce que lisent les champs de serializer `champs`.
+
+    Si un champ lit des donnees non deductibles (SerializerMethodField),
+    les jointures necessaires sont seulement ajoutees.
+    """
+    dependances = _dependances(queryset.model, champs, queryset.query.annotations)
+    if not dependances.connues:
+        return queryset.select_related(*dependances.relations) if dependances.relations else queryset
+
+    # Une relation chargee entierement garde toutes ses colonnes
+    colonnes = {
+        colonne for colonne in dependances.colonnes | {queryset.model._meta.pk.name}
+        if not any(colonne.startswith(f'{relation}__') for relation in dependances.completes)
+    }
+    relations_multiples = {lookup.split('__')[0] for lookup in dependances.prefetch}
+    lookups = [
+        lookup for lookup in queryset._prefetch_related_lookups
+        if getattr(lookup, 'prefetch_to', lookup).split('__')[0] in relations_multiples
+    ]
+    return (
+        queryset.select_related(None).select_related(*dependances.relations)
+        .prefetch_related(None).prefetch_related(*lookups)
+        .only(*colonnes)
+    )
+
+
+class ChampsDynamiquesMixin(OptimisationRequetesMixin):
+    """
+    Mixin de viewset: ?fields= et ?expand= sur les actions de lecture.
+    Sans ces parametres, le queryset est optimise d'apres le serializer
+    (OptimisationRequetesMixin).
+
+    Les viewsets declarent champs_extensibles: {nom du champ de relation:
+    classe de serializer imbrique}.
+    """
+
+    champs_extensibles = {}
+    actions_champs_dynamiques = ('list', 'retrieve')
+
+    def champs_demandes(self):
+        """(champs demandes ou None, relations a developper) de la requete."""
+        request = getattr(self, 'request', None)
+        if (
+            request is None
+            or request.method not in METHODES_LECTURE
+            or getattr(self, 'action', None) not in self.actions_champs_dynamiques
+        ):
+            return None, ()
+        expansions = _liste(request.query_params.get('expand')) or []
+        return (
+            _liste(request.query_params.get('fields')),
+            tuple(nom for nom in expansions if nom in self.champs_extensibles),
+        )
+
+    def appliquer_champs(self, serializer):
+        """Retire les champs non demandes et developpe les relations demandees."""
+        champs, expansions = self.champs_demandes()
+        cible = serializer.child if isinstance(serializer, ListSerializer) else serializer
+        if (champs is None and not expansions) or not isinstance(cible, Serializer):
+            return serializer
+
+        for nom in expansions:
+            source = cible.fields[nom].source if nom in cible.fields else nom
+            options = {} if source == nom else {'source': source}
+            cible.fields[nom] = self.champs_extensibles[nom](read_only=True, **options)
+        if champs is not None:
+            gardes = {*champs, *expansions}
+            for nom in [nom for nom in cible.fields if nom not in gardes]:
+                del cible.fields[nom]
+        return serializer
+
+    def get_serializer(self, *args, **kwargs):
+        return self.appliquer_champs(super().get_serializer(*args, **kwargs))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        champs, expansions = self.champs_demandes()
+        if champs is None and not expansions:
+            return queryset
+        return elaguer_queryset(queryset, self.get_serializer().fields.values())
+
+    def serialiser_valeurs(self, queryset, classe):
+        """
+        Donnees d'une liste par un serializer values() (fast_serializers),
+        restreint a ?fields=. Avec ?expand=, passe par le serializer du viewset.
+        """
+        champs, expansions = self.champs_demandes()
+        if expansions:
+            return self.get_serializer(queryset, many=True).data
+        return classe(queryset, champs=champs).data
@@ -0,0 +1,189 @@
+"""
+Routage des lectures vers la replique de base de donnees.
+
+Si l'alias REPLICA_DB_ALIAS est configure (DB_REPLICA_HOST):
+- les requetes HTTP sures (GET, HEAD, OPTIONS) lisent sur la replique;
+- les ecritures et les lectures d'une requete non sure vont au primaire;
+- apres une ecriture, les lectures de cet utilisateur restent sur le
+  primaire pendant REPLICA_STICKY_SECONDS (lire ses propres ecritures
+  malgre le retard de replication), suivi par utilisateur dans Redis
+  (REPLICA_REDIS_URL) pour que tous les workers le voient; si Redis est
+  injoignable, les lectures vont au primaire;
+- les taches Celery de rapport lisent sur la replique avec lecture_replica().
+Dans une transaction, toutes les lectures vont au primaire.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import functools
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import redis
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+logger = logging.getLogger(__name__)
+
+METHODES_SURES = ('GET', 'HEAD', 'OPTIONS')
+PREFIXE_CLE = 'replica:primaire:'
+
+_client = None
+_client_lock = threading.Lock()
+
+# Alias vers lequel router les lectures du contexte courant (None: primaire)
+_alias_lecture = ContextVar('alias_lecture', default=None)
+
+
+def get_client():
+    """Client Redis adosse a un pool du processus (cree au premier appel)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                timeout = getattr(settings, 'REPLICA_REDIS_TIMEOUT', 0.2)
+                _client = redis.Redis(connection_pool=redis.ConnectionPool.from_url(
+                    settings.REPLICA_REDIS_URL,
+                    socket_connect_timeout=timeout,
+                    socket_timeout=timeout,
+                ))
+    return _client
+
+
+def alias_replica():
+    """Alias de la replique s'il est configure, sinon None."""
+    alias = getattr(settings, 'REPLICA_DB_ALIAS', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def lecture_replica():
+    """Route les lectures du bloc vers la replique (rapports, taches Celery)."""
+    jeton = _alias_lecture.set(alias_replica())
+    try:
+        yield
+    finally:
+        _alias_lecture.reset(jeton)
+
+
+def sur_replica(fonction):
+    """Decorateur: execute la fonction dans lecture_replica()."""
+    @functools.wraps(fonction)
+    def enveloppe(*args, **kwargs):
+        with lecture_replica():
+            return fonction(*args, **kwargs)
+    return enveloppe
+
+
+def _identifiant(request):
+    """
+    Identifiant de l'auteur de la requete sans acces a la base:
+    claim user_id du jeton JWT, sinon cle de session.
+    """
+    entete = request.META.get('HTTP_AUTHORIZATION', '')
+    if entete.startswith('Bearer '):
+        from rest_framework_simplejwt.exceptions import TokenError
+        from rest_framework_simplejwt.tokens import AccessToken
+        try:
+            return f"u:{AccessToken(entete[7:])['user_id']}"
+        except (TokenError, KeyError):
+            return None
+    session = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    return f's:{session}' if session else None
+
+
+@contextmanager
+def lecture_seule(request):
+    """
+    Traite une requete HTTP non sure qui ne fait que lire (lot de GET de
+    /api/batch/) comme une requete GET: lectures du bloc sur la replique
+    (hors fenetre de lecture sur le primaire), pas de marquage d'ecriture.
+    """
+    request.lecture_seule = True
+    replica = alias_replica()
+    alias = replica if replica and not doit_lire_primaire(_identifiant(request)) else None
+    jeton = _alias_lecture.set(alias)
+    try:
+        yield
+    finally:
+        _alias_lecture.reset(jeton)
+
+
+def marquer_ecriture(identifiant):
+    """Garde les lectures de cet utilisateur sur le primaire pendant la fenetre."""
+    duree = getattr(settings, 'REPLICA_STICKY_SECONDS', 10)
+    if not identifiant or duree <= 0:
+        return
+    try:
+        get_client().set(PREFIXE_CLE + identifiant, 1, ex=duree)
+    except redis.RedisError as e:
+        logger.warning('Redis injoignable, fenetre de lecture sur le primaire non enregistree: %s', e)
+
+
+def doit_lire_primaire(identifiant):
+    """
+    Vrai si l'utilisateur a ecrit pendant la fenetre de REPLICA_STICKY_SECONDS
+    (ou si Redis est injoignable: lire le primaire est toujours correct).
+    """
+    if not identifiant or getattr(settings, 'REPLICA_STICKY_SECONDS', 10) <= 0:
+        return False
+    try:
+        return bool(get_client().exists(PREFIXE_CLE + identifiant))
+    except redis.RedisError as e:
+        logger.warning('Redis injoignable, lecture sur le primaire: %s', e)
+        return True
+
+
+class ReplicaRouter:
+    """Routeur: lectures vers l'alias du contexte courant, ecritures vers le primaire."""
+
+    def db_for_read(self, model, **hints):
+        alias = _alias_lecture.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replique et primaire contiennent les memes donnees
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La replique recoit le schema par replication
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Choisit la base de lecture de chaque requete HTTP et enregistre les
+    ecritures pour la fenetre de lecture sur le primaire.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        replica = alias_replica()
+        if replica is None:
+            return self.get_response(request)
+
+        identifiant = _identifiant(request)
+        sure = request.method in METHODES_SURES
+        alias = replica if sure and not doit_lire_primaire(identifiant) else None
+
+        jeton = _alias_lecture.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            _alias_lecture.reset(jeton)
+
+        if not sure and response.status_code < 400 and not getattr(request, 'lecture_seule', False):
+            marquer_ecriture(identifiant)
+        return response
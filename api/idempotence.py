@@ -0,0 +1,205 @@
+"""
+Cles d'idempotence (en-tete Idempotency-Key) pour les POST de creation.
+
+Un client qui renvoie une requete (reseau instable) avec la meme cle
+recoit la reponse de la premiere execution, rejouee depuis Redis sans
+reexecuter la vue (en-tete Idempotent-Replayed: true):
+- la reponse (statut < 500) est conservee IDEMPOTENCY_TTL_SECONDS, par
+  utilisateur, endpoint et cle; une erreur 5xx n'est pas conservee et
+  la requete suivante reexecute la vue;
+- les doublons concurrents sont coalesces par un verrou Redis: ils
+  attendent (au plus IDEMPOTENCY_WAIT_SECONDS) la reponse de la premiere
+  execution, sinon 409 avec Retry-After;
+- la meme cle avec un corps different est refusee (422).
+Sans en-tete, ou si Redis est injoignable, la vue s'execute normalement.
+
+Usage: decorer la methode de la vue avec @idempotent (sous @action et
+@extend_schema).
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import functools
+import hashlib
+import logging
+import threading
+import time
+import uuid
+
+import orjson
+import redis
+from django.conf import settings
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.renderers import ORJSONRenderer
+
+
+logger = logging.getLogger(__name__)
+
+ENTETE_REJOUEE = 'Idempotent-Replayed'
+LONGUEUR_MAX_CLE = 255
+INTERVALLE_ATTENTE = 0.05
+
+# Supprime le verrou seulement s'il appartient encore a cette execution
+SCRIPT_LIBERER_VERROU = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+PARAMETRE_IDEMPOTENCE = OpenApiParameter(
+    name='Idempotency-Key',
+    location=OpenApiParameter.HEADER,
+    required=False,
+    type=str,
+    description=(
+        'Cle unique par operation (ex. UUID). Une requete renvoyee avec la '
+        'meme cle recoit la reponse de la premiere execution.'
+    ),
+)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Client Redis adosse a un pool du processus (cree au premier appel)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                timeout = getattr(settings, 'IDEMPOTENCY_REDIS_TIMEOUT', 0.5)
+                _client = redis.Redis(connection_pool=redis.ConnectionPool.from_url(
+                    settings.IDEMPOTENCY_REDIS_URL,
+                    socket_connect_timeout=timeout,
+                    socket_timeout=timeout,
+                ))
+    return _client
+
+
+def _cle_redis(request, cle):
+    """Cle Redis de la reponse: utilisateur + methode + chemin + cle du client."""
+    utilisateur = request.user.pk if request.user and request.user.is_authenticated else 'anonyme'
+    condense = hashlib.sha256(f'{request.method}:{request.path}:{cle}'.encode()).hexdigest()
+    return f'idempotence:{utilisateur}:{condense}'
+
+
+def _empreinte(request):
+    """Condense du corps de la requete (detecte la reutilisation d'une cle)."""
+    donnees = request.data
+    if hasattr(donnees, 'lists'):
+        donnees = {champ: [str(v) for v in valeurs] for champ, valeurs in donnees.lists()}
+    return hashlib.sha256(
+        orjson.dumps(donnees, default=str, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
+
+def _rejouer(client, cle, empreinte):
+    """Reponse conservee pour cette cle, ou None."""
+    enregistree = client.hgetall(cle)
+    if not enregistree:
+        return None
+    if enregistree[b'empreinte'].decode() != empreinte:
+        return Response(
+            {
+                'error': 'Cle d\'idempotence deja utilisee',
+                'detail': 'Cette cle Idempotency-Key a ete utilisee avec un corps de requete different.'
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    entetes = {ENTETE_REJOUEE: 'true'}
+    if enregistree.get(b'location'):
+        entetes['Location'] = enregistree[b'location'].decode()
+    return Response(
+        orjson.loads(enregistree[b'contenu']) if enregistree[b'contenu'] else None,
+        status=int(enregistree[b'statut']),
+        headers=entetes,
+    )
+
+
+def _enregistrer(client, cle, empreinte, reponse):
+    """Conserve la reponse de la vue pour les requetes renvoyees."""
+    client.pipeline().hset(cle, mapping={
+        'empreinte': empreinte,
+        'statut': reponse.status_code,
+        'contenu': ORJSONRenderer().render(getattr(reponse, 'data', None)),
+        'location': reponse.get('Location', ''),
+    }).expire(cle, getattr(settings, 'IDEMPOTENCY_TTL_SECONDS', 86400)).execute()
+
+
+def idempotent(methode):
+    """
+    Decorateur de methode de vue DRF: rejoue la reponse d'une requete deja
+    executee avec le meme en-tete Idempotency-Key.
+    """
+    @functools.wraps(methode)
+    def enveloppe(self, request, *args, **kwargs):
+        cle = request.headers.get('Idempotency-Key')
+        if not cle or not getattr(settings, 'IDEMPOTENCY_ENABLED', True):
+            return methode(self, request, *args, **kwargs)
+        if len(cle) > LONGUEUR_MAX_CLE:
+            return Response(
+                {
+                    'error': 'Cle d\'idempotence invalide',
+                    'detail': f'L\'en-tete Idempotency-Key depasse {LONGUEUR_MAX_CLE} caracteres.'
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        cle_reponse = _cle_redis(request, cle)
+        cle_verrou = f'{cle_reponse}:verrou'
+        empreinte = _empreinte(request)
+        jeton = uuid.uuid4().hex
+        limite = time.monotonic() + getattr(settings, 'IDEMPOTENCY_WAIT_SECONDS', 10)
+        try:
+            client = get_client()
+            # Attend la fin d'une execution concurrente, ou prend le verrou
+            while True:
+                reponse = _rejouer(client, cle_reponse, empreinte)
+                if reponse is not None:
+                    return reponse
+                if client.set(
+                    cle_verrou, jeton, nx=True,
+                    ex=getattr(settings, 'IDEMPOTENCY_LOCK_SECONDS', 30),
+                ):
+                    break
+                if time.monotonic() >= limite:
+                    return Response(
+                        {
+                            'error': 'Requete en cours de traitement',
+                            'detail': 'Une requete avec cette cle Idempotency-Key est deja en cours.'
+                        },
+                        status=status.HTTP_409_CONFLICT,
+                        headers={'Retry-After': '1'}
+                    )
+                time.sleep(INTERVALLE_ATTENTE)
+            # La premiere execution a pu terminer entre la lecture et le verrou
+            reponse = _rejouer(client, cle_reponse, empreinte)
+            if reponse is not None:
+                client.eval(SCRIPT_LIBERER_VERROU, 1, cle_verrou, jeton)
+                return reponse
+        except redis.RedisError as e:
+            logger.warning('Idempotency-Key ignoree, Redis injoignable: %s', e)
+            return methode(self, request, *args, **kwargs)
+
+        try:
+            reponse = methode(self, request, *args, **kwargs)
+            if reponse.status_code < 500:
+                try:
+                    _enregistrer(client, cle_reponse, empreinte, reponse)
+                except redis.RedisError as e:
+                    logger.warning('Reponse non conservee pour Idempotency-Key, Redis injoignable: %s', e)
+            return reponse
+        finally:
+            try:
+                client.eval(SCRIPT_LIBERER_VERROU, 1, cle_verrou, jeton)
+            except redis.RedisError:
+                # Le verrou expire apres IDEMPOTENCY_LOCK_SECONDS
+                pass
+
+    return enveloppe
@@ -0,0 +1,278 @@
+"""
+Metriques Prometheus du projet Fultang Hospital.
+
+- Duree des requetes HTTP par vue DRF (ViewSet) et action;
+- nombre et duree des requetes SQL par requete HTTP;
+- requetes cache (hit/miss) pour calculer le taux de succes;
+- duree des taches Celery et longueur des files d'attente.
+
+Les valeurs sont stockees dans PROMETHEUS_MULTIPROC_DIR lorsque cette
+variable est definie (gunicorn et Celery prefork lancent plusieurs
+processus); /metrics agrege alors les fichiers de tous les processus.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import hmac
+import ipaddress
+import os
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache as DjangoLocMemCache
+from django.core.cache.backends.redis import RedisCache as DjangoRedisCache
+from django.db import connections
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+
+MULTIPROCESS = bool(os.getenv('PROMETHEUS_MULTIPROC_DIR'))
+
+REQUEST_DURATION = Histogram(
+    'fultang_http_request_duration_seconds',
+    'Duree des requetes HTTP par vue et action',
+    ['view', 'action', 'method', 'status'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_DB_QUERIES = Histogram(
+    'fultang_http_request_db_queries',
+    'Nombre de requetes SQL par requete HTTP',
+    ['view', 'action'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250, 500),
+)
+REQUEST_DB_DURATION = Histogram(
+    'fultang_http_request_db_duration_seconds',
+    'Temps passe en SQL par requete HTTP',
+    ['view', 'action'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+CACHE_REQUESTS = Counter(
+    'fultang_cache_requests_total',
+    'Lectures du cache Django par resultat (hit/miss)',
+    ['cache', 'result'],
+)
+CELERY_TASK_DURATION = Histogram(
+    'fultang_celery_task_duration_seconds',
+    'Duree d\'execution des taches Celery',
+    ['task', 'state'],
+    buckets=(0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 1800),
+)
+
+
+# ==================================================
+# REQUETES HTTP
+# ==================================================
+
+def libelles_vue(view_func, method):
+    """
+    Retourne (vue, action) pour une vue resolue.
+
+    ViewSet: nom de la classe et action du routeur (list, retrieve, ...).
+    @api_view: DRF nomme la classe generee comme la fonction decoree.
+    """
+    methode = method.lower()
+    cls = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    actions = getattr(view_func, 'actions', None)
+    if cls is not None:
+        return cls.__name__, (actions or {}).get(methode, methode)
+    return getattr(view_func, '__name__', 'inconnue'), methode
+
+
+class _CompteurSQL:
+    """execute_wrapper comptant les requetes SQL et leur duree."""
+
+    def __init__(self):
+        self.requetes = 0
+        self.duree = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        debut = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duree += time.perf_counter() - debut
+            self.requetes += 1
+
+
+class MetricsMiddleware:
+    """Mesure chaque requete HTTP et les requetes SQL qu'elle execute."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path == '/metrics':
+            return self.get_response(request)
+
+        compteur = _CompteurSQL()
+        debut = time.perf_counter()
+        with ExitStack() as stack:
+            for connexion in connections.all():
+                stack.enter_context(connexion.execute_wrapper(compteur))
+            response = self.get_response(request)
+        duree = time.perf_counter() - debut
+
+        vue, action = getattr(request, '_metrics_vue', ('non_resolue', request.method.lower()))
+        REQUEST_DURATION.labels(vue, action, request.method, response.status_code).observe(duree)
+        REQUEST_DB_QUERIES.labels(vue, action).observe(compteur.requetes)
+        REQUEST_DB_DURATION.labels(vue, action).observe(compteur.duree)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Memorise les libelles de la vue resolue."""
+        request._metrics_vue = libelles_vue(view_func, request.method)
+
+
+# ==================================================
+# CACHE
+# ==================================================
+
+_ABSENT = object()
+
+
+class InstrumentedCacheMixin:
+    """
+    Compte les hits/miss des lectures de cache.
+
+    Le libelle 'cache' provient de la cle METRICS_NAME de CACHES
+    (par defaut: 'default').
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        params = args[1] if len(args) > 1 else kwargs.get('params', {})
+        self._metrics_name = params.get('METRICS_NAME', 'default')
+
+    def get(self, key, default=None, version=None):
+        valeur = super().get(key, _ABSENT, version=version)
+        if valeur is _ABSENT:
+            CACHE_REQUESTS.labels(self._metrics_name, 'miss').inc()
+            return default
+        CACHE_REQUESTS.labels(self._metrics_name, 'hit').inc()
+        return valeur
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        valeurs = super().get_many(keys, version=version)
+        if valeurs:
+            CACHE_REQUESTS.labels(self._metrics_name, 'hit').inc(len(valeurs))
+        if len(keys) > len(valeurs):
+            CACHE_REQUESTS.labels(self._metrics_name, 'miss').inc(len(keys) - len(valeurs))
+        return valeurs
+
+
+class LocMemCache(InstrumentedCacheMixin, DjangoLocMemCache):
+    """Cache memoire locale instrumente."""
+
+
+class RedisCache(InstrumentedCacheMixin, DjangoRedisCache):
+    """Cache Redis instrumente."""
+
+
+# ==================================================
+# CELERY
+# ==================================================
+
+_debuts_taches = {}
+
+
+def tache_demarree(task_id=None, **kwargs):
+    """Signal task_prerun: memorise l'heure de debut."""
+    _debuts_taches[task_id] = time.perf_counter()
+
+
+def tache_terminee(task_id=None, task=None, state=None, **kwargs):
+    """Signal task_postrun: enregistre la duree de la tache."""
+    debut = _debuts_taches.pop(task_id, None)
+    if debut is not None and task is not None:
+        CELERY_TASK_DURATION.labels(task.name, state or 'UNKNOWN').observe(time.perf_counter() - debut)
+
+
+def processus_termine(pid=None, **kwargs):
+    """Signal worker_process_shutdown: libere les fichiers du processus."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+class QueueLengthCollector:
+    """Longueur des files Celery (LLEN sur le broker Redis) a chaque collecte."""
+
+    def collect(self):
+        from apps.gestion_hospitaliere.health import get_redis_client
+
+        famille = GaugeMetricFamily(
+            'fultang_celery_queue_length',
+            'Nombre de messages en attente dans la file Celery',
+            labels=['queue'],
+        )
+        files = getattr(settings, 'METRICS_CELERY_QUEUES', None) or [
+            getattr(settings, 'CELERY_TASK_DEFAULT_QUEUE', 'celery')
+        ]
+        try:
+            client = get_redis_client()
+            for file in files:
+                famille.add_metric([file], client.llen(file))
+        except Exception:
+            # Broker indisponible: la serie est absente plutot qu'a zero
+            pass
+        yield famille
+
+
+# ==================================================
+# EXPORT
+# ==================================================
+
+def get_registry():
+    """Registre a exporter: agrege les processus en mode multiprocess."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(QueueLengthCollector())
+        return registry
+    return REGISTRY
+
+
+if not MULTIPROCESS:
+    REGISTRY.register(QueueLengthCollector())
+
+
+def _depuis_la_machine(request):
+    """True si la requete vient de l'interface de bouclage (127.0.0.0/8, ::1)."""
+    try:
+        return ipaddress.ip_address(request.META.get('REMOTE_ADDR', '')).is_loopback
+    except ValueError:
+        return False
+
+
+def metrics_view(request):
+    """
+    Endpoint: GET /metrics
+
+    Export au format texte Prometheus. L'en-tete 'Authorization: Bearer
+    <METRICS_TOKEN>' est exige; sans METRICS_TOKEN, seules les requetes
+    de la machine elle-meme (bouclage) sont servies.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        if not _depuis_la_machine(request):
+            return HttpResponse(
+                'Forbidden: definissez METRICS_TOKEN pour exposer /metrics',
+                status=403, content_type='text/plain'
+            )
+    elif not hmac.compare_digest(
+        request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode()
+    ):
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,282 @@
+"""
+Optimisation automatique des querysets d'apres les serializers.
+
+Les sources des champs (source='id_session.id_patient.nom'), les
+serializers imbriques et les relations lues par les SerializerMethodField
+(declarees dans Meta.sources_methodes du serializer) determinent:
+- select_related() pour les relations simples (cle etrangere, one-to-one);
+- prefetch_related() pour les relations multiples, avec un queryset
+  optimise de la meme facon pour un serializer imbrique (many=True);
+- .only() pour ne charger que les colonnes lues, si toutes les sources
+  sont connues.
+
+OptimisationRequetesMixin applique cette analyse a get_queryset() sur les
+actions de lecture. Avec QUERYSET_LAZY_LOAD_LOG, toute requete SQL executee
+pendant la serialisation d'un objet (chargement paresseux restant) est
+journalisee (logger fultang.lazy_loads) avec le serializer et le champ.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import functools
+import logging
+import re
+import sys
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import Prefetch
+from rest_framework.serializers import ListSerializer, Serializer
+
+
+logger = logging.getLogger('fultang.lazy_loads')
+
+METHODES_LECTURE = ('GET', 'HEAD')
+_DISPLAY = re.compile(r'get_(\w+)_display')
+_TO_REPRESENTATION = Serializer.to_representation.__code__
+
+
+class _Dependances:
+    """Colonnes et relations lues par un ensemble de champs de serializer."""
+
+    def __init__(self):
+        self.colonnes = set()
+        self.relations = set()
+        # Relations chargees entierement (serializer imbrique non analysable)
+        self.completes = set()
+        # Relations multiples (chemins complets) et leur serializer imbrique
+        self.prefetch = set()
+        self.listes = {}
+        # Faux si un champ lit des donnees non deductibles (methode, propriete)
+        self.connues = True
+
+
+def _parcourir(dependances, modele, attributs, prefixe, champ=None, annotations=()):
+    """
+    Ajoute a `dependances` ce que lit le chemin d'attributs `attributs`.
+
+    Sans `champ` (source d'une SerializerMethodField), une relation en fin
+    de chemin est chargee entierement.
+    """
+    courant, chemin = modele, list(prefixe)
+    for i, attribut in enumerate(attributs):
+        if not chemin and attribut in annotations:
+            return
+        display = _DISPLAY.fullmatch(attribut)
+        if display:
+            attribut = display.group(1)
+        try:
+            field = courant._meta.get_field(attribut)
+        except FieldDoesNotExist:
+            dependances.connues = False
+            return
+        chemin.append(field.name)
+        lookup = '__'.join(chemin)
+        dernier = i == len(attributs) - 1
+
+        if field.many_to_many or field.one_to_many:
+            # Relation multiple: un prefetch, avec le serializer imbrique eventuel
+            dependances.prefetch.add(lookup)
+            if dernier and isinstance(champ, ListSerializer):
+                dependances.listes[lookup] = champ.child
+            return
+        if field.is_relation and not field.concrete:
+            dependances.connues = False
+            return
+        dependances.colonnes.add(lookup)
+        if not field.is_relation:
+            return
+        if not dernier:
+            dependances.relations.add(lookup)
+            courant = field.related_model
+            continue
+        if champ is None:
+            dependances.relations.add(lookup)
+            dependances.completes.add(lookup)
+        elif isinstance(champ, Serializer):
+            dependances.relations.add(lookup)
+            imbriquees = _dependances(field.related_model, champ.fields.values(), prefixe=chemin)
+            dependances.relations |= imbriquees.relations
+            dependances.prefetch |= imbriquees.prefetch
+            dependances.listes.update(imbriquees.listes)
+            if imbriquees.connues:
+                dependances.colonnes |= imbriquees.colonnes
+            else:
+                dependances.completes.add(lookup)
+            dependances.completes |= imbriquees.completes
+
+
+def _dependances(modele, champs, annotations=(), prefixe=()):
+    """Analyse les sources des champs; les serializers imbriques sont parcourus."""
+    dependances = _Dependances()
+    for champ in champs:
+        if champ.write_only:
+            continue
+        if champ.source == '*':
+            # SerializerMethodField: sources declarees par le serializer
+            meta = getattr(champ.parent, 'Meta', None)
+            sources = getattr(meta, 'sources_methodes', {}).get(champ.field_name)
+            if sources is None:
+                dependances.connues = False
+                continue
+            for source in sources:
+                _parcourir(dependances, modele, source.split('.'), prefixe, annotations=annotations)
+            continue
+        _parcourir(dependances, modele, champ.source_attrs, prefixe, champ, annotations)
+
+    return dependances
+
+
+def _relations_declarees(arbre, prefixe=''):
+    """{'a': {'b': {}}} (query.select_related) -> ['a', 'a__b']."""
+    lookups = []
+    for nom, enfants in arbre.items():
+        lookup = f'{prefixe}{nom}'
+        lookups.append(lookup)
+        lookups += _relations_declarees(enfants, f'{lookup}__')
+    return lookups
+
+
+def _modele_au_bout(modele, chemin):
+    """Modele atteint en suivant le chemin de relations 'a__b'."""
+    for nom in chemin.split('__'):
+        modele = modele._meta.get_field(nom).related_model
+    return modele
+
+
+def _appliquer(queryset, dependances, chemin='', colonnes=True):
+    """
+    Ajoute jointures et prefetch de `dependances` au queryset, et les
+    colonnes lues (.only()) si `colonnes`.
+    """
+    declarees = queryset.query.select_related
+    relations = set(dependances.relations)
+    if chemin:
+        relations |= {'__'.join(chemin.split('__')[:i]) for i in range(1, chemin.count('__') + 2)}
+    if relations:
+        queryset = queryset.select_related(*sorted(relations))
+
+    existants = [getattr(lookup, 'prefetch_to', lookup) for lookup in queryset._prefetch_related_lookups]
+    prefetch = []
+    for lookup in sorted(dependances.prefetch):
+        # Un prefetch declare par le viewset est conserve tel quel
+        if any(e == lookup or e.startswith(f'{lookup}__') for e in existants):
+            continue
+        enfant = dependances.listes.get(lookup)
+        if enfant is None:
+            prefetch.append(lookup)
+            continue
+        modele = _modele_au_bout(queryset.model, lookup)
+        imbriquees = _dependances(modele, enfant.fields.values())
+        # Sans .only(): la cle vers le parent doit rester chargee
+        prefetch.append(Prefetch(lookup, queryset=_appliquer(
+            modele._default_manager.all(), imbriquees, colonnes=False
+        )))
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+
+    if (
+        not colonnes or chemin or not dependances.connues
+        or declarees is True or queryset.query.deferred_loading[0]
+    ):
+        return queryset
+
+    # Les relations jointes par le viewset et non lues restent chargees entierement
+    completes = dependances.completes | (set(_relations_declarees(declarees or {})) - dependances.relations)
+    chargees = {
+        colonne for colonne in dependances.colonnes | {queryset.model._meta.pk.name}
+        if not any(colonne.startswith(f'{relation}__') for relation in completes)
+    } | completes
+    return queryset.only(*sorted(chargees))
+
+
+def optimiser_queryset(queryset, champs, chemin=''):
+    """
+    Applique select_related(), prefetch_related() et .only() d'apres les
+    champs de serializer `champs`.
+
+    `chemin` ('id_session__id_patient') est la relation du modele du queryset
+    vers le modele serialise; les colonnes ne sont alors pas restreintes.
+    """
+    modele = _modele_au_bout(queryset.model, chemin) if chemin else queryset.model
+    annotations = () if chemin else queryset.query.annotations
+    prefixe = tuple(chemin.split('__')) if chemin else ()
+    return _appliquer(queryset, _dependances(modele, champs, annotations, prefixe), chemin)
+
+
+@functools.lru_cache(maxsize=None)
+def _champs_de(classe):
+    """Champs d'une classe de serializer (instanciee une fois par processus)."""
+    return tuple(classe().fields.values())
+
+
+def optimiser_pour(queryset, classe, chemin=''):
+    """optimiser_queryset() pour une classe de serializer."""
+    return optimiser_queryset(queryset, _champs_de(classe), chemin)
+
+
+class _DetecteurChargementsParesseux:
+    """execute_wrapper: journalise les requetes lancees pendant la serialisation d'un objet."""
+
+    def __init__(self, contexte):
+        self.contexte = contexte
+
+    def __call__(self, execute, sql, params, many, context):
+        frame = sys._getframe(1)
+        while frame is not None:
+            # La requete principale et les prefetch s'executent avant
+            # Serializer.to_representation (ListSerializer, get_object)
+            if frame.f_code is _TO_REPRESENTATION:
+                champ = frame.f_locals.get('field')
+                logger.warning(
+                    'Chargement paresseux pendant la serialisation (%s): %s.%s -> %s',
+                    self.contexte,
+                    type(frame.f_locals.get('self')).__name__,
+                    getattr(champ, 'field_name', '?'),
+                    sql,
+                )
+                break
+            frame = frame.f_back
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def journaliser_chargements_paresseux(contexte):
+    """Journalise les chargements paresseux du bloc sur toutes les bases."""
+    detecteur = _DetecteurChargementsParesseux(contexte)
+    with ExitStack() as pile:
+        for alias in connections:
+            pile.enter_context(connections[alias].execute_wrapper(detecteur))
+        yield
+
+
+class OptimisationRequetesMixin:
+    """
+    Mixin de viewset: get_queryset() optimise d'apres le serializer de
+    l'action (actions de actions_optimisees). Les SerializerMethodField
+    declarent ce qu'elles lisent dans Meta.sources_methodes:
+    {'nom du champ': ['relation', 'relation.colonne', ...]}.
+    """
+
+    actions_optimisees = ('list', 'retrieve')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = getattr(self, 'request', None)
+        if (
+            request is None
+            or request.method not in METHODES_LECTURE
+            or getattr(self, 'action', None) not in self.actions_optimisees
+        ):
+            return queryset
+        return optimiser_pour(queryset, self.get_serializer_class())
+
+    def dispatch(self, request, *args, **kwargs):
+        if not getattr(settings, 'QUERYSET_LAZY_LOAD_LOG', False):
+            return super().dispatch(request, *args, **kwargs)
+        with journaliser_chargements_paresseux(f'{type(self).__name__} {request.method} {request.path}'):
+            return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,51 @@
+"""
+Renderers DRF du projet Fultang Hospital.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import orjson
+from django.utils.http import parse_header_parameters
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Renderer JSON base sur orjson.
+
+    Produit la meme sortie que rest_framework.renderers.JSONRenderer
+    (format compact, UTF-8 non echappe). Les dates et les types non natifs
+    (Decimal, chaines paresseuses, ...) sont delegues a l'encodeur DRF afin
+    de conserver exactement son format (millisecondes, suffixe 'Z').
+    """
+
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Serialise data en bytes JSON."""
+        if data is None:
+            return b''
+
+        options = self.OPTIONS
+        if self._indent_demande(accepted_media_type, renderer_context):
+            options |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=self._encoder.default, option=options)
+
+    def _indent_demande(self, accepted_media_type, renderer_context):
+        """Retourne True si le client demande une sortie indentee."""
+        if accepted_media_type:
+            _, params = parse_header_parameters(accepted_media_type)
+            if params.get('indent'):
+                return True
+        renderer_context = renderer_context or {}
+        return bool(renderer_context.get('indent'))
@@ -0,0 +1,259 @@
+"""
+Schema OpenAPI pre-genere.
+
+Le schema est genere une fois au deploiement (commande build_openapi_schema)
+et ecrit dans OPENAPI_SCHEMA_DIR: un fichier YAML et un fichier JSON
+versionnes par le hash de leur contenu, leurs variantes gzip, et un
+manifeste. /api/schema/ sert ces fichiers avec ETag et gzip au lieu de
+reintrospecter toutes les vues a chaque appel. Sans schema construit,
+la vue revient a la generation dynamique de drf-spectacular.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core import checks
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+
+
+MANIFEST = 'manifest.json'
+
+FORMATS = {
+    # format: (renderer, extension, content type)
+    'yaml': (OpenApiYamlRenderer, 'yaml', 'application/vnd.oai.openapi; charset=utf-8'),
+    'json': (OpenApiJsonRenderer, 'json', 'application/vnd.oai.openapi+json; charset=utf-8'),
+}
+
+
+def schema_dir():
+    """Repertoire des schemas construits."""
+    return Path(settings.OPENAPI_SCHEMA_DIR)
+
+
+def generer_schema():
+    """Genere le schema par introspection (identique a SpectacularAPIView)."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def empreinte(schema):
+    """Hash SHA-256 stable du schema (JSON a cles triees)."""
+    contenu = json.dumps(schema, sort_keys=True, default=str).encode()
+    return hashlib.sha256(contenu).hexdigest()
+
+
+def construire(schema=None):
+    """
+    Ecrit le schema dans OPENAPI_SCHEMA_DIR et retourne le manifeste.
+
+    Les fichiers sont nommes openapi-<version>-<hash>.<ext> et ecrits
+    avant le manifeste, qui est remplace atomiquement.
+    """
+    schema = schema if schema is not None else generer_schema()
+    sha = empreinte(schema)
+    version = spectacular_settings.VERSION
+    dossier = schema_dir()
+    dossier.mkdir(parents=True, exist_ok=True)
+
+    manifeste = {
+        'version': version,
+        'sha256': sha,
+        'generated_at': timezone.now().isoformat(),
+        'files': {},
+    }
+    for nom, (renderer_class, extension, _) in FORMATS.items():
+        contenu = renderer_class().render(schema, renderer_context={})
+        fichier = f'openapi-{version}-{sha[:12]}.{extension}'
+        (dossier / fichier).write_bytes(contenu)
+        (dossier / f'{fichier}.gz').write_bytes(gzip.compress(contenu, mtime=0))
+        manifeste['files'][nom] = fichier
+
+    temporaire = dossier / f'{MANIFEST}.tmp'
+    temporaire.write_text(json.dumps(manifeste, indent=2))
+    os.replace(temporaire, dossier / MANIFEST)
+    return manifeste
+
+
+def lire_manifeste():
+    """Retourne le manifeste du schema construit, ou None."""
+    try:
+        return json.loads((schema_dir() / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def comparer(manifeste, schema=None):
+    """
+    Compare le schema construit au schema introspecte.
+
+    Retourne None si identiques, sinon un dict decrivant la derive
+    (operations ajoutees, supprimees, modifiees).
+    """
+    schema = schema if schema is not None else generer_schema()
+    if manifeste and manifeste.get('sha256') == empreinte(schema):
+        return None
+
+    construit = {}
+    if manifeste:
+        try:
+            fichier = schema_dir() / manifeste['files']['json']
+            construit = json.loads(fichier.read_bytes())
+        except (OSError, ValueError, KeyError):
+            construit = {}
+
+    def operations(document):
+        return {
+            f'{methode.upper()} {chemin}': operation
+            for chemin, methodes in document.get('paths', {}).items()
+            for methode, operation in methodes.items()
+        }
+
+    avant, apres = operations(construit), operations(json.loads(json.dumps(schema, default=str)))
+    return {
+        'added': sorted(set(apres) - set(avant)),
+        'removed': sorted(set(avant) - set(apres)),
+        'changed': sorted(cle for cle in set(avant) & set(apres) if avant[cle] != apres[cle]),
+        'components_changed': construit.get('components') != json.loads(
+            json.dumps(schema.get('components', {}), default=str)
+        ),
+    }
+
+
+# ==================================================
+# VUE
+# ==================================================
+
+_fichiers = {}
+
+
+def _charger(fichier):
+    """Lit (et garde en memoire) un fichier de schema; les noms sont versionnes."""
+    if fichier not in _fichiers:
+        chemin = schema_dir() / fichier
+        _fichiers[fichier] = (chemin.read_bytes(), (schema_dir() / f'{fichier}.gz').read_bytes())
+    return _fichiers[fichier]
+
+
+def _format_demande(request):
+    """'json' si demande via ?format= ou l'en-tete Accept, sinon 'yaml'."""
+    format_demande = request.GET.get('format', '')
+    if format_demande in ('json', 'openapi-json'):
+        return 'json'
+    if format_demande in ('yaml', 'openapi'):
+        return 'yaml'
+    accept = request.headers.get('Accept', '')
+    if 'json' in accept and 'yaml' not in accept:
+        return 'json'
+    return 'yaml'
+
+
+def _accepte_gzip(request):
+    """
+    True si Accept-Encoding accepte gzip avec une qualite non nulle
+    (gzip ou x-gzip, sinon *). 'gzip;q=0' refuse explicitement gzip.
+    """
+    qualites = {}
+    for element in request.headers.get('Accept-Encoding', '').split(','):
+        codage, *parametres = [partie.strip() for partie in element.split(';')]
+        if not codage:
+            continue
+        qualite = 1.0
+        for parametre in parametres:
+            nom, _, valeur = parametre.partition('=')
+            if nom.strip().lower() == 'q':
+                try:
+                    qualite = float(valeur)
+                except ValueError:
+                    qualite = 0.0
+        qualites[codage.lower()] = qualite
+
+    for codage in ('gzip', 'x-gzip', '*'):
+        if codage in qualites:
+            return qualites[codage] > 0
+    return False
+
+
+def _etag_correspond(request, etag):
+    """If-None-Match contient l'ETag (comparaison faible) ou '*'."""
+    etags = parse_etags(request.headers.get('If-None-Match', ''))
+    return '*' in etags or etag in [valeur.removeprefix('W/') for valeur in etags]
+
+
+_vue_dynamique = SpectacularAPIView.as_view()
+
+
+def schema_view(request, *args, **kwargs):
+    """
+    Endpoint: GET /api/schema/
+
+    Sert le schema construit (YAML par defaut, JSON avec ?format=json).
+    Repond 304 si l'ETag correspond (ou If-None-Match: *), et envoie la
+    version gzip si Accept-Encoding l'accepte avec une qualite non nulle.
+    """
+    manifeste = lire_manifeste()
+    if manifeste is None:
+        return _vue_dynamique(request, *args, **kwargs)
+
+    format_demande = _format_demande(request)
+    _, _, content_type = FORMATS[format_demande]
+    etag = f'"{manifeste["sha256"][:32]}-{format_demande}"'
+
+    if _etag_correspond(request, etag):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    brut, compresse = _charger(manifeste['files'][format_demande])
+    if _accepte_gzip(request):
+        response = HttpResponse(compresse, content_type=content_type)
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(brut, content_type=content_type)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'public, max-age=300'
+    patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+    return response
+
+
+# ==================================================
+# VERIFICATION (manage.py check --deploy)
+# ==================================================
+# Enregistree dans GestionHospitaliereConfig.ready()
+
+def verifier_schema(app_configs=None, **kwargs):
+    """Signale un schema construit absent ou different du code deploye."""
+    manifeste = lire_manifeste()
+    if manifeste is None:
+        return [
+            checks.Warning(
+                'Aucun schema OpenAPI construit: /api/schema/ le genere a chaque appel.',
+                hint='Executez "python manage.py build_openapi_schema" au deploiement.',
+                id='api.W001',
+            )
+        ]
+    derive = comparer(manifeste)
+    if derive is not None:
+        return [
+            checks.Warning(
+                'Le schema OpenAPI construit ne correspond plus au code '
+                f'({len(derive["added"])} ajoutee(s), {len(derive["removed"])} supprimee(s), '
+                f'{len(derive["changed"])} modifiee(s)).',
+                hint='Executez "python manage.py build_openapi_schema".',
+                id='api.W002',
+            )
+        ]
+    return []
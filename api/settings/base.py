@@ -44,12 +44,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
+    'api.tracing.TracingMiddleware',
+    'api.db_router.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'api.audit.AuditMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -76,6 +80,21 @@ WSGI_APPLICATION = 'api.wsgi.application'
 
 
 # Database
+# Gestion des connexions (DB_CONNECTION_MODE):
+# - 'persistent' (defaut): connexions conservees DB_CONN_MAX_AGE secondes par
+#   worker et verifiees avant reutilisation (CONN_HEALTH_CHECKS);
+# - 'pooler': derriere un pooler externe (PgBouncer en mode transaction),
+#   connexions courtes vers le pooler qui multiplexe celles vers PostgreSQL;
+# - 'per_request': une connexion par requete (ancien comportement).
+# Les curseurs serveur sont desactives par defaut: ils ne survivent pas
+# a un pooler en mode transaction.
+DB_CONNECTION_MODE = os.getenv('DB_CONNECTION_MODE', 'persistent')
+DB_CONN_MAX_AGE = {
+    'persistent': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+    'pooler': int(os.getenv('DB_CONN_MAX_AGE', '0')),
+    'per_request': 0,
+}.get(DB_CONNECTION_MODE, 0)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -84,9 +103,29 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', 'db'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': DB_CONN_MAX_AGE > 0,
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_DISABLE_SERVER_SIDE_CURSORS', 'True') == 'True',
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+        },
     }
 }
 
+# Replique en lecture (api.db_router): requetes GET et taches de rapport.
+# Apres une ecriture, les lectures de l'utilisateur restent sur le primaire
+# pendant REPLICA_STICKY_SECONDS pour couvrir le retard de replication.
+REPLICA_DB_ALIAS = 'replica'
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '10'))
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES[REPLICA_DB_ALIAS] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['api.db_router.ReplicaRouter']
+
 # Custom User Model
 AUTH_USER_MODEL = 'gestion_hospitaliere.Personnel'
 
@@ -151,8 +190,27 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'EXCEPTION_HANDLER': 'rest_framework.views.exception_handler',
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'api.renderers.ORJSONRenderer',
     ],
+    # Seaux a jetons Redis (api.throttling): par IP si anonyme, par utilisateur sinon
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.AnonTokenBucketThrottle',
+        'api.throttling.UserTokenBucketThrottle',
+    ],
+    # Portee -> 'N/periode' (s, m, h, d; ex. '5/15m'); portee vide: pas de limite
+    'DEFAULT_THROTTLE_RATES': {
+        scope: rate for scope, rate in {
+            'api': os.getenv('THROTTLE_RATE_API', '600/m'),
+            'recherche': os.getenv('THROTTLE_RATE_RECHERCHE', '60/m'),
+            'rapport': os.getenv('THROTTLE_RATE_RAPPORT', '20/m'),
+            'login': os.getenv('THROTTLE_RATE_LOGIN', '5/m'),
+            'login_ip': os.getenv('THROTTLE_RATE_LOGIN_IP', '60/m'),
+        }.items() if rate
+    },
+    # Proxys inverses devant l'API. 0: IP du client = REMOTE_ADDR (X-Forwarded-For,
+    # fourni par le client, est ignore). Derriere N proxys: NUM_PROXIES=N, l'IP est
+    # alors la N-ieme adresse en partant de la fin de X-Forwarded-For.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
 }
 
 # ==================================================
@@ -219,10 +277,15 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Schema pre-genere par 'manage.py build_openapi_schema' et servi par /api/schema/
+OPENAPI_SCHEMA_DIR = os.getenv('OPENAPI_SCHEMA_DIR', str(BASE_DIR / 'build' / 'openapi'))
+
 
 # ==================================================
 # CORS CONFIGURATION
 # ==================================================
+from corsheaders.defaults import default_headers
+
 CORS_ALLOW_ALL_ORIGINS = os.getenv('CORS_ALLOW_ALL_ORIGINS', 'False') == 'True'
 CORS_ALLOWED_ORIGINS = [
     'http://localhost:3000',
@@ -230,6 +293,8 @@ CORS_ALLOWED_ORIGINS = [
     'http://localhost:5173',  # Vite dev server
     'http://127.0.0.1:5173',  # Vite dev server
 ]
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Retry-After', 'Idempotent-Replayed']
 
 # ==================================================
 # EMAIL CONFIGURATION
@@ -270,4 +335,198 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.gestion_hospitaliere.tasks.check_expired_passwords',
         'schedule': crontab(hour=0, minute=0),  # Quotidien a minuit
     },
+    'purge-sync-tombstones': {
+        'task': 'apps.suivi_patient.tasks.purge_sync_tombstones',
+        'schedule': crontab(hour=1, minute=0),  # Quotidien a 1h
+    },
+    'generer-frais-hospitalisation': {
+        'task': 'apps.suivi_patient.tasks.generer_frais_hospitalisation',
+        'schedule': crontab(hour=0, minute=10),  # Quotidien a 0h10 (jour precedent, termine)
+    },
+    'detecter-doublons-patients': {
+        'task': 'apps.suivi_patient.tasks.detecter_doublons_patients',
+        'schedule': crontab(hour=2, minute=0),  # Quotidien a 2h
+    },
+    'rafraichir-dashboard-direction': {
+        'task': 'apps.gestion_hospitaliere.tasks.rafraichir_dashboard_direction',
+        'schedule': float(os.getenv('DASHBOARD_TTL', '60')),  # Cache toujours chaud
+    },
+    'ecrire-journal-audit': {
+        'task': 'apps.suivi_patient.tasks.ecrire_journal_audit',
+        'schedule': float(os.getenv('AUDIT_WRITE_INTERVAL', '5')),  # Transfert Redis -> base
+    },
+    'creer-partitions-audit': {
+        'task': 'apps.suivi_patient.tasks.creer_partitions_audit',
+        'schedule': crontab(hour=3, minute=0),  # Quotidien a 3h
+    },
 }
+
+# ==================================================
+# DELTA-SYNC (/api/sync/<resource>/)
+# ==================================================
+SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', '500'))
+SYNC_MAX_PAGE_SIZE = int(os.getenv('SYNC_MAX_PAGE_SIZE', '1000'))
+# Les ecritures plus recentes que cette fenetre sont differees au prochain appel
+SYNC_SETTLE_SECONDS = int(os.getenv('SYNC_SETTLE_SECONDS', '2'))
+# Au-dela, un jeton 'since' est refuse (410) et le client refait un instantane
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', '30'))
+
+# ==================================================
+# HEALTH CHECKS (/api/health/live/, /api/health/ready/)
+# ==================================================
+# Duree de mise en cache de l'etat base de donnees / Redis (secondes)
+HEALTH_CHECK_CACHE_TTL = float(os.getenv('HEALTH_CHECK_CACHE_TTL', '5'))
+# Timeout des sockets Redis utilisees par les sondes (secondes)
+HEALTH_CHECK_TIMEOUT = float(os.getenv('HEALTH_CHECK_TIMEOUT', '1'))
+HEALTH_REDIS_MAX_CONNECTIONS = int(os.getenv('HEALTH_REDIS_MAX_CONNECTIONS', '4'))
+# Etat Celery (workers, files) rafraichi en arriere-plan a cet intervalle
+HEALTH_CELERY_TTL = float(os.getenv('HEALTH_CELERY_TTL', '30'))
+HEALTH_CELERY_TIMEOUT = float(os.getenv('HEALTH_CELERY_TIMEOUT', '1'))
+
+# ==================================================
+# CACHE
+# ==================================================
+# Backends instrumentes (api.metrics): hits/miss exportes sur /metrics
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', '')
+CACHES = {
+    'default': {
+        'BACKEND': 'api.metrics.RedisCache' if CACHE_REDIS_URL else 'api.metrics.LocMemCache',
+        'LOCATION': CACHE_REDIS_URL or 'fultang-default',
+        'METRICS_NAME': 'default',
+    }
+}
+
+# ==================================================
+# LECTURE SUR LE PRIMAIRE APRES ECRITURE (api.db_router)
+# ==================================================
+# Fenetre REPLICA_STICKY_SECONDS partagee par tous les workers
+REPLICA_REDIS_URL = os.getenv('REPLICA_REDIS_URL', '') or CACHE_REDIS_URL or CELERY_BROKER_URL
+REPLICA_REDIS_TIMEOUT = float(os.getenv('REPLICA_REDIS_TIMEOUT', '0.2'))
+
+# ==================================================
+# TABLEAU DE BORD DE LA DIRECTION (/api/dashboard/direction/)
+# ==================================================
+# Indicateurs et verrou de recalcul partages par les workers et Celery
+DASHBOARD_REDIS_URL = os.getenv('DASHBOARD_REDIS_URL', '') or CACHE_REDIS_URL or CELERY_BROKER_URL
+DASHBOARD_REDIS_TIMEOUT = float(os.getenv('DASHBOARD_REDIS_TIMEOUT', '0.5'))
+# Au-dela, les indicateurs en cache sont servis et recalcules en arriere-plan
+DASHBOARD_TTL = float(os.getenv('DASHBOARD_TTL', '60'))
+# Duree de vie de l'entree du cache (servie perimee jusqu'a cette limite)
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', '3600'))
+# Expiration du verrou de recalcul (un seul recalcul a la fois)
+DASHBOARD_LOCK_SECONDS = int(os.getenv('DASHBOARD_LOCK_SECONDS', '60'))
+
+# ==================================================
+# JOURNAL D'AUDIT MEDICAL (api.audit)
+# ==================================================
+AUDIT_ENABLED = os.getenv('AUDIT_ENABLED', 'True') == 'True'
+AUDIT_REDIS_URL = os.getenv('AUDIT_REDIS_URL', '') or CACHE_REDIS_URL or CELERY_BROKER_URL
+AUDIT_REDIS_TIMEOUT = float(os.getenv('AUDIT_REDIS_TIMEOUT', '0.5'))
+# Le tampon du processus est vide des qu'il atteint cette taille...
+AUDIT_BUFFER_SIZE = int(os.getenv('AUDIT_BUFFER_SIZE', '200'))
+# ... ou a cet intervalle (secondes)
+AUDIT_FLUSH_SECONDS = float(os.getenv('AUDIT_FLUSH_SECONDS', '2'))
+# Au-dela (Redis et base injoignables), les evenements les plus anciens sont perdus
+AUDIT_BUFFER_MAX = int(os.getenv('AUDIT_BUFFER_MAX', '10000'))
+# Lots lus dans Redis et lignes par INSERT lors de l'ecriture en base
+AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE', '1000'))
+# Partitions mensuelles creees a l'avance (PostgreSQL)
+AUDIT_PARTITIONS_AHEAD = int(os.getenv('AUDIT_PARTITIONS_AHEAD', '3'))
+
+# ==================================================
+# LIMITATION DE DEBIT (api.throttling)
+# ==================================================
+THROTTLE_ENABLED = os.getenv('THROTTLE_ENABLED', 'True') == 'True'
+THROTTLE_REDIS_URL = os.getenv('THROTTLE_REDIS_URL', '') or CACHE_REDIS_URL or CELERY_BROKER_URL
+# Au-dela, la requete passe sans limite (Redis lent ne doit pas bloquer l'API)
+THROTTLE_REDIS_TIMEOUT = float(os.getenv('THROTTLE_REDIS_TIMEOUT', '0.2'))
+# Apres une erreur Redis, pas de limitation pendant ce delai
+THROTTLE_REDIS_RETRY_SECONDS = float(os.getenv('THROTTLE_REDIS_RETRY_SECONDS', '5'))
+
+# ==================================================
+# CLES D'IDEMPOTENCE (api.idempotence)
+# ==================================================
+IDEMPOTENCY_ENABLED = os.getenv('IDEMPOTENCY_ENABLED', 'True') == 'True'
+IDEMPOTENCY_REDIS_URL = os.getenv('IDEMPOTENCY_REDIS_URL', '') or CACHE_REDIS_URL or CELERY_BROKER_URL
+IDEMPOTENCY_REDIS_TIMEOUT = float(os.getenv('IDEMPOTENCY_REDIS_TIMEOUT', '0.5'))
+# Duree de conservation des reponses rejouables
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv('IDEMPOTENCY_TTL_SECONDS', '86400'))
+# Duree maximale d'une execution (le verrou expire ensuite)
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv('IDEMPOTENCY_LOCK_SECONDS', '30'))
+# Attente maximale d'un doublon concurrent avant de repondre 409
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv('IDEMPOTENCY_WAIT_SECONDS', '10'))
+
+# ==================================================
+# REQUETES GROUPEES (api.batch, /api/batch/)
+# ==================================================
+BATCH_MAX_REQUETES = int(os.getenv('BATCH_MAX_REQUETES', '20'))
+# Threads pour les lots de lectures en parallele (une connexion base par thread)
+BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', '4'))
+
+# ==================================================
+# OPTIMISATION DES QUERYSETS (api.optimisation)
+# ==================================================
+# Journalise (logger fultang.lazy_loads) les requetes SQL lancees pendant la
+# serialisation d'un objet: chargements paresseux non couverts par
+# select_related/prefetch_related. Outil de developpement (parcours de pile).
+QUERYSET_LAZY_LOAD_LOG = os.getenv('QUERYSET_LAZY_LOAD_LOG', 'False') == 'True'
+
+# ==================================================
+# METRIQUES PROMETHEUS (/metrics)
+# ==================================================
+# /metrics exige l'en-tete 'Authorization: Bearer <METRICS_TOKEN>'; sans jeton,
+# il ne repond qu'aux requetes de la machine elle-meme (127.0.0.1, ::1)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# ==================================================
+# TRACAGE DES REQUETES LENTES (api.tracing)
+# ==================================================
+# Fraction des requetes tracees (0 = desactive, 1 = toutes)
+TRACING_SAMPLE_RATE = float(os.getenv('TRACING_SAMPLE_RATE', '0.05'))
+# Les requetes tracees au-dela de ce seuil sont ecrites dans logs/slow_requests.log.<pid>
+TRACING_SLOW_REQUEST_MS = float(os.getenv('TRACING_SLOW_REQUEST_MS', '500'))
+# Nombre maximum de requetes SQL detaillees par trace
+TRACING_MAX_QUERIES = int(os.getenv('TRACING_MAX_QUERIES', '200'))
+SLOW_REQUEST_LOG_FILE = os.getenv('SLOW_REQUEST_LOG_FILE', str(BASE_DIR / 'logs' / 'slow_requests.log'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        # Le message est deja une ligne JSON
+        'json_line': {'format': '%(message)s'},
+    },
+    'handlers': {
+        # Un fichier par processus (<fichier>.<pid>): les workers gunicorn ne
+        # tournent pas un fichier partage; slow_requests_report lit <fichier>*
+        'slow_requests': {
+            'class': 'api.tracing.JournalParProcessus',
+            'filename': SLOW_REQUEST_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'formatter': 'json_line',
+        },
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'fultang.slow_requests': {
+            'handlers': ['slow_requests'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        'fultang.lazy_loads': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
+# ==================================================
+# DEMARRAGE DU CONTENEUR (entrypoint.sh, FAST_START=True)
+# ==================================================
+# Duree cible du demarrage a froid mesuree par la commande fast_start (secondes)
+COLD_START_TARGET_SECONDS = float(os.getenv('COLD_START_TARGET_SECONDS', '5'))
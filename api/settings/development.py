@@ -17,3 +17,6 @@ INSTALLED_APPS += [
 ]
 
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Chargements paresseux journalises pendant la serialisation (api.optimisation)
+QUERYSET_LAZY_LOAD_LOG = os.getenv('QUERYSET_LAZY_LOAD_LOG', 'True') == 'True'
@@ -4,5 +4,23 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
-    }
+    },
+    # Replique simulee: le lanceur de tests la fait pointer sur 'default'
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+        'TEST': {'MIRROR': 'default'},
+    },
 }
+
+# Pas de fenetre de lecture sur le primaire (pas de Redis pendant les tests)
+REPLICA_STICKY_SECONDS = 0
+
+# Pas de tracage echantillonne pendant les tests
+TRACING_SAMPLE_RATE = 0.0
+
+# Pas de limitation de debit (pas de Redis pendant les tests)
+THROTTLE_ENABLED = False
+
+# Pas de journal d'audit en ecriture differee (thread et Redis) pendant les tests
+AUDIT_ENABLED = False
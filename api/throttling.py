@@ -0,0 +1,190 @@
+"""
+Limitation de debit par seau a jetons (token bucket) dans Redis.
+
+Chaque seau (portee + identite) contient au plus N jetons et se remplit
+de N jetons par periode (taux DRF 'N/periode' de DEFAULT_THROTTLE_RATES).
+Le remplissage, la consommation et l'expiration sont faits par un script
+Lua: un seul aller-retour Redis, atomique entre tous les workers, sur
+l'horloge du serveur Redis. Une requete refusee recoit un 429 avec
+l'en-tete Retry-After (secondes avant le prochain jeton).
+
+Portee: attribut throttle_scope de la vue (ex. @action(throttle_scope=...)),
+sinon celle de la classe. Sans taux configure pour la portee, pas de limite.
+Si Redis est injoignable, les requetes passent (journalise) et Redis n'est
+plus sollicite pendant THROTTLE_REDIS_RETRY_SECONDS.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import logging
+import math
+import threading
+import time
+
+import redis
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: seau; ARGV[1]: capacite (jetons); ARGV[2]: debit (jetons/seconde)
+# Retourne {1 si autorise sinon 0, attente en secondes (chaine)}
+SCRIPT_SEAU_A_JETONS = """
+local capacite = tonumber(ARGV[1])
+local debit = tonumber(ARGV[2])
+local horloge = redis.call('TIME')
+local maintenant = tonumber(horloge[1]) + tonumber(horloge[2]) / 1000000
+local etat = redis.call('HMGET', KEYS[1], 'jetons', 'instant')
+local jetons = tonumber(etat[1]) or capacite
+local instant = tonumber(etat[2]) or maintenant
+jetons = math.min(capacite, jetons + math.max(0, maintenant - instant) * debit)
+local autorise = 0
+local attente = 0
+if jetons >= 1 then
+    jetons = jetons - 1
+    autorise = 1
+else
+    attente = (1 - jetons) / debit
+end
+redis.call('HSET', KEYS[1], 'jetons', tostring(jetons), 'instant', tostring(maintenant))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacite / debit * 1000) + 1000)
+return {autorise, tostring(attente)}
+"""
+
+_client = None
+_script = None
+_client_lock = threading.Lock()
+_indisponible_jusqu_a = 0.0
+
+
+def get_script():
+    """Script Lua enregistre sur un client adosse au pool du processus (EVALSHA)."""
+    global _client, _script
+    if _script is None:
+        with _client_lock:
+            if _script is None:
+                timeout = getattr(settings, 'THROTTLE_REDIS_TIMEOUT', 0.2)
+                _client = redis.Redis(connection_pool=redis.ConnectionPool.from_url(
+                    settings.THROTTLE_REDIS_URL,
+                    socket_connect_timeout=timeout,
+                    socket_timeout=timeout,
+                ))
+                _script = _client.register_script(SCRIPT_SEAU_A_JETONS)
+    return _script
+
+
+def consommer_jeton(cle, capacite, duree):
+    """
+    Consomme un jeton du seau `cle` (capacite jetons par `duree` secondes).
+
+    Retourne (autorise, attente en secondes). Autorise si Redis est injoignable.
+    """
+    global _indisponible_jusqu_a
+    if time.monotonic() < _indisponible_jusqu_a:
+        return True, 0.0
+    try:
+        autorise, attente = get_script()(keys=[cle], args=[capacite, capacite / duree])
+    except redis.RedisError as e:
+        _indisponible_jusqu_a = time.monotonic() + getattr(settings, 'THROTTLE_REDIS_RETRY_SECONDS', 5)
+        logger.warning('Limitation de debit desactivee temporairement, Redis injoignable: %s', e)
+        return True, 0.0
+    return bool(autorise), float(attente)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Classe de base: seau a jetons Redis par portee et par identite.
+
+    Les sous-classes definissent get_identite() (None: pas de limite).
+    """
+
+    scope = 'api'
+    prefixe = 'throttle'
+
+    def __init__(self):
+        self.attente = None
+
+    def get_identite(self, request, view):
+        raise NotImplementedError('.get_identite() doit etre defini')
+
+    def get_rate(self, scope):
+        """Taux 'N/periode' de la portee, ou None."""
+        return api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+
+    def parse_rate(self, rate):
+        """'10/min' -> (10, 60). Le nombre peut preceder l'unite ('5/15m')."""
+        nombre, periode = rate.split('/')
+        multiple = ''.join(c for c in periode if c.isdigit()) or '1'
+        unite = periode.lstrip('0123456789')[0]
+        duree = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[unite]
+        return int(nombre), int(multiple) * duree
+
+    def allow_request(self, request, view):
+        if not getattr(settings, 'THROTTLE_ENABLED', True):
+            return True
+        scope = getattr(view, 'throttle_scope', None) or self.scope
+        rate = self.get_rate(scope)
+        if rate is None:
+            return True
+        identite = self.get_identite(request, view)
+        if identite is None:
+            return True
+
+        capacite, duree = self.parse_rate(rate)
+        autorise, self.attente = consommer_jeton(
+            f'{self.prefixe}:{scope}:{identite}', capacite, duree
+        )
+        return autorise
+
+    def wait(self):
+        """Secondes avant le prochain jeton (en-tete Retry-After)."""
+        if not self.attente:
+            return None
+        return math.ceil(self.attente)
+
+
+class AnonTokenBucketThrottle(TokenBucketThrottle):
+    """Seau par adresse IP pour les requetes non authentifiees."""
+
+    def get_identite(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return f'ip:{self.get_ident(request)}'
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Seau par utilisateur authentifie (les postes d'un service partagent souvent une IP)."""
+
+    def get_identite(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return None
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    """Tentatives de connexion par adresse IP (portee 'login_ip')."""
+
+    scope = 'login_ip'
+
+    def get_identite(self, request, view):
+        return f'ip:{self.get_ident(request)}'
+
+
+class LoginIdentifiantThrottle(TokenBucketThrottle):
+    """Tentatives de connexion par compte vise (email ou matricule, portee 'login')."""
+
+    scope = 'login'
+
+    def get_identite(self, request, view):
+        identifiant = request.data.get('username') if hasattr(request.data, 'get') else None
+        if not isinstance(identifiant, str) or not identifiant.strip():
+            return None
+        return f'compte:{identifiant.strip().lower()[:150]}'
+
+
+# Classes pour les endpoints d'authentification
+LOGIN_THROTTLE_CLASSES = [LoginIPThrottle, LoginIdentifiantThrottle]
@@ -0,0 +1,154 @@
+"""
+Tracage echantillonne des requetes HTTP.
+
+Pour une fraction TRACING_SAMPLE_RATE des requetes, enregistre la vue,
+le poste de l'utilisateur, la duree totale et chaque requete SQL avec sa
+duree et la ligne du code du projet qui l'a declenchee. Les requetes
+tracees plus lentes que TRACING_SLOW_REQUEST_MS sont ecrites, une ligne
+JSON par requete, dans le logger 'fultang.slow_requests'
+(logs/slow_requests.log.<pid>: un fichier et une rotation par processus,
+les workers gunicorn ne se partagent pas un fichier).
+
+Les parametres SQL ne sont jamais journalises (donnees patients).
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import json
+import logging
+import logging.handlers
+import os
+import random
+import sys
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from api.metrics import libelles_vue
+
+
+logger = logging.getLogger('fultang.slow_requests')
+
+_RACINE = str(settings.BASE_DIR) + os.sep
+# Code applicatif uniquement: les middlewares de api/ encapsulent toutes les requetes
+_DOSSIER_APPS = _RACINE + 'apps' + os.sep
+
+
+def origine_appel():
+    """Retourne 'fichier:ligne fonction' du premier cadre appartenant aux apps du projet."""
+    cadre = sys._getframe(1)
+    while cadre is not None:
+        fichier = cadre.f_code.co_filename
+        if fichier.startswith(_DOSSIER_APPS):
+            return f'{fichier[len(_RACINE):]}:{cadre.f_lineno} {cadre.f_code.co_name}'
+        cadre = cadre.f_back
+    return None
+
+
+class JournalParProcessus(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler ecrivant dans <filename>.<pid>.
+
+    Chaque processus tourne son propre fichier: une rotation faite par un
+    worker ne fait plus ecrire les autres dans le fichier renomme. Le pid
+    est lu a l'ouverture, apres le fork des workers.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        self._chemin = os.path.abspath(filename)
+        self._pid = None
+        kwargs['delay'] = True
+        super().__init__(filename, *args, **kwargs)
+
+    def _open(self):
+        self._pid = os.getpid()
+        self.baseFilename = f'{self._chemin}.{self._pid}'
+        return super()._open()
+
+    def emit(self, record):
+        # Fichier ouvert avant un fork: le processus enfant ouvre le sien
+        if self.stream is not None and self._pid != os.getpid():
+            self.stream = None
+        super().emit(record)
+
+
+class _EnregistreurSQL:
+    """execute_wrapper enregistrant chaque requete SQL (texte, duree, origine)."""
+
+    def __init__(self, limite):
+        self.limite = limite
+        self.requetes = []
+        self.total = 0
+        self.duree_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        debut = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duree_ms = (time.perf_counter() - debut) * 1000
+            self.total += 1
+            self.duree_ms += duree_ms
+            if len(self.requetes) < self.limite:
+                self.requetes.append({
+                    'sql': sql,
+                    'ms': round(duree_ms, 3),
+                    'many': many,
+                    'origin': origine_appel(),
+                })
+
+
+class TracingMiddleware:
+    """Trace un echantillon de requetes et journalise les plus lentes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        taux = getattr(settings, 'TRACING_SAMPLE_RATE', 0.0)
+        if taux <= 0 or random.random() >= taux:
+            return self.get_response(request)
+
+        enregistreur = _EnregistreurSQL(getattr(settings, 'TRACING_MAX_QUERIES', 200))
+        debut = time.perf_counter()
+        with ExitStack() as stack:
+            for connexion in connections.all():
+                stack.enter_context(connexion.execute_wrapper(enregistreur))
+            response = self.get_response(request)
+        duree_ms = (time.perf_counter() - debut) * 1000
+
+        if duree_ms >= getattr(settings, 'TRACING_SLOW_REQUEST_MS', 500):
+            self._journaliser(request, response, duree_ms, enregistreur)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Memorise la vue resolue."""
+        request._tracing_vue = libelles_vue(view_func, request.method)
+
+    @staticmethod
+    def _journaliser(request, response, duree_ms, enregistreur):
+        """Ecrit la trace d'une requete lente (une ligne JSON)."""
+        vue, action = getattr(request, '_tracing_vue', ('non_resolue', request.method.lower()))
+        # DRF renseigne request.user apres authentification JWT
+        utilisateur = getattr(request, 'user', None)
+        trace = {
+            'timestamp': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'view': vue,
+            'action': action,
+            'status': response.status_code,
+            'user_id': getattr(utilisateur, 'pk', None),
+            'poste': getattr(utilisateur, 'poste', None),
+            'duration_ms': round(duree_ms, 3),
+            'sql_count': enregistreur.total,
+            'sql_ms': round(enregistreur.duree_ms, 3),
+            'sql_truncated': enregistreur.total > len(enregistreur.requetes),
+            'queries': enregistreur.requetes,
+        }
+        logger.warning(json.dumps(trace, default=str))
@@ -12,8 +12,11 @@ from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework import routers
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from api.batch import batch_view
+from api.metrics import metrics_view
+from api.throttling import LOGIN_THROTTLE_CLASSES
+from api.schema import schema_view
 from drf_spectacular.views import (
-    SpectacularAPIView,
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
@@ -23,12 +26,14 @@ router = routers.DefaultRouter()
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('api-auth/', include('rest_framework.urls')),
     path('api/', include(router.urls)),
 
     # JWT Authentication
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('api/token/', TokenObtainPairView.as_view(throttle_classes=LOGIN_THROTTLE_CLASSES), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/batch/', batch_view, name='batch'),
 
     # Applications URLs
     path('api/', include('apps.gestion_hospitaliere.urls')),
@@ -37,7 +42,7 @@ urlpatterns = [
     path('api/', include('apps.comptabilite_financiere.urls')),
 
     # Documentation API (Swagger/OpenAPI)
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('api/schema/', schema_view, name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
 ]
@@ -14,7 +14,10 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from django.utils import timezone
 from datetime import timedelta
 from django.db.models import Sum, Count
+from drf_spectacular.utils import extend_schema
 
+from api.champs import ChampsDynamiquesMixin
+from api.idempotence import PARAMETRE_IDEMPOTENCE, idempotent
 from apps.comptabilite_financiere.models import Quittance
 from apps.comptabilite_financiere.serializers import (
     QuittanceSerializer,
@@ -23,7 +26,7 @@ from apps.comptabilite_financiere.serializers import (
 )
 
 
-class QuittanceViewSet(viewsets.ModelViewSet):
+class QuittanceViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les quittances.
     
@@ -41,6 +44,7 @@ class QuittanceViewSet(viewsets.ModelViewSet):
     
     queryset = Quittance.objects.all()
     permission_classes = [IsAuthenticated]
+    throttle_scope = None  # portee api.throttling, redefinie par action
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     
     search_fields = ['numero_quittance', 'Motif']
@@ -54,6 +58,17 @@ class QuittanceViewSet(viewsets.ModelViewSet):
             return QuittanceUpdateSerializer
         return QuittanceSerializer
     
+    @extend_schema(parameters=[PARAMETRE_IDEMPOTENCE])
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """
+        Créer une quittance.
+        
+        Une requête renvoyée avec le même en-tête Idempotency-Key reçoit
+        la réponse de la première création (pas de quittance en double).
+        """
+        return super().create(request, *args, **kwargs)
+    
     @action(detail=False, methods=['get'])
     def du_jour(self, request):
         """
@@ -142,7 +157,7 @@ class QuittanceViewSet(viewsets.ModelViewSet):
             'quittances': serializer.data
         })
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_scope='rapport')
     def statistiques(self, request):
         """
         Statistiques globales sur les quittances.
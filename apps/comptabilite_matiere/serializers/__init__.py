@@ -7,6 +7,7 @@ from .besoin import (
     BesoinUpdateSerializer,
     CommentaireDirecteurSerializer,
     ModifierStatutSerializer,
+    DecisionGroupeeSerializer,
 )
 from .materiel import (
     MaterielSerializer,
@@ -35,6 +36,7 @@ __all__ = [
     'BesoinUpdateSerializer',
     'CommentaireDirecteurSerializer',
     'ModifierStatutSerializer',
+    'DecisionGroupeeSerializer',
     # Materiel
     'MaterielSerializer',
     'MaterielCreateSerializer',
@@ -69,6 +69,8 @@ class BesoinSerializer(serializers.ModelSerializer):
             'date_creation_besoin',
             'date_traitement_directeur',
         ]
+        # Relations lues par les SerializerMethodField (api.optimisation)
+        sources_methodes = {'idPersonnel_emetteur_details': ['idPersonnel_emetteur']}
     
     def get_idPersonnel_emetteur_details(self, obj):
         """Retourner des informations sur le personnel émetteur."""
@@ -178,3 +180,56 @@ class ModifierStatutSerializer(serializers.Serializer):
         instance.statut = validated_data['statut']
         instance.save(update_fields=['statut', 'date_traitement_directeur'])
         return instance
+
+
+class DecisionGroupeeSerializer(serializers.Serializer):
+    """
+    Sérialiseur pour la décision du directeur sur plusieurs besoins.
+    
+    Le statut et/ou le commentaire sont appliqués à tous les besoins listés;
+    la date de traitement est définie côté serveur.
+    """
+    
+    besoins = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500,
+        error_messages={
+            'empty': 'Au moins un besoin doit être indiqué.',
+            'max_length': 'Au plus 500 besoins peuvent être traités à la fois.',
+        }
+    )
+    statut = serializers.ChoiceField(
+        choices=Besoin.StatutChoices.choices,
+        required=False,
+        error_messages={
+            'invalid_choice': 'Statut invalide. Valeurs autorisées : NON_TRAITE, EN_COURS, TRAITE, REJETE.'
+        }
+    )
+    commentaire_directeur = serializers.CharField(
+        required=False,
+        allow_blank=False,
+        min_length=5,
+        max_length=1000,
+        error_messages={
+            'blank': 'Le commentaire ne peut pas être vide.',
+            'min_length': 'Le commentaire doit contenir au moins 5 caractères.',
+            'max_length': 'Le commentaire ne peut pas dépasser 1000 caractères.',
+        }
+    )
+    
+    def validate_besoins(self, value):
+        """Supprimer les doublons en conservant l'ordre."""
+        return list(dict.fromkeys(value))
+    
+    def validate_commentaire_directeur(self, value):
+        """Validation supplémentaire du commentaire."""
+        if not value.strip():
+            raise serializers.ValidationError("Le commentaire ne peut pas être vide ou contenir uniquement des espaces.")
+        return value.strip()
+    
+    def validate(self, attrs):
+        """Exiger un statut ou un commentaire."""
+        if 'statut' not in attrs and 'commentaire_directeur' not in attrs:
+            raise serializers.ValidationError("Indiquez un statut et/ou un commentaire du directeur.")
+        return attrs
@@ -83,6 +83,8 @@ class SortieSerializer(serializers.ModelSerializer):
         model = Sortie
         fields = '__all__'
         read_only_fields = ['idSortie']
+        # Relations lues par les SerializerMethodField (api.optimisation)
+        sources_methodes = {'idPersonnel_details': ['idPersonnel']}
     
     def get_idPersonnel_details(self, obj):
         """Retourner les détails du personnel."""
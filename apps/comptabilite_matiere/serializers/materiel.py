@@ -76,6 +76,11 @@ class MaterielMedicalSerializer(serializers.ModelSerializer):
         model = MaterielMedical
         fields = '__all__'
         read_only_fields = ['idMateriel', 'date_derniere_modification']
+        # Colonnes lues par les SerializerMethodField (api.optimisation)
+        sources_methodes = {
+            'marge': ['prix_achat_unitaire', 'prix_vente_unitaire'],
+            'taux_marge': ['prix_achat_unitaire', 'prix_vente_unitaire'],
+        }
     
     def get_marge(self, obj):
         """Retourner la marge bénéficiaire."""
@@ -155,6 +160,8 @@ class MaterielDurableSerializer(serializers.ModelSerializer):
         model = MaterielDurable
         fields = '__all__'
         read_only_fields = ['idMateriel', 'date_derniere_modification', 'date_Enregistrement']
+        # Colonnes lues par les SerializerMethodField (api.optimisation)
+        sources_methodes = {'est_operationnel': ['Etat']}
     
     def get_est_operationnel(self, obj):
         """Indique si le matériel est opérationnel."""
@@ -5,6 +5,8 @@ Author: DeDjomo
 Organization: ENSPY
 Date: 2025-12-18
 """
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -12,6 +14,7 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from api.champs import ChampsDynamiquesMixin
 from apps.comptabilite_matiere.models import Besoin
 from apps.comptabilite_matiere.serializers import (
     BesoinSerializer,
@@ -19,10 +22,11 @@ from apps.comptabilite_matiere.serializers import (
     BesoinUpdateSerializer,
     CommentaireDirecteurSerializer,
     ModifierStatutSerializer,
+    DecisionGroupeeSerializer,
 )
 
 
-class BesoinViewSet(viewsets.ModelViewSet):
+class BesoinViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les besoins.
     
@@ -34,9 +38,11 @@ class BesoinViewSet(viewsets.ModelViewSet):
     - DELETE /api/besoins/{id}/ : Supprimer un besoin
     - POST /api/besoins/{id}/ajouter_commentaire/ : Ajouter le commentaire du directeur
     - PATCH /api/besoins/{id}/modifier_statut/ : Modifier le statut
+    - POST /api/besoins/decision_groupee/ : Statut et commentaire de plusieurs besoins
     """
     
-    queryset = Besoin.objects.all()
+    # Le personnel émetteur est lu pour chaque besoin (idPersonnel_emetteur_details)
+    queryset = Besoin.objects.select_related('idPersonnel_emetteur')
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     
@@ -58,6 +64,8 @@ class BesoinViewSet(viewsets.ModelViewSet):
             return CommentaireDirecteurSerializer
         elif self.action == 'modifier_statut':
             return ModifierStatutSerializer
+        elif self.action == 'decision_groupee':
+            return DecisionGroupeeSerializer
         return BesoinSerializer
     
     def create(self, request, *args, **kwargs):
@@ -75,7 +83,7 @@ class BesoinViewSet(viewsets.ModelViewSet):
         self.perform_create(serializer)
         
         # Retourner les données complètes du besoin créé
-        besoin = Besoin.objects.get(pk=serializer.instance.pk)
+        besoin = self.queryset.get(pk=serializer.instance.pk)
         response_serializer = BesoinSerializer(besoin)
         
         headers = self.get_success_headers(response_serializer.data)
@@ -209,13 +217,72 @@ class BesoinViewSet(viewsets.ModelViewSet):
         
         Endpoint: GET /api/besoins/par_statut/
         """
+        # Une seule requête, regroupement en mémoire
+        groupes = {statut_key: [] for statut_key in Besoin.StatutChoices.values}
+        for besoin in BesoinSerializer(self.get_queryset(), many=True).data:
+            groupes[besoin['statut']].append(besoin)
+        
         statuts = {}
         for statut_key, statut_label in Besoin.StatutChoices.choices:
-            besoins = self.queryset.filter(statut=statut_key)
             statuts[statut_key] = {
                 'label': statut_label,
-                'count': besoins.count(),
-                'besoins': BesoinSerializer(besoins, many=True).data
+                'count': len(groupes[statut_key]),
+                'besoins': groupes[statut_key]
             }
         
         return Response(statuts)
+    
+    @action(detail=False, methods=['post'])
+    def decision_groupee(self, request):
+        """
+        Appliquer la décision du directeur à plusieurs besoins.
+        
+        Endpoint: POST /api/besoins/decision_groupee/
+        
+        Body (JSON):
+        {
+            "besoins": [1, 2, 3],
+            "statut": "TRAITE",  // optionnel
+            "commentaire_directeur": "Votre commentaire ici"  // optionnel
+        }
+        
+        Les besoins sont mis à jour en une seule requête (bulk_update); la
+        date de traitement est définie à la date/heure actuelle.
+        """
+        serializer = DecisionGroupeeSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        donnees = serializer.validated_data
+        champs = [
+            champ for champ in ('statut', 'commentaire_directeur') if champ in donnees
+        ] + ['date_traitement_directeur']
+        
+        with transaction.atomic():
+            besoins = list(
+                self.get_queryset().select_for_update(of=('self',))
+                .filter(pk__in=donnees['besoins'])
+                .order_by('idBesoin')
+            )
+            introuvables = set(donnees['besoins']) - {besoin.pk for besoin in besoins}
+            if introuvables:
+                return Response(
+                    {'besoins': [f"Besoins introuvables : {', '.join(map(str, sorted(introuvables)))}."]},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            maintenant = timezone.now()
+            for besoin in besoins:
+                for champ in champs[:-1]:
+                    setattr(besoin, champ, donnees[champ])
+                besoin.date_traitement_directeur = maintenant
+            Besoin.objects.bulk_update(besoins, champs)
+        
+        return Response(
+            {
+                "message": f"{len(besoins)} besoin(s) traité(s) avec succès.",
+                "count": len(besoins),
+                "besoins": BesoinSerializer(besoins, many=True).data
+            },
+            status=status.HTTP_200_OK
+        )
@@ -12,6 +12,7 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from api.champs import ChampsDynamiquesMixin
 from apps.comptabilite_matiere.models import Livraison, Sortie
 from apps.comptabilite_matiere.serializers import (
     LivraisonSerializer,
@@ -23,7 +24,7 @@ from apps.comptabilite_matiere.serializers import (
 )
 
 
-class LivraisonViewSet(viewsets.ModelViewSet):
+class LivraisonViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les livraisons.
     
@@ -37,6 +38,7 @@ class LivraisonViewSet(viewsets.ModelViewSet):
     
     queryset = Livraison.objects.all()
     permission_classes = [IsAuthenticated]
+    throttle_scope = None  # portee api.throttling, redefinie par action
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     
     search_fields = ['bon_livraison_numero', 'nom_fournisseur', 'contact_fournisseur']
@@ -75,7 +77,7 @@ class LivraisonViewSet(viewsets.ModelViewSet):
         
         return Response(result)
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_scope='rapport')
     def statistiques(self, request):
         """
         Statistiques sur les livraisons.
@@ -97,7 +99,7 @@ class LivraisonViewSet(viewsets.ModelViewSet):
         })
 
 
-class SortieViewSet(viewsets.ModelViewSet):
+class SortieViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les sorties.
     
@@ -111,6 +113,9 @@ class SortieViewSet(viewsets.ModelViewSet):
     
     queryset = Sortie.objects.all()
     permission_classes = [IsAuthenticated]
+    throttle_scope = None  # portee api.throttling, redefinie par action
+    # Listes sérialisées par SortieSerializer (personnel joint)
+    actions_optimisees = ('list', 'retrieve', 'par_motif', 'mes_sorties')
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     
     filterset_fields = ['motif_sortie', 'idPersonnel']
@@ -134,7 +139,7 @@ class SortieViewSet(viewsets.ModelViewSet):
         """
         motifs = {}
         for motif_key, motif_label in Sortie.MotifSortieChoices.choices:
-            sorties = self.queryset.filter(motif_sortie=motif_key)
+            sorties = self.get_queryset().filter(motif_sortie=motif_key)
             motifs[motif_key] = {
                 'label': motif_label,
                 'count': sorties.count(),
@@ -150,7 +155,7 @@ class SortieViewSet(viewsets.ModelViewSet):
         
         Endpoint: GET /api/sorties/mes_sorties/
         """
-        sorties = self.queryset.filter(idPersonnel=request.user)
+        sorties = self.get_queryset().filter(idPersonnel=request.user)
         page = self.paginate_queryset(sorties)
         
         if page is not None:
@@ -160,7 +165,7 @@ class SortieViewSet(viewsets.ModelViewSet):
         serializer = SortieSerializer(sorties, many=True)
         return Response(serializer.data)
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_scope='rapport')
     def statistiques(self, request):
         """
         Statistiques sur les sorties.
@@ -12,6 +12,7 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from api.champs import ChampsDynamiquesMixin
 from apps.comptabilite_matiere.models import Materiel, MaterielMedical, MaterielDurable
 from apps.comptabilite_matiere.serializers import (
     MaterielSerializer,
@@ -26,7 +27,7 @@ from apps.comptabilite_matiere.serializers import (
 )
 
 
-class MaterielViewSet(viewsets.ModelViewSet):
+class MaterielViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les matériels (base).
     
@@ -68,7 +69,7 @@ class MaterielViewSet(viewsets.ModelViewSet):
         })
 
 
-class MaterielMedicalViewSet(viewsets.ModelViewSet):
+class MaterielMedicalViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les matériels médicaux.
     
@@ -131,7 +132,7 @@ class MaterielMedicalViewSet(viewsets.ModelViewSet):
         })
 
 
-class MaterielDurableViewSet(viewsets.ModelViewSet):
+class MaterielDurableViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les matériels durables.
     
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class GestionHospitaliereConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.gestion_hospitaliere"
+
+    def ready(self):
+        from django.core import checks
+        from api.schema import verifier_schema
+
+        checks.register(verifier_schema, checks.Tags.compatibility, deploy=True)
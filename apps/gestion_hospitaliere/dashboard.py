@@ -0,0 +1,196 @@
+"""
+Indicateurs du tableau de bord de la direction (/api/dashboard/direction/).
+
+Les indicateurs (recettes, sessions, places, besoins, stocks,
+hospitalisations) sont calcules en quelques requetes d'agregation sur la
+replique, puis gardes dans Redis (DASHBOARD_REDIS_URL), partage par les
+workers de l'API et par Celery:
+- une entree plus recente que DASHBOARD_TTL secondes est servie telle quelle;
+- une entree perimee est servie immediatement et un seul recalcul (verrou
+  Redis, partage par les workers) est lance en arriere-plan;
+- la tache Celery rafraichir_dashboard_direction recalcule l'entree a
+  chaque DASHBOARD_TTL, la requete ne trouve donc pas d'entree froide
+  (sinon: recalcul en arriere-plan et reponse sans donnees);
+- si Redis est injoignable, les indicateurs sont calcules pendant la requete.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import logging
+import threading
+import time
+from datetime import datetime, time as heure
+
+import orjson
+import redis
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from api.db_router import sur_replica
+
+
+logger = logging.getLogger(__name__)
+
+CLE_CACHE = 'dashboard:direction'
+CLE_VERROU = f'{CLE_CACHE}:verrou'
+
+# Seuils de stock faible (comme les actions stock_faible)
+SEUIL_STOCK_MATERIEL = 10
+SEUIL_STOCK_MATERIEL_MEDICAL = 20
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Client Redis adosse a un pool du processus (cree au premier appel)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                timeout = getattr(settings, 'DASHBOARD_REDIS_TIMEOUT', 0.5)
+                _client = redis.Redis(connection_pool=redis.ConnectionPool.from_url(
+                    settings.DASHBOARD_REDIS_URL,
+                    socket_connect_timeout=timeout,
+                    socket_timeout=timeout,
+                ))
+    return _client
+
+
+def _montant(valeur):
+    return float(valeur) if valeur else 0
+
+
+@sur_replica
+def calculer_kpis_direction():
+    """Calcule les indicateurs de la direction (une requete par table)."""
+    from apps.comptabilite_financiere.models import Quittance
+    from apps.comptabilite_matiere.models import Besoin, Materiel
+    from apps.gestion_hospitaliere.models import Chambre
+    from apps.suivi_patient.models import Hospitalisation, Session
+
+    maintenant = timezone.now()
+    debut_jour = timezone.make_aware(datetime.combine(timezone.localdate(maintenant), heure.min))
+    debut_mois = debut_jour.replace(day=1)
+
+    quittances = Quittance.objects.order_by().aggregate(
+        total_quittances=Count('idQuittance'),
+        montant_total=Sum('Montant_paye'),
+        count_jour=Count('idQuittance', filter=Q(date_paiement__gte=debut_jour)),
+        total_jour=Sum('Montant_paye', filter=Q(date_paiement__gte=debut_jour)),
+        count_mois=Count('idQuittance', filter=Q(date_paiement__gte=debut_mois)),
+        total_mois=Sum('Montant_paye', filter=Q(date_paiement__gte=debut_mois)),
+    )
+    sessions = Session.objects.order_by().aggregate(
+        en_attente=Count('pk', filter=Q(statut='en attente')),
+        en_cours=Count('pk', filter=Q(statut='en cours')),
+    )
+    chambres = Chambre.objects.order_by().aggregate(
+        chambres=Count('pk'),
+        chambres_pleines=Count('pk', filter=Q(nombre_places_dispo__lte=0)),
+        places_total=Sum('nombre_places_total'),
+        places_dispo=Sum('nombre_places_dispo'),
+    )
+    besoins = dict.fromkeys(Besoin.StatutChoices.values, 0)
+    besoins.update(
+        Besoin.objects.order_by().values_list('statut').annotate(nombre=Count('idBesoin'))
+    )
+    stocks = Materiel.objects.order_by().aggregate(
+        materiels=Count('idMateriel', filter=Q(quantite_stock__lt=SEUIL_STOCK_MATERIEL)),
+        materiels_medicaux=Count('idMateriel', filter=Q(
+            materielmedical__isnull=False,
+            quantite_stock__lt=SEUIL_STOCK_MATERIEL_MEDICAL,
+        )),
+    )
+    hospitalises = Hospitalisation.objects.filter(statut='en cours').count()
+
+    return {
+        'quittances': {
+            'global': {
+                'total_quittances': quittances['total_quittances'],
+                'montant_total': _montant(quittances['montant_total']),
+            },
+            'aujourdhui': {
+                'count': quittances['count_jour'],
+                'total': _montant(quittances['total_jour']),
+            },
+            'ce_mois': {
+                'count': quittances['count_mois'],
+                'total': _montant(quittances['total_mois']),
+            },
+        },
+        'sessions': {
+            **sessions,
+            'ouvertes': sessions['en_attente'] + sessions['en_cours'],
+        },
+        'chambres': {
+            'chambres': chambres['chambres'],
+            'chambres_pleines': chambres['chambres_pleines'],
+            'places_total': chambres['places_total'] or 0,
+            'places_dispo': chambres['places_dispo'] or 0,
+        },
+        'besoins_par_statut': besoins,
+        'stock_faible': stocks,
+        'patients_hospitalises': hospitalises,
+    }
+
+
+def rafraichir():
+    """Recalcule les indicateurs et remplace l'entree dans Redis."""
+    entree = {
+        'data': calculer_kpis_direction(),
+        'calcule_le': timezone.now().isoformat(),
+        'horodatage': time.time(),
+    }
+    get_client().set(CLE_CACHE, orjson.dumps(entree), ex=getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 3600))
+    return entree
+
+
+def _rafraichir_en_arriere_plan():
+    """Corps du thread de recalcul: libere le verrou et la connexion du thread."""
+    try:
+        rafraichir()
+    except Exception as e:
+        logger.warning('Recalcul du tableau de bord de la direction impossible: %s', e)
+    finally:
+        try:
+            get_client().delete(CLE_VERROU)
+        except redis.RedisError:
+            pass
+        connections.close_all()
+
+
+def _lancer_rafraichissement(client):
+    """Lance un recalcul en arriere-plan, sauf si un worker en a deja lance un."""
+    if client.set(CLE_VERROU, 1, nx=True, ex=getattr(settings, 'DASHBOARD_LOCK_SECONDS', 60)):
+        threading.Thread(
+            target=_rafraichir_en_arriere_plan, name='dashboard-direction', daemon=True
+        ).start()
+
+
+def kpis_direction():
+    """
+    Retourne (indicateurs ou None, calcule_le, perime) sans calcul pendant
+    la requete. Une entree absente ou perimee declenche un recalcul en
+    arriere-plan.
+    """
+    client = get_client()
+    try:
+        brute = client.get(CLE_CACHE)
+        entree = orjson.loads(brute) if brute else None
+        if entree is None:
+            _lancer_rafraichissement(client)
+            return None, None, True
+
+        perime = time.time() - entree['horodatage'] >= getattr(settings, 'DASHBOARD_TTL', 60)
+        if perime:
+            _lancer_rafraichissement(client)
+        return entree['data'], entree['calcule_le'], perime
+    except redis.RedisError as e:
+        logger.warning('Redis injoignable pour le tableau de bord, calcul pendant la requete: %s', e)
+        return calculer_kpis_direction(), timezone.now().isoformat(), False
@@ -0,0 +1,159 @@
+"""
+Verifications de sante des dependances (base de donnees, Redis, Celery).
+
+Les sondes (liveness/readiness) sont appelees toutes les quelques secondes
+par l'orchestrateur sur chaque worker. Pour rester peu couteuses:
+- Redis est interroge via un pool de connexions partage par le processus;
+- la base de donnees est interrogee sur la connexion persistante du thread;
+- le resultat est garde en memoire HEALTH_CHECK_CACHE_TTL secondes;
+- l'etat de Celery est rafraichi en arriere-plan, jamais pendant la requete.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import logging
+import threading
+import time
+
+import redis
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+_redis_pool = None
+_redis_pool_lock = threading.Lock()
+
+_statut = {'services': None, 'expire': 0.0}
+_statut_lock = threading.Lock()
+
+_statut_celery = {'status': 'UNKNOWN', 'workers': None, 'queues': {}, 'checked_at': None}
+_celery_expire = 0.0
+_celery_lock = threading.Lock()
+_celery_en_cours = False
+
+
+def get_redis_client():
+    """Retourne un client Redis adosse au pool de connexions du processus."""
+    global _redis_pool
+    if _redis_pool is None:
+        with _redis_pool_lock:
+            if _redis_pool is None:
+                timeout = getattr(settings, 'HEALTH_CHECK_TIMEOUT', 1.0)
+                _redis_pool = redis.ConnectionPool.from_url(
+                    settings.CELERY_BROKER_URL,
+                    socket_connect_timeout=timeout,
+                    socket_timeout=timeout,
+                    max_connections=getattr(settings, 'HEALTH_REDIS_MAX_CONNECTIONS', 4),
+                )
+    return redis.Redis(connection_pool=_redis_pool)
+
+
+def verifier_base_de_donnees():
+    """Execute SELECT 1 sur la connexion du thread courant."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        return 'OK'
+    except Exception as e:
+        # Une connexion en erreur ne doit pas etre reutilisee par la prochaine sonde
+        connection.close()
+        return f'ERROR: {str(e)}'
+
+
+def verifier_redis():
+    """Envoie PING a Redis via le pool partage."""
+    try:
+        get_redis_client().ping()
+        return 'OK'
+    except Exception as e:
+        return f'ERROR: {str(e)}'
+
+
+def statut_en_cache():
+    """Retourne l'etat des dependances s'il est encore frais, sinon None."""
+    if _statut['services'] is not None and time.monotonic() < _statut['expire']:
+        return _statut['services']
+    return None
+
+
+def statut_dependances():
+    """
+    Retourne l'etat de la base de donnees et de Redis.
+
+    Un seul thread a la fois effectue les verifications; les autres
+    reutilisent le resultat des qu'il est disponible.
+    """
+    services = statut_en_cache()
+    if services is not None:
+        return services
+
+    with _statut_lock:
+        services = statut_en_cache()
+        if services is not None:
+            return services
+
+        services = {
+            'database': verifier_base_de_donnees(),
+            'redis': verifier_redis(),
+        }
+        _statut['services'] = services
+        _statut['expire'] = time.monotonic() + getattr(settings, 'HEALTH_CHECK_CACHE_TTL', 5)
+        return services
+
+
+def _rafraichir_celery():
+    """Interroge les workers et la longueur des files (thread d'arriere-plan)."""
+    global _celery_expire, _celery_en_cours
+    try:
+        from api.celery import app
+
+        files = getattr(settings, 'HEALTH_CELERY_QUEUES', None) or [
+            getattr(settings, 'CELERY_TASK_DEFAULT_QUEUE', 'celery')
+        ]
+        client = get_redis_client()
+        longueurs = {file: client.llen(file) for file in files}
+
+        reponses = app.control.inspect(
+            timeout=getattr(settings, 'HEALTH_CELERY_TIMEOUT', 1.0)
+        ).ping() or {}
+
+        _statut_celery.update(
+            status='OK' if reponses else 'NO_WORKER',
+            workers=len(reponses),
+            queues=longueurs,
+            checked_at=timezone.now().isoformat(),
+        )
+    except Exception as e:
+        logger.warning('Verification Celery impossible: %s', e)
+        _statut_celery.update(
+            status=f'ERROR: {str(e)}',
+            workers=None,
+            queues={},
+            checked_at=timezone.now().isoformat(),
+        )
+    finally:
+        with _celery_lock:
+            _celery_expire = time.monotonic() + getattr(settings, 'HEALTH_CELERY_TTL', 30)
+            _celery_en_cours = False
+
+
+def statut_celery():
+    """
+    Retourne le dernier etat connu de Celery sans bloquer.
+
+    Si cet etat est perime, un rafraichissement est lance dans un thread
+    d'arriere-plan; la reponse courante contient l'etat precedent.
+    """
+    global _celery_en_cours
+    with _celery_lock:
+        if not _celery_en_cours and time.monotonic() >= _celery_expire:
+            _celery_en_cours = True
+            threading.Thread(
+                target=_rafraichir_celery, name='health-celery', daemon=True
+            ).start()
+    return dict(_statut_celery)
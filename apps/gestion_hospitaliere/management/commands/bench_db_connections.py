@@ -0,0 +1,98 @@
+"""
+Commande Django mesurant le cout des connexions base de donnees par requete.
+
+Simule N requetes HTTP courtes (signaux request_started/request_finished,
+comme le gestionnaire WSGI, puis une requete SQL simple) pour trois modes:
+- connexion par requete (CONN_MAX_AGE=0);
+- connexion persistante (CONN_MAX_AGE>0);
+- connexion persistante avec verification (CONN_HEALTH_CHECKS).
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = 'Mesure le surcout de connexion base de donnees par requete (avant/apres CONN_MAX_AGE)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Nombre de requetes simulees par mode (defaut: 500)'
+        )
+        parser.add_argument(
+            '--database',
+            type=str,
+            default='default',
+            help='Alias de la base a mesurer (defaut: default)'
+        )
+
+    def handle(self, *args, **options):
+        nombre = options['requests']
+        connexion = connections[options['database']]
+        if nombre < 1:
+            raise CommandError('--requests doit etre superieur a 0.')
+        if connexion.vendor == 'sqlite' and connexion.is_in_memory_db():
+            raise CommandError('Base SQLite en memoire: fermer la connexion detruirait les donnees.')
+
+        reglages = connexion.settings_dict
+        origine = (reglages['CONN_MAX_AGE'], reglages['CONN_HEALTH_CHECKS'])
+        modes = [
+            ('Connexion par requete (CONN_MAX_AGE=0)', 0, False),
+            ('Persistante (CONN_MAX_AGE=600)', 600, False),
+            ('Persistante + CONN_HEALTH_CHECKS', 600, True),
+        ]
+
+        self.stdout.write(
+            f'Base: {connexion.vendor} {reglages.get("HOST") or ""} {reglages["NAME"]} - '
+            f'{nombre} requetes par mode'
+        )
+        self.stdout.write(f'  {"mode":<42} {"ms/requete":>11} {"connexions":>11}')
+        resultats = []
+        try:
+            for libelle, max_age, verification in modes:
+                reglages['CONN_MAX_AGE'] = max_age
+                reglages['CONN_HEALTH_CHECKS'] = verification
+                connexion.close()
+                duree, ouvertures = self._mesurer(connexion, nombre)
+                resultats.append(duree)
+                self.stdout.write(
+                    f'  {libelle:<42} {duree / nombre * 1000:>11.3f} {ouvertures:>11}'
+                )
+        finally:
+            reglages['CONN_MAX_AGE'], reglages['CONN_HEALTH_CHECKS'] = origine
+            connexion.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Surcout de connexion evite: {(resultats[0] - resultats[1]) / nombre * 1000:.3f} ms/requete'
+            )
+        )
+
+    @staticmethod
+    def _mesurer(connexion, nombre):
+        """Retourne (duree totale, nombre de connexions ouvertes)."""
+        ouvertures = 0
+        precedente = None
+        debut = time.perf_counter()
+        for _ in range(nombre):
+            request_started.send(sender=Command)
+            try:
+                with connexion.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+                if connexion.connection is not precedente:
+                    ouvertures += 1
+                    precedente = connexion.connection
+            finally:
+                request_finished.send(sender=Command)
+        return time.perf_counter() - debut, ouvertures
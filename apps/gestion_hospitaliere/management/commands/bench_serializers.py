@@ -0,0 +1,157 @@
+"""
+Commande Django mesurant le debit de serialisation des listes de sessions.
+
+Compare le chemin standard (SessionSerializer + JSONRenderer) au chemin
+rapide (SessionFastSerializer + ORJSONRenderer) et verifie que les deux
+produisent exactement le meme JSON. Les donnees de test sont creees dans
+une transaction annulee a la fin de la mesure.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import datetime
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from api.renderers import ORJSONRenderer
+from apps.gestion_hospitaliere.models import Personnel, Service
+from apps.gestion_hospitaliere.serializers.session_serializers import SessionSerializer
+from apps.gestion_hospitaliere.serializers.fast_serializers import SessionFastSerializer
+from apps.suivi_patient.models import Patient, Session
+
+
+class _Rollback(Exception):
+    """Force l'annulation de la transaction de mesure."""
+
+
+class Command(BaseCommand):
+    help = 'Mesure le debit de serialisation de N sessions (chemin standard vs rapide)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sessions',
+            type=int,
+            default=10000,
+            help='Nombre de sessions a serialiser (defaut: 10000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Nombre de repetitions, le meilleur temps est retenu (defaut: 3)'
+        )
+
+    def handle(self, *args, **options):
+        nombre = options['sessions']
+        repetitions = max(1, options['repeat'])
+        if nombre < 1:
+            raise CommandError('--sessions doit etre superieur a 0.')
+
+        try:
+            with transaction.atomic():
+                self._creer_donnees(nombre)
+                self._mesurer(nombre, repetitions)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _creer_donnees(self, nombre):
+        """Cree un personnel, N patients et N sessions (bulk_create)."""
+        self.stdout.write(f'Creation de {nombre} sessions de test...')
+        personnel = Personnel.objects.create(
+            username='bench.serializers',
+            nom='Bench',
+            prenom='Serializers',
+            date_naissance=datetime.date(1990, 1, 1),
+            email='bench.serializers@fultang.local',
+            contact='600000000',
+            matricule='BENCH00001',
+            poste='infirmier',
+        )
+        patients = Patient.objects.bulk_create(
+            [
+                Patient(
+                    nom=f'Patient{i}',
+                    prenom='Bench',
+                    date_naissance=datetime.date(1950 + i % 60, 1 + i % 12, 1 + i % 28),
+                    contact=f'0{i:08d}',
+                    nom_proche='Proche',
+                    contact_proche=f'1{i:08d}',
+                    matricule=f'BN{i:08d}',
+                    id_personnel=personnel,
+                )
+                for i in range(nombre)
+            ],
+            batch_size=1000,
+        )
+        service, _ = Service.objects.get_or_create(nom_service='Urgences')
+        statuts = [choix for choix, _ in Session.STATUT_CHOICES]
+        situations = [choix for choix, _ in Session.SITUATION_CHOICES]
+        Session.objects.bulk_create(
+            [
+                Session(
+                    id_patient=patient,
+                    id_personnel=personnel,
+                    service=service,
+                    personnel_responsable='infirmier',
+                    statut=statuts[i % len(statuts)],
+                    situation_patient=situations[i % len(situations)],
+                )
+                for i, patient in enumerate(patients)
+            ],
+            batch_size=1000,
+        )
+
+    def _mesurer(self, nombre, repetitions):
+        """Chronometre les deux chemins et compare leurs sorties."""
+        queryset = (
+            Session.objects.filter(id_personnel__matricule='BENCH00001')
+            .select_related('id_patient', 'id_personnel', 'service')
+            .order_by('-debut', 'id')
+        )
+
+        def standard():
+            data = SessionSerializer(queryset.all(), many=True).data
+            return JSONRenderer().render({'success': True, 'count': len(data), 'data': data})
+
+        def rapide():
+            data = SessionFastSerializer(queryset.all()).data
+            return ORJSONRenderer().render({'success': True, 'count': len(data), 'data': data})
+
+        temps_standard, sortie_standard = self._chronometrer(standard, repetitions)
+        temps_rapide, sortie_rapide = self._chronometrer(rapide, repetitions)
+
+        if json.loads(sortie_standard) != json.loads(sortie_rapide):
+            raise CommandError('Les sorties des deux chemins de serialisation different.')
+
+        self.stdout.write(f'Sessions serialisees: {nombre} (meilleur de {repetitions})')
+        self._afficher('SessionSerializer + JSONRenderer', nombre, temps_standard)
+        self._afficher('SessionFastSerializer + ORJSONRenderer', nombre, temps_rapide)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Sorties identiques. Acceleration: x{temps_standard / temps_rapide:.1f}'
+            )
+        )
+
+    @staticmethod
+    def _chronometrer(fonction, repetitions):
+        """Retourne le meilleur temps d'execution et la derniere sortie."""
+        meilleur = None
+        sortie = None
+        for _ in range(repetitions):
+            debut = time.perf_counter()
+            sortie = fonction()
+            duree = time.perf_counter() - debut
+            meilleur = duree if meilleur is None else min(meilleur, duree)
+        return meilleur, sortie
+
+    def _afficher(self, libelle, nombre, duree):
+        """Affiche la duree et le debit d'un chemin."""
+        self.stdout.write(
+            f'  {libelle:<42} {duree * 1000:8.1f} ms  {nombre / duree:10.0f} sessions/s'
+        )
@@ -0,0 +1,93 @@
+"""
+Commande Django mesurant le cout d'une verification de limitation de debit.
+
+Execute N verifications du seau a jetons (api.throttling, script Lua sur
+THROTTLE_REDIS_URL) reparties sur plusieurs seaux, puis affiche les
+percentiles de latence et les compare a l'objectif (1 ms par defaut).
+Les seaux de mesure sont supprimes a la fin.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import statistics
+import time
+
+import redis
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api import throttling
+
+
+class Command(BaseCommand):
+    help = "Mesure la latence d'une verification de limitation de debit (seau a jetons Redis)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--checks',
+            type=int,
+            default=5000,
+            help='Nombre de verifications (defaut: 5000)'
+        )
+        parser.add_argument(
+            '--buckets',
+            type=int,
+            default=100,
+            help='Nombre de seaux distincts (defaut: 100)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=str,
+            default='600/m',
+            help="Taux des seaux de mesure (defaut: 600/m)"
+        )
+        parser.add_argument(
+            '--target-ms',
+            type=float,
+            default=1.0,
+            help='Objectif de latence p99 en ms (defaut: 1.0)'
+        )
+
+    def handle(self, *args, **options):
+        nombre, seaux = options['checks'], options['buckets']
+        if nombre < 1 or seaux < 1:
+            raise CommandError('--checks et --buckets doivent etre superieurs a 0.')
+        capacite, duree = throttling.TokenBucketThrottle().parse_rate(options['rate'])
+
+        script = throttling.get_script()
+        cles = [f'{throttling.TokenBucketThrottle.prefixe}:bench:{i}' for i in range(seaux)]
+        try:
+            # Chargement du script (EVALSHA) et de la connexion hors mesure
+            script(keys=[cles[0]], args=[capacite, capacite / duree])
+            durees = []
+            refus = 0
+            for i in range(nombre):
+                debut = time.perf_counter()
+                autorise, _ = script(keys=[cles[i % seaux]], args=[capacite, capacite / duree])
+                durees.append((time.perf_counter() - debut) * 1000)
+                refus += not autorise
+        except redis.RedisError as e:
+            raise CommandError(f'Redis injoignable ({settings.THROTTLE_REDIS_URL}): {e}')
+        finally:
+            try:
+                script.registered_client.delete(*cles)
+            except redis.RedisError:
+                pass
+
+        centiles = statistics.quantiles(durees, n=100)
+        p50, p95, p99 = centiles[49], centiles[94], centiles[98]
+        self.stdout.write(
+            f'Redis: {settings.THROTTLE_REDIS_URL} - {nombre} verifications, '
+            f'{seaux} seaux, taux {options["rate"]} ({refus} refus)'
+        )
+        self.stdout.write(f'  {"moyenne":<8} {statistics.fmean(durees):>8.3f} ms')
+        for libelle, valeur in (('p50', p50), ('p95', p95), ('p99', p99), ('max', max(durees))):
+            self.stdout.write(f'  {libelle:<8} {valeur:>8.3f} ms')
+
+        objectif = options['target_ms']
+        if p99 <= objectif:
+            self.stdout.write(self.style.SUCCESS(f'p99 {p99:.3f} ms <= objectif {objectif} ms'))
+        else:
+            self.stdout.write(self.style.WARNING(f'p99 {p99:.3f} ms > objectif {objectif} ms'))
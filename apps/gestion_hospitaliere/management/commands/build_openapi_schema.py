@@ -0,0 +1,72 @@
+"""
+Commande Django construisant le schema OpenAPI servi par /api/schema/.
+
+Sans option, genere le schema et l'ecrit dans OPENAPI_SCHEMA_DIR.
+Avec --check, compare le schema construit au schema introspecte et
+echoue (code 1) en cas de derive, sans rien ecrire.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from api.schema import comparer, construire, generer_schema, lire_manifeste, schema_dir
+
+
+class Command(BaseCommand):
+    help = 'Construit le schema OpenAPI versionne (ou verifie sa derive avec --check)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Verifier que le schema construit correspond au code, sans l\'ecrire'
+        )
+
+    def handle(self, *args, **options):
+        debut = time.perf_counter()
+        schema = generer_schema()
+        duree = time.perf_counter() - debut
+
+        if options['check']:
+            self._verifier(schema)
+            return
+
+        manifeste = construire(schema)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Schema OpenAPI {manifeste["version"]} ({manifeste["sha256"][:12]}) '
+                f'genere en {duree * 1000:.0f} ms dans {schema_dir()}'
+            )
+        )
+        for format_schema, fichier in manifeste['files'].items():
+            self.stdout.write(f'  {format_schema}: {fichier} (+ .gz)')
+
+    def _verifier(self, schema):
+        """Affiche la derive entre le schema construit et le code."""
+        manifeste = lire_manifeste()
+        if manifeste is None:
+            raise CommandError(
+                f'Aucun schema construit dans {schema_dir()}. '
+                'Executez "python manage.py build_openapi_schema".'
+            )
+
+        derive = comparer(manifeste, schema)
+        if derive is None:
+            self.stdout.write(
+                self.style.SUCCESS(f'Schema a jour ({manifeste["sha256"][:12]}).')
+            )
+            return
+
+        for libelle, cle in (('ajoutee', 'added'), ('supprimee', 'removed'), ('modifiee', 'changed')):
+            for operation in derive[cle]:
+                self.stdout.write(f'  {libelle}: {operation}')
+        if derive['components_changed']:
+            self.stdout.write('  composants (serializers) modifies')
+        raise CommandError(
+            'Le schema construit ne correspond plus au code. '
+            'Executez "python manage.py build_openapi_schema".'
+        )
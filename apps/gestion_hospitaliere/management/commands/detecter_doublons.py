@@ -0,0 +1,45 @@
+"""
+Commande Django detectant les doublons de patients (file de revue).
+
+Voir apps.suivi_patient.doublons: regroupement par cles de blocage puis
+score de similarite des paires d'un meme bloc.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.suivi_patient.doublons import SEUIL_DOUBLON, TAILLE_MAX_BLOC, detecter_doublons
+
+
+class Command(BaseCommand):
+    help = 'Detecte les doublons de patients et alimente la file de revue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seuil',
+            type=float,
+            default=SEUIL_DOUBLON,
+            help=f'Score minimal d\'une paire proposee (defaut: {SEUIL_DOUBLON})'
+        )
+        parser.add_argument(
+            '--taille-max-bloc',
+            type=int,
+            default=TAILLE_MAX_BLOC,
+            help=f'Blocs plus grands ignores (defaut: {TAILLE_MAX_BLOC})'
+        )
+
+    def handle(self, *args, **options):
+        if not 0 < options['seuil'] <= 1:
+            raise CommandError('--seuil doit etre compris entre 0 et 1.')
+
+        debut = time.perf_counter()
+        stats = detecter_doublons(options['seuil'], options['taille_max_bloc'])
+        duree = time.perf_counter() - debut
+
+        for libelle, valeur in stats.items():
+            self.stdout.write(f'  {libelle:<20} {valeur:>10}')
+        self.stdout.write(self.style.SUCCESS(f'Detection terminee en {duree:.2f} s'))
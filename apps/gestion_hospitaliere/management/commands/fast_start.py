@@ -0,0 +1,155 @@
+"""
+Commande Django de demarrage rapide du conteneur (FAST_START=True).
+
+Remplace les etapes de entrypoint.sh par un seul processus Python:
+1. attend que la base de donnees accepte les connexions (sondage court);
+2. compare le plan de migrations applique aux migrations livrees et
+   n'execute migrate que s'il reste des migrations a appliquer
+   (jamais de makemigrations au demarrage);
+3. n'execute collectstatic que si l'empreinte des fichiers statiques
+   a change depuis la derniere collecte;
+4. construit le schema OpenAPI servi par /api/schema/ (un echec n'est
+   qu'un avertissement: la vue genere alors le schema a la demande).
+Chaque etape est chronometree et le total compare a COLD_START_TARGET_SECONDS.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.utils import OperationalError
+
+
+STATIC_HASH_FILE = '.collectstatic.sha256'
+
+
+def empreinte_statiques():
+    """Empreinte des fichiers que collectstatic copierait (chemin, taille, date)."""
+    sha = hashlib.sha256(settings.STORAGES['staticfiles']['BACKEND'].encode())
+    for finder in get_finders():
+        for chemin, storage in sorted(finder.list(['CVS', '.*', '*~']), key=lambda item: item[0]):
+            infos = os.stat(storage.path(chemin))
+            sha.update(f'{chemin}\0{infos.st_size}\0{infos.st_mtime_ns}\n'.encode())
+    return sha.hexdigest()
+
+
+class Command(BaseCommand):
+    help = 'Demarrage rapide: attente base, verification du plan de migrations, statiques et schema'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--db-timeout',
+            type=float,
+            default=60,
+            help='Attente maximale de la base de donnees en secondes (defaut: 60)'
+        )
+        parser.add_argument(
+            '--check-only',
+            action='store_true',
+            help='Echouer s\'il reste des migrations au lieu de les appliquer'
+        )
+
+    def handle(self, *args, **options):
+        self.etapes = []
+        debut = time.perf_counter()
+
+        self._etape('Base de donnees disponible', self._attendre_base, options['db_timeout'])
+        self._etape('Plan de migrations', self._migrations, options['check_only'])
+        if not settings.DEBUG or os.getenv('COLLECT_STATIC') == 'True':
+            self._etape('Fichiers statiques', self._statiques)
+        self._etape('Schema OpenAPI', self._schema)
+
+        total = time.perf_counter() - debut
+        cible = getattr(settings, 'COLD_START_TARGET_SECONDS', 5)
+        for libelle, duree, detail in self.etapes:
+            self.stdout.write(f'  {libelle:<30} {duree * 1000:>8.0f} ms  {detail}')
+        message = f'Demarrage rapide termine en {total:.2f} s (cible: {cible} s)'
+        style = self.style.SUCCESS if total <= cible else self.style.WARNING
+        self.stdout.write(style(message))
+
+    def _etape(self, libelle, fonction, *args):
+        """Execute et chronometre une etape."""
+        debut = time.perf_counter()
+        detail = fonction(*args)
+        self.etapes.append((libelle, time.perf_counter() - debut, detail or ''))
+
+    def _attendre_base(self, delai):
+        """Sonde la base toutes les 250 ms jusqu'a ce qu'elle reponde."""
+        connexion = connections[DEFAULT_DB_ALIAS]
+        limite = time.monotonic() + delai
+        tentatives = 0
+        while True:
+            tentatives += 1
+            try:
+                connexion.ensure_connection()
+                return f'{tentatives} tentative(s)'
+            except OperationalError as e:
+                connexion.close()
+                if time.monotonic() >= limite:
+                    raise CommandError(f'Base de donnees injoignable apres {delai:.0f} s: {e}')
+                time.sleep(0.25)
+
+    def _migrations(self, check_only):
+        """Compare les migrations appliquees aux migrations livrees."""
+        connexion = connections[DEFAULT_DB_ALIAS]
+        executor = MigrationExecutor(connexion)
+        loader = executor.loader
+
+        # Migrations appliquees absentes du code (image plus ancienne que la base)
+        inconnues = sorted(
+            f'{app}.{nom}' for app, nom in loader.applied_migrations
+            if (app, nom) not in loader.disk_migrations and app in loader.migrated_apps
+        )
+        if inconnues:
+            self.stdout.write(self.style.WARNING(
+                f'Migrations appliquees absentes du code: {", ".join(inconnues)}'
+            ))
+
+        plan = executor.migration_plan(loader.graph.leaf_nodes())
+        if not plan:
+            return 'a jour'
+        if check_only:
+            raise CommandError(
+                f'{len(plan)} migration(s) non appliquee(s): '
+                + ', '.join(f'{migration.app_label}.{migration.name}' for migration, _ in plan)
+            )
+        call_command('migrate', interactive=False, verbosity=0)
+        return f'{len(plan)} migration(s) appliquee(s)'
+
+    def _statiques(self):
+        """Execute collectstatic seulement si les sources ont change."""
+        empreinte = empreinte_statiques()
+        fichier = Path(settings.STATIC_ROOT) / STATIC_HASH_FILE
+        try:
+            if fichier.read_text().strip() == empreinte:
+                return 'inchanges, collectstatic ignore'
+        except OSError:
+            pass
+        call_command('collectstatic', interactive=False, clear=True, verbosity=0)
+        fichier.parent.mkdir(parents=True, exist_ok=True)
+        fichier.write_text(empreinte)
+        return 'collectes'
+
+    def _schema(self):
+        """Construit le schema OpenAPI (voir build_openapi_schema), sans bloquer le demarrage."""
+        from api.schema import construire
+
+        try:
+            manifeste = construire()
+        except Exception as e:
+            self.stdout.write(self.style.WARNING(
+                f'Schema OpenAPI non construit ({e}): /api/schema/ sera genere a la demande'
+            ))
+            return 'non construit'
+        return manifeste['sha256'][:12]
@@ -0,0 +1,204 @@
+"""
+Commande Django testant en charge la selection concurrente des patients.
+
+Pour chaque session en attente, N fils d'execution (chacun avec sa propre
+connexion) tentent de selectionner le patient au meme instant:
+- mode 'atomique': Session.objects.selectionner() (UPDATE conditionnel);
+- mode 'lecture-ecriture': lecture, verification puis save(), comme
+  avant l'UPDATE conditionnel.
+Une session selectionnee par plus d'un personnel est une double prise en
+charge. Les donnees de test sont supprimees a la fin.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import datetime
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from apps.gestion_hospitaliere.models import Personnel, Service
+from apps.suivi_patient.models import Patient, Session, SyncTombstone
+
+
+MATRICULE = 'LOADSEL001'
+SERVICE = 'Loadtest selection'
+
+
+def _selection_atomique(id_session):
+    return Session.objects.selectionner(id_session)
+
+
+def _selection_lecture_ecriture(id_session):
+    session = Session.objects.get(id=id_session)
+    if session.situation_patient != 'en attente':
+        return False
+    session.situation_patient = 'recu'
+    session.save(update_fields=['situation_patient'])
+    return True
+
+
+MODES = {
+    'atomique': _selection_atomique,
+    'lecture-ecriture': _selection_lecture_ecriture,
+}
+
+
+class Command(BaseCommand):
+    help = 'Test de charge: selections concurrentes du meme patient (double prise en charge)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sessions',
+            type=int,
+            default=200,
+            help='Nombre de sessions en attente a disputer (defaut: 200)'
+        )
+        parser.add_argument(
+            '--claimers',
+            type=int,
+            default=8,
+            help='Nombre de personnels selectionnant chaque patient en meme temps (defaut: 8)'
+        )
+        parser.add_argument(
+            '--mode',
+            choices=['atomique', 'lecture-ecriture', 'tous'],
+            default='tous',
+            help='Strategie de selection a tester (defaut: tous)'
+        )
+
+    def handle(self, *args, **options):
+        nombre = options['sessions']
+        concurrents = options['claimers']
+        if nombre < 1 or concurrents < 2:
+            raise CommandError('--sessions doit etre superieur a 0 et --claimers au moins 2.')
+        connexion = connections[DEFAULT_DB_ALIAS]
+        if connexion.vendor == 'sqlite' and connexion.is_in_memory_db():
+            raise CommandError('Base SQLite en memoire: non partagee entre les fils d\'execution.')
+
+        modes = list(MODES) if options['mode'] == 'tous' else [options['mode']]
+        self.stdout.write(
+            f'Base: {connexion.vendor} - {nombre} sessions, {concurrents} selections simultanees par session'
+        )
+        self.stdout.write(
+            f'  {"mode":<18} {"gagnants/session":>17} {"doubles":>8} {"erreurs":>8} {"ms/selection":>13}'
+        )
+
+        personnel = self._creer_personnel()
+        try:
+            for mode in modes:
+                ids = self._creer_sessions(personnel, nombre)
+                gagnants, erreurs, duree = self._disputer(MODES[mode], ids, concurrents)
+                doubles = sum(1 for total in gagnants.values() if total > 1)
+                moyenne = sum(gagnants.values()) / nombre
+                ligne = (
+                    f'  {mode:<18} {moyenne:>17.2f} {doubles:>8} {erreurs:>8} '
+                    f'{duree / (nombre * concurrents) * 1000:>13.3f}'
+                )
+                self.stdout.write(self.style.ERROR(ligne) if doubles else ligne)
+        finally:
+            self._nettoyer(personnel)
+
+    def _creer_personnel(self):
+        """Cree (ou reutilise) le personnel proprietaire des donnees de test."""
+        self._nettoyer(Personnel.objects.filter(matricule=MATRICULE).first())
+        return Personnel.objects.create(
+            username='loadtest.selection',
+            nom='Loadtest',
+            prenom='Selection',
+            date_naissance=datetime.date(1990, 1, 1),
+            email='loadtest.selection@fultang.local',
+            contact='600000001',
+            matricule=MATRICULE,
+            poste='infirmier',
+        )
+
+    @staticmethod
+    def _creer_sessions(personnel, nombre):
+        """Cree N patients avec une session en attente; retourne les ids de session."""
+        service, _ = Service.objects.get_or_create(nom_service=SERVICE)
+        decalage = Patient.objects.filter(id_personnel=personnel).count()
+        patients = Patient.objects.bulk_create(
+            [
+                Patient(
+                    nom=f'Patient{i}',
+                    prenom='Loadtest',
+                    date_naissance=datetime.date(1980, 1, 1),
+                    contact=f'2{i:08d}',
+                    nom_proche='Proche',
+                    contact_proche=f'3{i:08d}',
+                    matricule=f'LS{i:08d}',
+                    id_personnel=personnel,
+                )
+                for i in range(decalage, decalage + nombre)
+            ],
+            batch_size=1000,
+        )
+        sessions = Session.objects.bulk_create(
+            [
+                Session(
+                    id_patient=patient,
+                    id_personnel=personnel,
+                    service=service,
+                    personnel_responsable='infirmier',
+                )
+                for patient in patients
+            ],
+            batch_size=1000,
+        )
+        if sessions and sessions[0].id is None:
+            return list(
+                Session.objects.filter(id_patient__in=patients).values_list('id', flat=True)
+            )
+        return [session.id for session in sessions]
+
+    @staticmethod
+    def _disputer(selection, ids, concurrents):
+        """Lance les selections simultanees; retourne (gagnants par session, erreurs, duree)."""
+        gagnants = Counter()
+        erreurs = 0
+        verrou = threading.Lock()
+        depart = threading.Barrier(concurrents)
+
+        def personnel():
+            nonlocal erreurs
+            try:
+                for id_session in ids:
+                    # Tous les fils visent la meme session au meme instant
+                    depart.wait()
+                    try:
+                        gagne = selection(id_session)
+                    except Exception:
+                        with verrou:
+                            erreurs += 1
+                        continue
+                    if gagne:
+                        with verrou:
+                            gagnants[id_session] += 1
+            finally:
+                connections.close_all()
+
+        debut = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrents) as executor:
+            for futur in [executor.submit(personnel) for _ in range(concurrents)]:
+                futur.result()
+        return gagnants, erreurs, time.perf_counter() - debut
+
+    @staticmethod
+    def _nettoyer(personnel):
+        """Supprime les donnees de test et leurs traces de synchronisation."""
+        if personnel is None:
+            return
+        sessions = list(Session.objects.filter(id_personnel=personnel).values_list('id', flat=True))
+        patients = list(Patient.objects.filter(id_personnel=personnel).values_list('id', flat=True))
+        Session.objects.filter(id__in=sessions).delete()
+        Patient.objects.filter(id__in=patients).delete()
+        SyncTombstone.objects.filter(resource='sessions', object_id__in=sessions).delete()
+        SyncTombstone.objects.filter(resource='patients', object_id__in=patients).delete()
+        Service.objects.filter(nom_service=SERVICE).delete()
+        personnel.delete()
@@ -0,0 +1,161 @@
+"""
+Commande Django resumant le journal des requetes lentes (logs/slow_requests.log.<pid>
+de chaque processus et leurs rotations).
+
+Affiche les endpoints les plus lents (vue + action) et les requetes SQL
+les plus couteuses, regroupees par forme normalisee et par origine.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import glob
+import json
+import math
+import re
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+_LITTERAUX = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def normaliser_sql(sql):
+    """Remplace litteraux et listes IN par des marqueurs pour regrouper les requetes."""
+    for motif, remplacement in _LITTERAUX:
+        sql = motif.sub(remplacement, sql)
+    return sql.strip()
+
+
+def percentile(valeurs, rang):
+    """Percentile (plus proche rang) d'une liste triee."""
+    if not valeurs:
+        return 0.0
+    index = min(len(valeurs) - 1, max(0, math.ceil(rang / 100 * len(valeurs)) - 1))
+    return valeurs[index]
+
+
+class Command(BaseCommand):
+    help = 'Resume le journal des requetes lentes: pires endpoints et requetes SQL'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            type=str,
+            default=None,
+            help='Journal a analyser (defaut: SLOW_REQUEST_LOG_FILE, les fichiers de chaque '
+                 'processus et leurs rotations)'
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help='Nombre de lignes par tableau (defaut: 10)'
+        )
+        parser.add_argument(
+            '--hours',
+            type=float,
+            default=None,
+            help='Ne considerer que les dernieres N heures'
+        )
+
+    def handle(self, *args, **options):
+        chemin = options['file'] or settings.SLOW_REQUEST_LOG_FILE
+        fichiers = sorted(glob.glob(f'{glob.escape(chemin)}*'))
+        if not fichiers:
+            raise CommandError(f'Aucun journal trouve: {chemin}')
+
+        depuis = None
+        if options['hours'] is not None:
+            depuis = timezone.now() - timedelta(hours=options['hours'])
+
+        traces = list(self._lire(fichiers, depuis))
+        if not traces:
+            self.stdout.write(self.style.WARNING('Aucune requete lente sur la periode.'))
+            return
+
+        self.stdout.write(f'{len(traces)} requetes lentes analysees ({len(fichiers)} fichier(s))')
+        self._endpoints(traces, options['top'])
+        self._requetes_sql(traces, options['top'])
+
+    def _lire(self, fichiers, depuis):
+        """Lit les traces JSON, en ignorant les lignes illisibles."""
+        for fichier in fichiers:
+            with open(fichier, encoding='utf-8') as journal:
+                for ligne in journal:
+                    try:
+                        trace = json.loads(ligne)
+                    except ValueError:
+                        continue
+                    if depuis is not None:
+                        horodatage = parse_datetime(trace.get('timestamp') or '')
+                        if horodatage is None or horodatage < depuis:
+                            continue
+                    yield trace
+
+    def _endpoints(self, traces, top):
+        """Tableau des endpoints tries par duree cumulee."""
+        groupes = defaultdict(list)
+        for trace in traces:
+            groupes[(trace.get('view'), trace.get('action'))].append(trace)
+
+        lignes = []
+        for (vue, action), elements in groupes.items():
+            durees = sorted(element['duration_ms'] for element in elements)
+            lignes.append({
+                'endpoint': f'{vue}.{action}',
+                'nombre': len(elements),
+                'total': sum(durees),
+                'p50': percentile(durees, 50),
+                'p95': percentile(durees, 95),
+                'max': durees[-1],
+                'sql': sum(element.get('sql_count', 0) for element in elements) / len(elements),
+                'postes': ','.join(sorted({str(element.get('poste')) for element in elements})),
+            })
+        lignes.sort(key=lambda ligne: ligne['total'], reverse=True)
+
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS('Pires endpoints (duree cumulee)'))
+        self.stdout.write(
+            f'  {"endpoint":<45} {"n":>5} {"p50 ms":>9} {"p95 ms":>9} {"max ms":>9} {"sql/req":>8}  postes'
+        )
+        for ligne in lignes[:top]:
+            self.stdout.write(
+                f'  {ligne["endpoint"]:<45} {ligne["nombre"]:>5} {ligne["p50"]:>9.1f} '
+                f'{ligne["p95"]:>9.1f} {ligne["max"]:>9.1f} {ligne["sql"]:>8.1f}  {ligne["postes"]}'
+            )
+
+    def _requetes_sql(self, traces, top):
+        """Tableau des requetes SQL triees par temps cumule."""
+        groupes = defaultdict(lambda: {'nombre': 0, 'total': 0.0, 'max': 0.0, 'endpoints': set()})
+        for trace in traces:
+            endpoint = f'{trace.get("view")}.{trace.get("action")}'
+            for requete in trace.get('queries', []):
+                groupe = groupes[(normaliser_sql(requete['sql']), requete.get('origin'))]
+                groupe['nombre'] += 1
+                groupe['total'] += requete['ms']
+                groupe['max'] = max(groupe['max'], requete['ms'])
+                groupe['endpoints'].add(endpoint)
+
+        lignes = sorted(groupes.items(), key=lambda item: item[1]['total'], reverse=True)
+
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS('Pires requetes SQL (temps cumule)'))
+        for (sql, origine), groupe in lignes[:top]:
+            self.stdout.write(
+                f'  {groupe["total"]:>9.1f} ms  x{groupe["nombre"]:<5} max {groupe["max"]:.1f} ms  '
+                f'{origine or "origine inconnue"}'
+            )
+            self.stdout.write(f'      {sql[:200]}')
+            self.stdout.write(f'      endpoints: {", ".join(sorted(groupe["endpoints"]))}')
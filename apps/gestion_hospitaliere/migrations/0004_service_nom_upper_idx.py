@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:40
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gestion_hospitaliere", "0003_personnel_adresse_personnel_date_embauche_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                django.db.models.functions.text.Upper("nom_service"),
+                name="service_nom_upper_idx",
+            ),
+        ),
+    ]
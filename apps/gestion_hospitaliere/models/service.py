@@ -7,6 +7,20 @@ Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
 Date: 2025-12-14
 """
 from django.db import models
+from django.db.models.functions import Upper
+
+
+class ServiceQuerySet(models.QuerySet):
+    """QuerySet des services."""
+
+    def id_par_nom(self, nom):
+        """
+        Retourne l'id du service portant ce nom (insensible a la casse), ou None.
+
+        Permet aux parametres d'API par nom de service de filtrer ensuite
+        les sessions sur la cle etrangere (index entier).
+        """
+        return self.filter(nom_service__iexact=nom.strip()).values_list('id', flat=True).first()
 
 
 class Service(models.Model):
@@ -23,10 +37,16 @@ class Service(models.Model):
     )
     date_creation = models.DateField(auto_now_add=True)
 
+    objects = ServiceQuerySet.as_manager()
+
     class Meta:
         ordering = ['nom_service']
         verbose_name = 'Service'
         verbose_name_plural = 'Services'
+        indexes = [
+            # Recherche par nom insensible a la casse (nom_service__iexact)
+            models.Index(Upper('nom_service'), name='service_nom_upper_idx'),
+        ]
 
     def __str__(self):
         return self.nom_service
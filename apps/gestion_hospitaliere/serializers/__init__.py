@@ -35,6 +35,7 @@ from .infirmier_serializers import (
     RedirectionPatientSerializer,
 )
 from .medecin_serializers import (
+    LignePrescriptionSerializer,
     PrescriptionMedicamentSerializer,
     PrescriptionMedicamentCreateSerializer,
     PrescriptionExamenSerializer,
@@ -51,6 +52,24 @@ from .dossier_patient_serializers import (
     DossierPatientCreateSerializer,
     DossierPatientUpdateSerializer,
 )
+from .laboratoire_serializers import ResultatsExamenLotSerializer
+from .doublon_serializers import (
+    DoublonPatientSerializer,
+    FusionDoublonSerializer,
+)
+from .signe_vital_serializers import (
+    SigneVitalSerializer,
+    SignesVitauxCreateSerializer,
+)
+from .audit_serializers import (
+    EvenementAuditSerializer,
+    FiltreJournalAuditSerializer,
+)
+from .fast_serializers import (
+    SessionFastSerializer,
+    PatientFastSerializer,
+    RendezVousFastSerializer,
+)
 
 __all__ = [
     'AdminSerializer',
@@ -75,6 +94,7 @@ __all__ = [
     'ObservationMedicaleSerializer',
     'ObservationMedicaleCreateSerializer',
     'RedirectionPatientSerializer',
+    'LignePrescriptionSerializer',
     'PrescriptionMedicamentSerializer',
     'PrescriptionMedicamentCreateSerializer',
     'PrescriptionExamenSerializer',
@@ -88,4 +108,14 @@ __all__ = [
     'DossierPatientSerializer',
     'DossierPatientCreateSerializer',
     'DossierPatientUpdateSerializer',
+    'ResultatsExamenLotSerializer',
+    'DoublonPatientSerializer',
+    'FusionDoublonSerializer',
+    'SigneVitalSerializer',
+    'SignesVitauxCreateSerializer',
+    'EvenementAuditSerializer',
+    'FiltreJournalAuditSerializer',
+    'SessionFastSerializer',
+    'PatientFastSerializer',
+    'RendezVousFastSerializer',
 ]
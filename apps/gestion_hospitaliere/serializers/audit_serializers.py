@@ -0,0 +1,32 @@
+"""
+Serializers pour le journal d'audit medical.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from rest_framework import serializers
+from apps.suivi_patient.models import EvenementAudit
+
+
+class EvenementAuditSerializer(serializers.ModelSerializer):
+    """Serializer pour la lecture d'un evenement du journal d'audit."""
+
+    class Meta:
+        model = EvenementAudit
+        fields = ['id', 'horodatage', 'id_personnel', 'action', 'modele', 'objet_id', 'id_patient']
+        read_only_fields = fields
+
+
+class FiltreJournalAuditSerializer(serializers.Serializer):
+    """Parametres de filtre du journal (periode et action)."""
+
+    debut = serializers.DateTimeField(required=False)
+    fin = serializers.DateTimeField(required=False)
+    action = serializers.ChoiceField(choices=EvenementAudit.ACTION_CHOICES, required=False)
+
+    def validate(self, attrs):
+        if 'debut' in attrs and 'fin' in attrs and attrs['debut'] >= attrs['fin']:
+            raise serializers.ValidationError('debut doit preceder fin.')
+        return attrs
@@ -0,0 +1,47 @@
+"""
+Serializers pour la file de revue des doublons de patients.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from rest_framework import serializers
+from apps.suivi_patient.models import DoublonPatient, Patient
+
+
+class PatientDoublonSerializer(serializers.ModelSerializer):
+    """Resume d'un patient pour la comparaison cote a cote."""
+
+    class Meta:
+        model = Patient
+        fields = [
+            'id', 'matricule', 'nom', 'prenom', 'date_naissance', 'contact',
+            'email', 'adresse', 'nom_proche', 'contact_proche', 'date_inscription'
+        ]
+        read_only_fields = fields
+
+
+class DoublonPatientSerializer(serializers.ModelSerializer):
+    """Serializer pour la lecture d'une paire de la file de revue."""
+
+    patient_a = PatientDoublonSerializer(source='id_patient_a', read_only=True)
+    patient_b = PatientDoublonSerializer(source='id_patient_b', read_only=True)
+
+    class Meta:
+        model = DoublonPatient
+        fields = [
+            'id', 'score', 'cle_blocage', 'statut', 'matricule_a', 'matricule_b',
+            'patient_a', 'patient_b', 'date_detection', 'date_decision', 'id_personnel'
+        ]
+        read_only_fields = fields
+
+
+class FusionDoublonSerializer(serializers.Serializer):
+    """
+    Serializer pour la fusion d'une paire.
+
+    Champs obligatoires: id_patient_conserve (l'un des deux patients de la paire)
+    """
+
+    id_patient_conserve = serializers.IntegerField()
@@ -0,0 +1,148 @@
+"""
+Serializers de lecture rapides bases sur QuerySet.values().
+
+Ces classes produisent exactement la meme sortie que PatientSerializer,
+SessionSerializer et RendezVousSerializer pour les listes volumineuses,
+sans instancier de modeles ni de champs DRF par ligne: les jointures
+sont faites en SQL et chaque ligne est un simple dict.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from rest_framework import serializers
+from apps.suivi_patient.models import Session, RendezVous
+
+
+_datetime_field = serializers.DateTimeField()
+_date_field = serializers.DateField()
+
+
+def _datetime(value):
+    """Formate un datetime comme serializers.DateTimeField."""
+    return _datetime_field.to_representation(value)
+
+
+def _date(value):
+    """Formate une date comme serializers.DateField."""
+    return _date_field.to_representation(value)
+
+
+def _display(choices):
+    """Retourne un convertisseur valeur -> libelle (equivalent de get_FOO_display)."""
+    libelles = dict(choices)
+    return lambda value: libelles.get(value, value)
+
+
+class ValuesSerializer:
+    """
+    Serializer de lecture construit a partir de QuerySet.values().
+
+    Les sous-classes declarent `fields`: une liste de tuples
+    (cle de sortie, chemin ORM, convertisseur ou None).
+    Les valeurs None ne sont jamais converties (comme DRF).
+    `champs` (?fields=) restreint la sortie a ces cles: seules leurs
+    colonnes sont selectionnees, les jointures inutiles disparaissent.
+    """
+
+    fields = []
+
+    def __init__(self, queryset, champs=None):
+        self.queryset = queryset
+        if champs is not None:
+            self.fields = [field for field in self.fields if field[0] in champs]
+
+    def lookups(self):
+        """Chemins ORM distincts a passer a values()."""
+        return list(dict.fromkeys(lookup for _, lookup, _ in self.fields))
+
+    def get_rows(self):
+        """Execute la requete (jointures SQL) et retourne les dicts bruts."""
+        return self.queryset.values(*self.lookups())
+
+    def to_representation(self, row):
+        """Construit la representation d'une ligne."""
+        return {
+            key: (converter(row[lookup]) if converter and row[lookup] is not None else row[lookup])
+            for key, lookup, converter in self.fields
+        }
+
+    @property
+    def data(self):
+        """Liste des representations, dans l'ordre du queryset."""
+        to_representation = self.to_representation
+        return [to_representation(row) for row in self.get_rows()]
+
+
+class SessionFastSerializer(ValuesSerializer):
+    """Equivalent rapide de session_serializers.SessionSerializer."""
+
+    fields = [
+        ('id', 'id', None),
+        ('debut', 'debut', _datetime),
+        ('fin', 'fin', _datetime),
+        ('id_patient', 'id_patient', None),
+        ('id_personnel', 'id_personnel', None),
+        ('service', 'service', None),
+        ('service_courant', 'service__nom_service', None),
+        ('personnel_responsable', 'personnel_responsable', None),
+        ('statut', 'statut', None),
+        ('situation_patient', 'situation_patient', None),
+        ('patient_nom', 'id_patient__nom', None),
+        ('patient_prenom', 'id_patient__prenom', None),
+        ('patient_matricule', 'id_patient__matricule', None),
+        ('personnel_nom', 'id_personnel__nom', None),
+        ('personnel_prenom', 'id_personnel__prenom', None),
+        ('statut_display', 'statut', _display(Session.STATUT_CHOICES)),
+        ('situation_display', 'situation_patient', _display(Session.SITUATION_CHOICES)),
+    ]
+
+
+class PatientFastSerializer(ValuesSerializer):
+    """Equivalent rapide de PatientSerializer."""
+
+    fields = [
+        ('id', 'id', None),
+        ('nom', 'nom', None),
+        ('prenom', 'prenom', None),
+        ('date_naissance', 'date_naissance', _date),
+        ('adresse', 'adresse', None),
+        ('email', 'email', None),
+        ('contact', 'contact', None),
+        ('nom_proche', 'nom_proche', None),
+        ('contact_proche', 'contact_proche', None),
+        ('matricule', 'matricule', None),
+        ('date_inscription', 'date_inscription', _date),
+        ('id_personnel', 'id_personnel', None),
+        ('personnel_nom', 'id_personnel__nom', None),
+        ('personnel_prenom', 'id_personnel__prenom', None),
+        ('age', 'age', None),
+    ]
+
+    def get_rows(self):
+        """Ajoute l'annotation SQL `age` si elle est lue et absente du queryset."""
+        queryset = self.queryset
+        lookups = self.lookups()
+        if 'age' in lookups and 'age' not in queryset.query.annotations:
+            queryset = queryset.avec_age()
+        return queryset.values(*lookups)
+
+
+class RendezVousFastSerializer(ValuesSerializer):
+    """Equivalent rapide de RendezVousSerializer."""
+
+    fields = [
+        ('id', 'id', None),
+        ('date_heure', 'date_heure', _datetime),
+        ('id_patient', 'id_patient', None),
+        ('id_medecin', 'id_medecin', None),
+        ('statut', 'statut', None),
+        ('statut_display', 'statut', _display(RendezVous.STATUT_CHOICES)),
+        ('patient_nom', 'id_patient__nom', None),
+        ('patient_prenom', 'id_patient__prenom', None),
+        ('patient_matricule', 'id_patient__matricule', None),
+        ('medecin_nom', 'id_medecin__nom', None),
+        ('medecin_prenom', 'id_medecin__prenom', None),
+        ('medecin_specialite', 'id_medecin__specialite', None),
+    ]
@@ -17,13 +17,14 @@ class SessionSerializer(serializers.ModelSerializer):
     patient = PatientSerializer(source='id_patient', read_only=True)
     personnel_nom = serializers.CharField(source='id_personnel.nom', read_only=True)
     personnel_prenom = serializers.CharField(source='id_personnel.prenom', read_only=True)
+    service_courant = serializers.CharField(source='service.nom_service', read_only=True)
 
     class Meta:
         model = Session
         fields = [
             'id', 'debut', 'fin', 'id_patient', 'patient',
             'id_personnel', 'personnel_nom', 'personnel_prenom',
-            'service_courant', 'personnel_responsable',
+            'service', 'service_courant', 'personnel_responsable',
             'statut', 'situation_patient'
         ]
         read_only_fields = ['id', 'debut']
@@ -116,7 +117,7 @@ class RedirectionPatientSerializer(serializers.Serializer):
     Serializer pour la redirection d'un patient.
 
     Types de redirection:
-    - 'service': Redirection vers un service (change service_courant)
+    - 'service': Redirection vers un service (change service)
     - 'personnel': Redirection vers un poste de personnel (change personnel_responsable)
     """
 
@@ -145,10 +146,12 @@ class RedirectionPatientSerializer(serializers.Serializer):
         if type_redirection == 'service':
             # Verifier que le service existe
             from apps.gestion_hospitaliere.models import Service
-            if not Service.objects.filter(nom_service=redirection).exists():
+            id_service = Service.objects.id_par_nom(redirection)
+            if id_service is None:
                 raise serializers.ValidationError({
                     'redirection': f'Aucun service trouve avec le nom "{redirection}".'
                 })
+            attrs['id_service'] = id_service
 
         elif type_redirection == 'personnel':
             # Verifier que le poste existe
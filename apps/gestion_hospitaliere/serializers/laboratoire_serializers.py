@@ -0,0 +1,113 @@
+"""
+Serializers pour le laboratoire (saisie groupee des resultats d'examens).
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from django.db.models import Exists, OuterRef
+from rest_framework import serializers
+from api import audit
+from apps.suivi_patient.models import PrescriptionExamen, ResultatExamen
+from apps.gestion_hospitaliere.models import Medecin
+
+
+# Nombre maximum de resultats par envoi
+MAX_RESULTATS = 500
+
+
+class ResultatLotSerializer(serializers.Serializer):
+    """
+    Serializer pour un resultat du lot.
+
+    Champs obligatoires: id_prescription, resultat
+    Champs optionnels: id_medecin (par defaut: celui du lot)
+    """
+
+    id_prescription = serializers.IntegerField()
+    resultat = serializers.CharField()
+    id_medecin = serializers.IntegerField(required=False)
+
+
+class ResultatsExamenLotSerializer(serializers.Serializer):
+    """
+    Serializer pour l'enregistrement groupe de resultats d'examens.
+
+    Tous les IDs du lot sont verifies en une requete par table, puis les
+    resultats sont inseres en une seule requete (bulk_create). Une
+    prescription ne recoit qu'un resultat: les doublons du lot et les
+    prescriptions deja renseignees (lot renvoye apres un timeout) sont
+    refuses.
+    """
+
+    resultats = ResultatLotSerializer(many=True, allow_empty=False, max_length=MAX_RESULTATS)
+    id_medecin = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        """Verifie les medecins et prescriptions de tout le lot."""
+        resultats = attrs['resultats']
+        erreurs = {}
+
+        for index, resultat in enumerate(resultats):
+            resultat.setdefault('id_medecin', attrs.get('id_medecin'))
+            if resultat['id_medecin'] is None:
+                erreurs[index] = {'id_medecin': 'Obligatoire si absent au niveau du lot.'}
+
+        medecins = set(
+            Medecin.objects.filter(
+                id__in={r['id_medecin'] for r in resultats if r['id_medecin'] is not None}
+            ).values_list('id', flat=True)
+        )
+        # {id: a deja un resultat}
+        prescriptions = dict(
+            PrescriptionExamen.objects.filter(
+                id__in={r['id_prescription'] for r in resultats}
+            ).annotate(
+                a_resultat=Exists(ResultatExamen.objects.filter(id_prescription=OuterRef('pk')))
+            ).values_list('id', 'a_resultat')
+        )
+        premier_index = {}
+        for index, resultat in enumerate(resultats):
+            if resultat['id_medecin'] is not None and resultat['id_medecin'] not in medecins:
+                erreurs.setdefault(index, {})['id_medecin'] = (
+                    f'Aucun medecin trouve avec l\'ID {resultat["id_medecin"]}.'
+                )
+            id_prescription = resultat['id_prescription']
+            if id_prescription not in prescriptions:
+                erreurs.setdefault(index, {})['id_prescription'] = (
+                    f'Aucune prescription trouvee avec l\'ID {id_prescription}.'
+                )
+            elif prescriptions[id_prescription]:
+                erreurs.setdefault(index, {})['id_prescription'] = (
+                    f'La prescription {id_prescription} a deja un resultat.'
+                )
+            elif id_prescription in premier_index:
+                erreurs.setdefault(index, {})['id_prescription'] = (
+                    f'Prescription {id_prescription} deja presente dans le lot '
+                    f'(index {premier_index[id_prescription]}).'
+                )
+            premier_index.setdefault(id_prescription, index)
+
+        if erreurs:
+            raise serializers.ValidationError({
+                'resultats': [erreurs.get(index, {}) for index in range(len(resultats))]
+            })
+        return attrs
+
+    def create(self, validated_data):
+        """Insere tous les resultats en une seule requete (bulk_create)."""
+        resultats = ResultatExamen.objects.bulk_create(
+            [
+                ResultatExamen(
+                    id_prescription_id=resultat['id_prescription'],
+                    id_medecin_id=resultat['id_medecin'],
+                    resultat=resultat['resultat'],
+                )
+                for resultat in validated_data['resultats']
+            ],
+            batch_size=500,
+        )
+        # bulk_create n'emet pas post_save: journalisation explicite
+        audit.auditer_instances('creation', resultats)
+        return resultats
@@ -6,9 +6,12 @@ Email: dedjomokarlyn@gmail.com
 Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
 Date: 2025-12-15
 """
+from django.db import transaction
 from rest_framework import serializers
+from api import audit
 from apps.suivi_patient.models import (
     PrescriptionMedicament,
+    LignePrescription,
     PrescriptionExamen,
     ResultatExamen,
     Hospitalisation,
@@ -18,6 +21,34 @@ from apps.gestion_hospitaliere.models import Chambre, Medecin
 
 # ============ PRESCRIPTIONS MEDICAMENTS ============
 
+class LignePrescriptionSerializer(serializers.ModelSerializer):
+    """Serializer pour la lecture des lignes d'une prescription de medicaments."""
+
+    nom_materiel = serializers.CharField(source='id_materiel.nom_Materiel', read_only=True)
+    unite_mesure = serializers.CharField(source='id_materiel.unite_mesure', read_only=True)
+
+    class Meta:
+        model = LignePrescription
+        fields = [
+            'id', 'id_materiel', 'nom_materiel', 'unite_mesure', 'quantite',
+            'posologie', 'statut', 'id_sortie', 'date_dispensation'
+        ]
+        read_only_fields = fields
+
+
+class LignePrescriptionCreateSerializer(serializers.Serializer):
+    """
+    Serializer pour une ligne de prescription.
+
+    Champs obligatoires: id_materiel (MaterielMedical), quantite
+    Champs optionnels: posologie
+    """
+
+    id_materiel = serializers.IntegerField()
+    quantite = serializers.IntegerField(min_value=1)
+    posologie = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
+
+
 class PrescriptionMedicamentSerializer(serializers.ModelSerializer):
     """Serializer pour la lecture des prescriptions de medicaments."""
 
@@ -25,23 +56,32 @@ class PrescriptionMedicamentSerializer(serializers.ModelSerializer):
     medecin_prenom = serializers.CharField(source='id_medecin.prenom', read_only=True)
     patient_nom = serializers.CharField(source='id_session.id_patient.nom', read_only=True)
     patient_matricule = serializers.CharField(source='id_session.id_patient.matricule', read_only=True)
+    lignes = LignePrescriptionSerializer(many=True, read_only=True)
 
     class Meta:
         model = PrescriptionMedicament
         fields = [
             'id', 'id_medecin', 'medecin_nom', 'medecin_prenom',
-            'liste_medicaments', 'id_session', 'date_heure',
+            'liste_medicaments', 'lignes', 'id_session', 'date_heure',
             'patient_nom', 'patient_matricule'
         ]
         read_only_fields = ['id', 'date_heure']
 
 
 class PrescriptionMedicamentCreateSerializer(serializers.Serializer):
-    """Serializer pour la creation d'une prescription de medicaments."""
+    """
+    Serializer pour la creation d'une prescription de medicaments.
+
+    Champs obligatoires: id_medecin, id_session, et liste_medicaments ou lignes
+    Champs optionnels:
+    - lignes: liste de {id_materiel, quantite, posologie?} reliees au stock
+      de la pharmacie; liste_medicaments est alors generee si absente
+    """
 
     id_medecin = serializers.IntegerField()
-    liste_medicaments = serializers.CharField()
+    liste_medicaments = serializers.CharField(required=False)
     id_session = serializers.IntegerField()
+    lignes = LignePrescriptionCreateSerializer(many=True, required=False, max_length=100)
 
     def validate_id_medecin(self, value):
         """Verifie que le medecin existe."""
@@ -60,13 +100,52 @@ class PrescriptionMedicamentCreateSerializer(serializers.Serializer):
             )
         return value
 
+    def validate_lignes(self, value):
+        """Verifie en une requete que chaque medicament existe dans le stock medical."""
+        from apps.comptabilite_matiere.models import MaterielMedical
+        demandes = {ligne['id_materiel'] for ligne in value}
+        self._materiels = MaterielMedical.objects.in_bulk(demandes)
+        inconnus = sorted(demandes - set(self._materiels))
+        if inconnus:
+            raise serializers.ValidationError(
+                f'Aucun materiel medical trouve avec les IDs {inconnus}.'
+            )
+        return value
+
+    def validate(self, attrs):
+        """Exige liste_medicaments ou lignes; genere le texte a partir des lignes."""
+        lignes = attrs.get('lignes')
+        if not attrs.get('liste_medicaments'):
+            if not lignes:
+                raise serializers.ValidationError({
+                    'liste_medicaments': 'Obligatoire si aucune ligne n\'est fournie.'
+                })
+            attrs['liste_medicaments'] = '\n'.join(
+                f"{self._materiels[ligne['id_materiel']].nom_Materiel} x{ligne['quantite']}"
+                + (f" - {ligne['posologie']}" if ligne['posologie'] else '')
+                for ligne in lignes
+            )
+        return attrs
+
     def create(self, validated_data):
-        """Cree une nouvelle prescription de medicaments."""
-        prescription = PrescriptionMedicament.objects.create(
-            id_medecin_id=validated_data['id_medecin'],
-            liste_medicaments=validated_data['liste_medicaments'],
-            id_session_id=validated_data['id_session']
-        )
+        """Cree une nouvelle prescription de medicaments et ses lignes (bulk_create)."""
+        with transaction.atomic():
+            prescription = PrescriptionMedicament.objects.create(
+                id_medecin_id=validated_data['id_medecin'],
+                liste_medicaments=validated_data['liste_medicaments'],
+                id_session_id=validated_data['id_session']
+            )
+            lignes = LignePrescription.objects.bulk_create([
+                LignePrescription(
+                    id_prescription=prescription,
+                    id_materiel_id=ligne['id_materiel'],
+                    quantite=ligne['quantite'],
+                    posologie=ligne['posologie'],
+                )
+                for ligne in validated_data.get('lignes', [])
+            ])
+            # bulk_create n'emet pas post_save: journalisation explicite
+            audit.auditer_instances('creation', lignes)
         return prescription
 
 
@@ -27,9 +27,18 @@ class PatientSerializer(serializers.ModelSerializer):
             'personnel_nom', 'personnel_prenom', 'age'
         ]
         read_only_fields = ['id', 'matricule', 'date_inscription']
+        # Colonnes lues par les SerializerMethodField (api.optimisation)
+        sources_methodes = {'age': ['date_naissance']}
 
     def get_age(self, obj):
-        """Calcule l'age du patient."""
+        """
+        Retourne l'age du patient.
+
+        Utilise l'annotation SQL `age` (Patient.objects.avec_age()) si elle
+        est presente, sinon le calcule a partir de la date de naissance.
+        """
+        if hasattr(obj, 'age'):
+            return obj.age
         from django.utils import timezone
         today = timezone.now().date()
         age = today.year - obj.date_naissance.year
@@ -19,6 +19,7 @@ class SessionSerializer(serializers.ModelSerializer):
     patient_matricule = serializers.CharField(source='id_patient.matricule', read_only=True)
     personnel_nom = serializers.CharField(source='id_personnel.nom', read_only=True)
     personnel_prenom = serializers.CharField(source='id_personnel.prenom', read_only=True)
+    service_courant = serializers.CharField(source='service.nom_service', read_only=True)
     statut_display = serializers.CharField(source='get_statut_display', read_only=True)
     situation_display = serializers.CharField(source='get_situation_patient_display', read_only=True)
 
@@ -26,7 +27,7 @@ class SessionSerializer(serializers.ModelSerializer):
         model = Session
         fields = [
             'id', 'debut', 'fin', 'id_patient', 'id_personnel',
-            'service_courant', 'personnel_responsable', 'statut', 'situation_patient',
+            'service', 'service_courant', 'personnel_responsable', 'statut', 'situation_patient',
             'patient_nom', 'patient_prenom', 'patient_matricule',
             'personnel_nom', 'personnel_prenom', 'statut_display', 'situation_display'
         ]
@@ -88,3 +89,10 @@ class SessionUpdateSerializer(serializers.Serializer):
         required=False
     )
     fin = serializers.DateTimeField(required=False, allow_null=True)
+
+    def update(self, instance, validated_data):
+        """Met a jour une session en n'ecrivant que les champs fournis."""
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
@@ -0,0 +1,108 @@
+"""
+Serializers pour les signes vitaux.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from django.utils import timezone
+from rest_framework import serializers
+from api import audit
+from apps.suivi_patient.models import SigneVital
+from apps.suivi_patient.models.signe_vital import TYPES_SIGNES_VITAUX
+
+
+# Nombre maximum de mesures par envoi
+MAX_MESURES = 5000
+
+
+class SigneVitalSerializer(serializers.ModelSerializer):
+    """Serializer pour la lecture des signes vitaux."""
+
+    class Meta:
+        model = SigneVital
+        fields = ['id', 'id_session', 'id_personnel', 'type_mesure', 'valeur', 'date_heure']
+        read_only_fields = fields
+
+
+class MesureVitaleSerializer(serializers.Serializer):
+    """
+    Serializer pour une mesure.
+
+    Champs obligatoires: type, valeur
+    Champs optionnels: date_heure (par defaut: maintenant)
+    """
+
+    type = serializers.ChoiceField(choices=SigneVital.TYPE_CHOICES)
+    valeur = serializers.FloatField()
+    date_heure = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        """Verifie que la valeur est plausible pour le type et que la date n'est pas future."""
+        libelle, unite, minimum, maximum = TYPES_SIGNES_VITAUX[attrs['type']]
+        if not minimum <= attrs['valeur'] <= maximum:
+            raise serializers.ValidationError({
+                'valeur': f'{libelle}: valeur attendue entre {minimum} et {maximum} {unite}.'
+            })
+        if attrs.get('date_heure') and attrs['date_heure'] > timezone.now():
+            raise serializers.ValidationError({
+                'date_heure': 'La date de mesure ne peut pas etre dans le futur.'
+            })
+        return attrs
+
+
+class SignesVitauxCreateSerializer(serializers.Serializer):
+    """
+    Serializer pour l'enregistrement groupe de mesures d'une session.
+
+    Champs obligatoires:
+    - mesures: liste de {type, valeur, date_heure?}
+    Champs optionnels:
+    - id_personnel: personnel ayant pris les mesures (par defaut: utilisateur connecte)
+    """
+
+    mesures = MesureVitaleSerializer(many=True, allow_empty=False, max_length=MAX_MESURES)
+    id_personnel = serializers.IntegerField(required=False)
+
+    def validate_id_personnel(self, value):
+        """Verifie que le personnel existe."""
+        from apps.gestion_hospitaliere.models import Personnel
+        if not Personnel.objects.filter(id=value).exists():
+            raise serializers.ValidationError(
+                f'Aucun personnel trouve avec l\'ID {value}.'
+            )
+        return value
+
+    def validate(self, attrs):
+        """Utilise le personnel connecte si id_personnel n'est pas fourni."""
+        if 'id_personnel' not in attrs:
+            utilisateur = self.context['request'].user
+            if not hasattr(utilisateur, 'poste'):
+                raise serializers.ValidationError({
+                    'id_personnel': 'Obligatoire si l\'utilisateur connecte n\'est pas un personnel.'
+                })
+            attrs['id_personnel'] = utilisateur.pk
+        return attrs
+
+    def create(self, validated_data):
+        """Insere toutes les mesures en une seule requete (bulk_create)."""
+        session = self.context['session']
+        id_personnel = validated_data['id_personnel']
+        maintenant = timezone.now()
+        mesures = SigneVital.objects.bulk_create(
+            [
+                SigneVital(
+                    id_session=session,
+                    id_personnel_id=id_personnel,
+                    type_mesure=mesure['type'],
+                    valeur=mesure['valeur'],
+                    date_heure=mesure.get('date_heure') or maintenant,
+                )
+                for mesure in validated_data['mesures']
+            ],
+            batch_size=1000,
+        )
+        # bulk_create n'emet pas post_save: journalisation explicite
+        audit.auditer_instances('creation', mesures)
+        return mesures
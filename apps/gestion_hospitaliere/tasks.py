@@ -96,3 +96,22 @@ def check_expired_passwords():
         count += 1
 
     return f"Bloque {count} mot(s) de passe expire(s)"
+
+
+@shared_task
+def rafraichir_dashboard_direction():
+    """
+    Tache periodique recalculant le tableau de bord de la direction.
+
+    Executee toutes les DASHBOARD_TTL secondes via Celery Beat: l'entree du
+    cache reste chaude et /api/dashboard/direction/ ne calcule jamais
+    pendant la requete.
+
+    Returns:
+        str: Horodatage du calcul
+    """
+    from apps.gestion_hospitaliere.dashboard import rafraichir
+
+    entree = rafraichir()
+
+    return f"Tableau de bord de la direction calcule le {entree['calcule_le']}"
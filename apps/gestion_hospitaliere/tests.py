@@ -1,3 +1,179 @@
-from django.test import TestCase
+"""
+Tests du routage des lectures vers la replique (api.db_router).
 
-# Create your tests here.
+Les alias 'default' et 'replica' des parametres de test sont deux
+connexions distinctes vers la meme base (TEST MIRROR): on verifie sur
+quelle connexion chaque requete SQL est executee.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import datetime
+from contextlib import ExitStack
+from unittest import mock
+
+import redis
+from django.db import connections, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import db_router
+from apps.gestion_hospitaliere.models import Personnel, Service
+from apps.suivi_patient.models import Patient
+
+
+class RedisMemoire:
+    """Substitut en memoire du client Redis (SET avec expiration, EXISTS)."""
+
+    def __init__(self):
+        self.cles = {}
+
+    def set(self, cle, valeur, ex=None):
+        self.cles[cle] = (valeur, ex)
+
+    def exists(self, cle):
+        return int(cle in self.cles)
+
+
+class RedisInjoignable:
+    """Client Redis dont toutes les commandes echouent."""
+
+    def set(self, *args, **kwargs):
+        raise redis.ConnectionError('Connexion refusee')
+
+    exists = set
+
+
+class RoutageReplicaTests(TransactionTestCase):
+    """Lectures GET sur la replique, ecritures et transactions sur le primaire."""
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        service = Service.objects.create(nom_service='Urgences')
+        self.personnel = Personnel.objects.create(
+            username='infirmier1', nom='Nom', prenom='Prenom', date_naissance='1990-01-01',
+            email='infirmier1@example.com', contact='600000000', poste='infirmier', service=service
+        )
+        self.autre = Personnel.objects.create(
+            username='infirmier2', nom='Autre', prenom='Prenom', date_naissance='1990-01-01',
+            email='infirmier2@example.com', contact='600000001', poste='infirmier', service=service
+        )
+        self.patient = Patient.objects.create(
+            nom='Patient', prenom='Test', date_naissance=datetime.date(1980, 1, 1),
+            contact='611111111', nom_proche='Proche', contact_proche='622222222',
+            id_personnel=self.personnel
+        )
+
+    def _client(self, personnel):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(personnel)}')
+        return client
+
+    def _requetes(self, fonction, table=None):
+        """
+        Execute fonction() et retourne (reponse, requetes primaire, requetes
+        replique), limitees a celles qui lisent `table` si elle est fournie.
+        """
+        with ExitStack() as pile:
+            primaire = pile.enter_context(CaptureQueriesContext(connections['default']))
+            replique = pile.enter_context(CaptureQueriesContext(connections['replica']))
+            reponse = fonction()
+
+        def compter(capture):
+            return sum(1 for requete in capture.captured_queries if table is None or table in requete['sql'])
+        return reponse, compter(primaire), compter(replique)
+
+    def test_get_lit_sur_la_replique(self):
+        reponse, primaire, replique = self._requetes(
+            lambda: self._client(self.personnel).get(f'/api/patients/{self.patient.id}/')
+        )
+        self.assertEqual(reponse.status_code, 200)
+        self.assertGreater(replique, 0)
+        self.assertEqual(primaire, 0)
+
+    def test_ecriture_sur_le_primaire(self):
+        reponse, primaire, replique = self._requetes(
+            lambda: self._client(self.personnel).patch(
+                f'/api/patients/{self.patient.id}/', {'nom': 'Modifie'}, format='json'
+            )
+        )
+        self.assertEqual(reponse.status_code, 200)
+        self.assertGreater(primaire, 0)
+        self.assertEqual(replique, 0)
+        self.patient.refresh_from_db()
+        self.assertEqual(self.patient.nom, 'Modifie')
+
+    @override_settings(REPLICA_STICKY_SECONDS=10)
+    def test_fenetre_de_lecture_sur_le_primaire_apres_ecriture(self):
+        stockage = RedisMemoire()
+        with mock.patch.object(db_router, 'get_client', return_value=stockage):
+            self._client(self.personnel).patch(
+                f'/api/patients/{self.patient.id}/', {'nom': 'Modifie'}, format='json'
+            )
+            self.assertEqual(
+                stockage.cles, {f'{db_router.PREFIXE_CLE}u:{self.personnel.id}': (1, 10)}
+            )
+
+            # L'auteur de l'ecriture relit sur le primaire...
+            reponse, primaire, replique = self._requetes(
+                lambda: self._client(self.personnel).get(f'/api/patients/{self.patient.id}/')
+            )
+            self.assertEqual(reponse.data['data']['nom'], 'Modifie')
+            self.assertGreater(primaire, 0)
+            self.assertEqual(replique, 0)
+
+            # ... les autres utilisateurs lisent toujours sur la replique
+            _, primaire, replique = self._requetes(
+                lambda: self._client(self.autre).get(f'/api/patients/{self.patient.id}/')
+            )
+            self.assertGreater(replique, 0)
+            self.assertEqual(primaire, 0)
+
+            # Fenetre expiree (cle supprimee par Redis): retour sur la replique
+            stockage.cles.clear()
+            _, primaire, replique = self._requetes(
+                lambda: self._client(self.personnel).get(f'/api/patients/{self.patient.id}/')
+            )
+            self.assertGreater(replique, 0)
+            self.assertEqual(primaire, 0)
+
+    @override_settings(REPLICA_STICKY_SECONDS=10)
+    def test_redis_injoignable_lit_sur_le_primaire(self):
+        with mock.patch.object(db_router, 'get_client', return_value=RedisInjoignable()):
+            reponse, primaire, replique = self._requetes(
+                lambda: self._client(self.personnel).get(f'/api/patients/{self.patient.id}/')
+            )
+        self.assertEqual(reponse.status_code, 200)
+        self.assertGreater(primaire, 0)
+        self.assertEqual(replique, 0)
+
+    def test_transaction_lit_sur_le_primaire(self):
+        with db_router.lecture_replica():
+            _, primaire, replique = self._requetes(lambda: Patient.objects.count())
+            self.assertEqual((primaire, replique), (0, 1))
+
+            def dans_transaction():
+                with transaction.atomic():
+                    return Patient.objects.count()
+
+            _, primaire, replique = self._requetes(dans_transaction)
+            self.assertEqual(replique, 0)
+            self.assertGreater(primaire, 0)
+
+    def test_lot_de_lectures_sur_la_replique(self):
+        # L'authentification du POST lit sur le primaire, les sous-requetes GET sur la replique
+        reponse, primaire, replique = self._requetes(
+            lambda: self._client(self.personnel).post('/api/batch/', {
+                'requetes': [{'methode': 'GET', 'chemin': f'/api/patients/{self.patient.id}/'}]
+            }, format='json'),
+            table=Patient._meta.db_table,
+        )
+        self.assertEqual(reponse.status_code, 200)
+        self.assertEqual(reponse.data['data'][0]['statut'], 200)
+        self.assertGreater(replique, 0)
+        self.assertEqual(primaire, 0)
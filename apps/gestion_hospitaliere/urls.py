@@ -24,10 +24,15 @@ from apps.gestion_hospitaliere.views import (
     ChambreViewSet,
     SessionViewSet,
     DossierPatientViewSet,
+    LaboratoireViewSet,
+    DoublonPatientViewSet,
+    JournalAuditViewSet,
     login_view,
     logout_view,
 )
-from apps.gestion_hospitaliere.views.health_views import health_check
+from apps.gestion_hospitaliere.views.dashboard_views import dashboard_direction
+from apps.gestion_hospitaliere.views.health_views import health_check, liveness, readiness
+from apps.gestion_hospitaliere.views.sync_views import sync_feed
 
 router = DefaultRouter()
 router.register(r'admin', AdminViewSet, basename='admin')
@@ -45,10 +50,17 @@ router.register(r'hospitalisations', HospitalisationViewSet, basename='hospitali
 router.register(r'chambres', ChambreViewSet, basename='chambre')
 router.register(r'sessions', SessionViewSet, basename='session')
 router.register(r'dossiers-patients', DossierPatientViewSet, basename='dossier-patient')
+router.register(r'laboratoire', LaboratoireViewSet, basename='laboratoire')
+router.register(r'doublons-patients', DoublonPatientViewSet, basename='doublon-patient')
+router.register(r'audit', JournalAuditViewSet, basename='journal-audit')
 
 urlpatterns = [
     path('', include(router.urls)),
     path('health/', health_check, name='health-check'),
+    path('health/live/', liveness, name='health-liveness'),
+    path('health/ready/', readiness, name='health-readiness'),
     path('login/', login_view, name='login'),
     path('logout/', logout_view, name='logout'),
+    path('sync/<str:resource>/', sync_feed, name='sync-feed'),
+    path('dashboard/direction/', dashboard_direction, name='dashboard-direction'),
 ]
@@ -24,6 +24,9 @@ from .prescription_views import (
 )
 from .session_views import SessionViewSet
 from .dossier_patient_views import DossierPatientViewSet
+from .laboratoire_views import LaboratoireViewSet
+from .doublon_views import DoublonPatientViewSet
+from .audit_views import JournalAuditViewSet
 
 __all__ = [
     'AdminViewSet',
@@ -43,4 +46,7 @@ __all__ = [
     'ChambreViewSet',
     'SessionViewSet',
     'DossierPatientViewSet',
+    'LaboratoireViewSet',
+    'DoublonPatientViewSet',
+    'JournalAuditViewSet',
 ]
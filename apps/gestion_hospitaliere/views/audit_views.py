@@ -0,0 +1,117 @@
+"""
+Views pour la consultation du journal d'audit medical.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+from apps.suivi_patient.models import EvenementAudit
+from apps.gestion_hospitaliere.serializers import (
+    EvenementAuditSerializer,
+    FiltreJournalAuditSerializer,
+)
+from apps.gestion_hospitaliere.views.dashboard_views import EstDirecteur
+
+
+class JournalAuditPagination(CursorPagination):
+    """Pagination par curseur (pas de COUNT ni d'OFFSET sur le journal)."""
+
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('-horodatage', '-id')
+
+
+PARAMETRES_JOURNAL = [
+    OpenApiParameter(name='debut', description='Evenements a partir de cette date (ISO 8601)', required=False, type=str),
+    OpenApiParameter(name='fin', description='Evenements avant cette date (ISO 8601)', required=False, type=str),
+    OpenApiParameter(
+        name='action', description='consultation, creation, modification ou suppression', required=False, type=str
+    ),
+]
+
+
+class JournalAuditViewSet(viewsets.GenericViewSet):
+    """
+    ViewSet pour le journal d'audit medical (acces reserve au directeur).
+
+    Endpoints:
+    - GET /api/audit/patients/{id}/ - Acces au dossier d'un patient
+    - GET /api/audit/personnel/{id}/ - Acces effectues par un membre du personnel
+
+    Filtres: ?debut=, ?fin= (limitent les partitions lues) et ?action=.
+    """
+
+    queryset = EvenementAudit.objects.all()
+    serializer_class = EvenementAuditSerializer
+    permission_classes = [IsAuthenticated, EstDirecteur]
+    pagination_class = JournalAuditPagination
+    # Ordre fixe du curseur (horodatage decroissant)
+    filter_backends = []
+
+    def _journal(self, request, **filtres):
+        """Evenements filtres, du plus recent au plus ancien."""
+        parametres = FiltreJournalAuditSerializer(data=request.query_params)
+        if not parametres.is_valid():
+            return Response({
+                'error': 'Parametres invalides',
+                'detail': 'Veuillez verifier les filtres fournis.',
+                'erreurs': parametres.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        donnees = parametres.validated_data
+        if 'debut' in donnees:
+            filtres['horodatage__gte'] = donnees['debut']
+        if 'fin' in donnees:
+            filtres['horodatage__lt'] = donnees['fin']
+        if 'action' in donnees:
+            filtres['action'] = donnees['action']
+
+        page = self.paginate_queryset(self.get_queryset().filter(**filtres))
+        return Response({
+            'success': True,
+            'count': len(page),
+            'next': self.paginator.get_next_link(),
+            'previous': self.paginator.get_previous_link(),
+            'data': self.get_serializer(page, many=True).data
+        }, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Journal d'audit d'un patient",
+        description="Consultations et modifications du dossier du patient (patient, sessions, "
+                    "observations, prescriptions, examens, hospitalisations, signes vitaux), "
+                    "du plus recent au plus ancien.",
+        parameters=PARAMETRES_JOURNAL,
+        responses={
+            200: EvenementAuditSerializer(many=True),
+            400: OpenApiResponse(description='Parametres invalides'),
+            403: OpenApiResponse(description='Acces reserve au directeur')
+        }
+    )
+    @action(detail=False, methods=['get'], url_path=r'patients/(?P<id_patient>\d+)')
+    def patient(self, request, id_patient=None):
+        """Evenements concernant un patient."""
+        return self._journal(request, id_patient=id_patient)
+
+    @extend_schema(
+        summary="Journal d'audit d'un membre du personnel",
+        description="Consultations et modifications de dossiers patients effectuees par un "
+                    "membre du personnel, du plus recent au plus ancien.",
+        parameters=PARAMETRES_JOURNAL,
+        responses={
+            200: EvenementAuditSerializer(many=True),
+            400: OpenApiResponse(description='Parametres invalides'),
+            403: OpenApiResponse(description='Acces reserve au directeur')
+        }
+    )
+    @action(detail=False, methods=['get'], url_path=r'personnel/(?P<id_personnel>\d+)')
+    def personnel(self, request, id_personnel=None):
+        """Evenements dont un membre du personnel est l'auteur."""
+        return self._journal(request, id_personnel=id_personnel)
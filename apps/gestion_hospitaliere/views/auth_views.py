@@ -7,7 +7,7 @@ Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
 Date: 2025-12-15
 """
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth import authenticate
@@ -15,6 +15,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from apps.gestion_hospitaliere.serializers import LoginSerializer, LogoutSerializer
 from apps.gestion_hospitaliere.models import Personnel, Admin
+from api.throttling import LOGIN_THROTTLE_CLASSES
 
 
 @extend_schema(
@@ -51,12 +52,14 @@ from apps.gestion_hospitaliere.models import Personnel, Admin
         400: OpenApiResponse(description='Donnees invalides'),
         401: OpenApiResponse(description='Identifiants incorrects'),
         403: OpenApiResponse(description='Compte bloque ou mot de passe expire'),
+        429: OpenApiResponse(description='Trop de tentatives (voir en-tete Retry-After)'),
     },
     tags=['Authentification'],
     description='Authentifie un utilisateur via email ou matricule et mot de passe.'
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(LOGIN_THROTTLE_CLASSES)
 def login_view(request):
     """
     Authentifie un utilisateur et retourne les tokens JWT.
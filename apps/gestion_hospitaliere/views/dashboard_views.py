@@ -0,0 +1,73 @@
+"""
+Views pour le tableau de bord de la direction.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import BasePermission, IsAuthenticated
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+from apps.gestion_hospitaliere.dashboard import kpis_direction
+
+
+class EstDirecteur(BasePermission):
+    """Reserve l'acces au directeur (et aux superutilisateurs)."""
+
+    message = 'Acces reserve au directeur.'
+
+    def has_permission(self, request, view):
+        utilisateur = request.user
+        return bool(
+            utilisateur and utilisateur.is_authenticated
+            and (utilisateur.is_superuser or getattr(utilisateur, 'poste', None) == 'directeur')
+        )
+
+
+@extend_schema(
+    summary="Tableau de bord de la direction",
+    description=(
+        "Indicateurs de la direction en un seul appel: recettes (global, jour, mois), "
+        "sessions ouvertes, places de chambres, besoins par statut, materiels en stock "
+        "faible et patients hospitalises. Les indicateurs sont servis depuis le cache "
+        "(calcule_le) et recalcules en arriere-plan lorsqu'ils sont perimes (perime)."
+    ),
+    tags=['Dashboard'],
+    responses={
+        200: OpenApiResponse(description='Indicateurs de la direction'),
+        202: OpenApiResponse(description='Indicateurs en cours de calcul, reessayer apres Retry-After'),
+        403: OpenApiResponse(description='Acces reserve au directeur'),
+    }
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, EstDirecteur])
+def dashboard_direction(request):
+    """
+    Endpoint: GET /api/dashboard/direction/
+
+    Retourne les indicateurs en cache sans attendre de calcul.
+    """
+    data, calcule_le, perime = kpis_direction()
+    if data is None:
+        return Response(
+            {
+                'success': False,
+                'message': 'Indicateurs en cours de calcul.',
+                'data': None
+            },
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Retry-After': '2'}
+        )
+
+    return Response(
+        {
+            'success': True,
+            'calcule_le': calcule_le,
+            'perime': perime,
+            'data': data
+        },
+        status=status.HTTP_200_OK
+    )
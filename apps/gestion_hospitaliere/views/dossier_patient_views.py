@@ -10,15 +10,17 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema, OpenApiResponse
+from api.champs import ChampsDynamiquesMixin
 from apps.suivi_patient.models import DossierPatient
 from apps.gestion_hospitaliere.serializers import (
     DossierPatientSerializer,
     DossierPatientCreateSerializer,
     DossierPatientUpdateSerializer,
+    PatientSerializer,
 )
 
 
-class DossierPatientViewSet(viewsets.ModelViewSet):
+class DossierPatientViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des dossiers patients.
 
@@ -32,6 +34,8 @@ class DossierPatientViewSet(viewsets.ModelViewSet):
 
     queryset = DossierPatient.objects.all().select_related('id_patient')
     permission_classes = [IsAuthenticated]
+    # ?expand=id_patient (api.champs)
+    champs_extensibles = {'id_patient': PatientSerializer}
 
     def get_serializer_class(self):
         """Retourne le serializer approprie selon l'action."""
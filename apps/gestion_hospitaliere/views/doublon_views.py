@@ -0,0 +1,122 @@
+"""
+Views pour la file de revue des doublons de patients.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+from api.champs import ChampsDynamiquesMixin
+from apps.suivi_patient.doublons import fusionner_patients
+from apps.suivi_patient.models import DoublonPatient
+from apps.gestion_hospitaliere.serializers import (
+    DoublonPatientSerializer,
+    FusionDoublonSerializer,
+)
+
+
+class DoublonPatientViewSet(ChampsDynamiquesMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet pour la file de revue des doublons de patients.
+
+    Endpoints:
+    - GET /api/doublons-patients/?statut=a examiner - Paires a examiner (meilleur score d'abord)
+    - GET /api/doublons-patients/{id}/ - Detail d'une paire
+    - POST /api/doublons-patients/{id}/fusionner/ - Fusionner la paire
+    - POST /api/doublons-patients/{id}/rejeter/ - Ce ne sont pas les memes personnes
+    """
+
+    queryset = DoublonPatient.objects.all().select_related('id_patient_a', 'id_patient_b')
+    serializer_class = DoublonPatientSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['statut']
+
+    def _personnel(self, request):
+        """Personnel connecte, ou None pour un autre type d'utilisateur."""
+        return request.user if hasattr(request.user, 'poste') else None
+
+    @extend_schema(
+        summary="Fusionner une paire de patients",
+        description="Rattache les sessions, rendez-vous et dossier medical du patient absorbe "
+                    "au patient conserve (un UPDATE par table), complete ses champs vides puis "
+                    "supprime le patient absorbe.",
+        request=FusionDoublonSerializer,
+        responses={
+            200: OpenApiResponse(description='Patients fusionnes'),
+            400: OpenApiResponse(description='Donnees invalides'),
+            409: OpenApiResponse(description='Paire deja traitee')
+        }
+    )
+    @action(detail=True, methods=['post'], url_path='fusionner')
+    def fusionner(self, request, pk=None):
+        """Fusionne la paire dans le patient conserve."""
+        doublon = self.get_object()
+        serializer = FusionDoublonSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'error': 'Donnees invalides',
+                'detail': 'Veuillez verifier les donnees fournies.',
+                'erreurs': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            resultat = fusionner_patients(
+                doublon.pk,
+                serializer.validated_data['id_patient_conserve'],
+                self._personnel(request)
+            )
+        except ValueError as e:
+            return Response({
+                'error': 'Fusion impossible',
+                'detail': str(e)
+            }, status=status.HTTP_409_CONFLICT)
+        except Exception as e:
+            return Response({
+                'error': 'Erreur lors de la fusion',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        return Response({
+            'success': True,
+            'message': 'Patients fusionnes avec succes.',
+            'data': resultat
+        }, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Rejeter une paire",
+        description="Marque la paire comme deux patients distincts; elle ne sera plus proposee.",
+        request=None,
+        responses={
+            200: DoublonPatientSerializer,
+            409: OpenApiResponse(description='Paire deja traitee')
+        }
+    )
+    @action(detail=True, methods=['post'], url_path='rejeter')
+    def rejeter(self, request, pk=None):
+        """Rejette la paire (UPDATE conditionnel sur le statut)."""
+        doublon = self.get_object()
+        traite = DoublonPatient.objects.filter(pk=doublon.pk, statut='a examiner').update(
+            statut='rejete',
+            date_decision=timezone.now(),
+            id_personnel=self._personnel(request)
+        )
+        if not traite:
+            return Response({
+                'error': 'Paire deja traitee',
+                'detail': f'Statut actuel: {doublon.statut}.'
+            }, status=status.HTTP_409_CONFLICT)
+
+        doublon.refresh_from_db()
+        return Response({
+            'success': True,
+            'message': 'Paire rejetee.',
+            'data': DoublonPatientSerializer(doublon).data
+        }, status=status.HTTP_200_OK)
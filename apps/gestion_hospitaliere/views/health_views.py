@@ -6,14 +6,18 @@ Email: dedjomokarlyn@gmail.com
 Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
 Date: 2025-12-14
 """
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotAllowed, JsonResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
-from django.db import connection
 from drf_spectacular.utils import extend_schema
-import redis
-from django.conf import settings
+from apps.gestion_hospitaliere.health import (
+    statut_celery,
+    statut_dependances,
+    statut_en_cache,
+)
 
 
 @extend_schema(
@@ -50,26 +54,7 @@ def health_check(request):
 
     Verifie la sante de l'API et de ses dependances.
     """
-    services_status = {
-        'api': 'OK',
-        'database': 'UNKNOWN',
-        'redis': 'UNKNOWN'
-    }
-
-    # Verifier la connexion a la base de donnees
-    try:
-        connection.ensure_connection()
-        services_status['database'] = 'OK'
-    except Exception as e:
-        services_status['database'] = f'ERROR: {str(e)}'
-
-    # Verifier la connexion a Redis
-    try:
-        redis_client = redis.Redis.from_url(settings.CELERY_BROKER_URL)
-        redis_client.ping()
-        services_status['redis'] = 'OK'
-    except Exception as e:
-        services_status['redis'] = f'ERROR: {str(e)}'
+    services_status = {'api': 'OK', **statut_dependances()}
 
     # Determiner si tous les services sont OK
     all_ok = all(status == 'OK' for status in services_status.values())
@@ -94,3 +79,44 @@ def health_check(request):
             },
             status=status.HTTP_503_SERVICE_UNAVAILABLE
         )
+
+
+async def liveness(request):
+    """
+    Endpoint: GET /api/health/live/
+
+    Sonde de vivacite: repond tant que le processus traite des requetes.
+    Ne verifie aucune dependance (un redemarrage ne reparerait pas la base).
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    return JsonResponse({'success': True, 'status': 'alive'})
+
+
+async def readiness(request):
+    """
+    Endpoint: GET /api/health/ready/
+
+    Sonde de disponibilite: 200 si la base de donnees et Redis repondent,
+    503 sinon. L'etat est mis en cache HEALTH_CHECK_CACHE_TTL secondes.
+    L'etat de Celery (workers, longueur des files) est informatif et
+    rafraichi en arriere-plan.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+
+    services = statut_en_cache()
+    if services is None:
+        # Thread de la requete: reutilise la connexion persistante a la base
+        services = await sync_to_async(statut_dependances, thread_sensitive=True)()
+
+    pret = all(etat == 'OK' for etat in services.values())
+    return JsonResponse(
+        {
+            'success': pret,
+            'status': 'ready' if pret else 'unavailable',
+            'services': services,
+            'celery': statut_celery(),
+        },
+        status=status.HTTP_200_OK if pret else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
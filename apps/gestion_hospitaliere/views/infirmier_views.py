@@ -11,7 +11,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+from api.optimisation import OptimisationRequetesMixin, optimiser_pour
 from apps.suivi_patient.models import Session, ObservationMedicale
+from apps.gestion_hospitaliere.models import Service
 from apps.gestion_hospitaliere.serializers import (
     SessionSerializer,
     PatientEnAttenteSerializer,
@@ -23,7 +25,7 @@ from apps.gestion_hospitaliere.serializers import (
 )
 
 
-class InfirmierViewSet(viewsets.ViewSet):
+class InfirmierViewSet(OptimisationRequetesMixin, viewsets.ViewSet):
     """
     ViewSet pour les endpoints de l'infirmier.
 
@@ -75,13 +77,13 @@ class InfirmierViewSet(viewsets.ViewSet):
                 )
 
             # Rechercher les sessions selon criteres
-            sessions = Session.objects.select_related('id_patient').filter(
-                service_courant=service,
+            sessions = optimiser_pour(Session.objects.filter(
+                service_id=Service.objects.id_par_nom(service),
                 personnel_responsable='infirmier',
                 situation_patient='en attente'
             ).exclude(
                 statut='terminee'
-            )
+            ), PatientSerializer, chemin='id_patient')
 
             # Construire la reponse avec id_session pour chaque patient
             result = []
@@ -118,7 +120,8 @@ class InfirmierViewSet(viewsets.ViewSet):
         responses={
             200: SessionSerializer,
             400: OpenApiResponse(description='Donnees invalides'),
-            404: OpenApiResponse(description='Session non trouvee')
+            404: OpenApiResponse(description='Session non trouvee'),
+            409: OpenApiResponse(description='Patient deja selectionne par un autre personnel')
         }
     )
     @action(detail=False, methods=['post'], url_path='selectionner-patient')
@@ -128,7 +131,7 @@ class InfirmierViewSet(viewsets.ViewSet):
 
         Selon description.md ligne 164:
         - Prend en entree l'id de la session
-        - Change situation_patient a 'recu'
+        - Change situation_patient a 'recu' si le patient est encore en attente
         """
         try:
             serializer = SelectionnerPatientSerializer(data=request.data)
@@ -147,10 +150,19 @@ class InfirmierViewSet(viewsets.ViewSet):
 
             # Recuperer et mettre a jour la session
             try:
-                session = Session.objects.get(id=id_session)
-                session.situation_patient = 'recu'
-                session.save(update_fields=['situation_patient'])
-
+                # UPDATE conditionnel: un seul personnel obtient le patient
+                if not Session.objects.selectionner(id_session):
+                    if not Session.objects.filter(id=id_session).exists():
+                        raise Session.DoesNotExist
+                    return Response(
+                        {
+                            'error': 'Patient deja selectionne',
+                            'detail': f'Le patient de la session {id_session} a deja ete recu par un autre personnel.'
+                        },
+                        status=status.HTTP_409_CONFLICT
+                    )
+
+                session = Session.objects.select_related('id_patient', 'id_personnel', 'service').get(id=id_session)
                 response_serializer = SessionSerializer(session)
 
                 return Response(
@@ -250,7 +262,7 @@ class InfirmierViewSet(viewsets.ViewSet):
 
         Selon description.md ligne 166:
         - Prend en entree: type_redirection, redirection, id_session
-        - Si type='service': change service_courant
+        - Si type='service': change service
         - Si type='personnel': change personnel_responsable
         - Dans tous les cas: situation_patient = 'en attente'
         """
@@ -272,18 +284,21 @@ class InfirmierViewSet(viewsets.ViewSet):
             redirection = serializer.validated_data['redirection']
 
             try:
-                session = Session.objects.get(id=id_session)
+                session = Session.objects.select_related('id_patient', 'id_personnel').get(id=id_session)
 
                 # Appliquer la redirection
                 if type_redirection == 'service':
-                    session.service_courant = redirection
+                    session.service_id = serializer.validated_data['id_service']
+                    champ = 'service'
                 elif type_redirection == 'personnel':
                     session.personnel_responsable = redirection
+                    champ = 'personnel_responsable'
 
                 # Toujours mettre situation_patient a 'en attente'
                 session.situation_patient = 'en attente'
 
-                session.save(update_fields=['service_courant', 'personnel_responsable', 'situation_patient'])
+                # Seules les colonnes modifiees sont ecrites
+                session.save(update_fields=[champ, 'situation_patient'])
 
                 response_serializer = SessionSerializer(session)
 
@@ -0,0 +1,178 @@
+"""
+Views pour les endpoints du laboratoire.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from django.db.models import Count, F, Min
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+from apps.suivi_patient.models import PrescriptionExamen
+from apps.gestion_hospitaliere.models import Service
+from apps.gestion_hospitaliere.serializers import ResultatsExamenLotSerializer
+
+
+class WorklistPagination(PageNumberPagination):
+    """Pagination de la liste de travail (page_size ajustable)."""
+
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class LaboratoireViewSet(viewsets.ViewSet):
+    """
+    ViewSet pour les endpoints du laboratoire.
+
+    Endpoints:
+    - GET /api/laboratoire/worklist/ - Examens prescrits sans resultat
+    - POST /api/laboratoire/resultats/ - Enregistrer un lot de resultats
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Liste de travail du laboratoire",
+        description="Prescriptions d'examens sans resultat, les plus anciennes d'abord, "
+                    "paginees, avec le nombre d'examens en attente par nom_examen",
+        parameters=[
+            OpenApiParameter(
+                name='nom_examen',
+                description='Limiter a un examen',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='service',
+                description='Nom du service de la session',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='page',
+                description='Numero de page',
+                required=False,
+                type=int
+            ),
+            OpenApiParameter(
+                name='page_size',
+                description='Taille de page (max 500, defaut 50)',
+                required=False,
+                type=int
+            )
+        ],
+        responses={
+            200: OpenApiResponse(description='Liste de travail paginee'),
+            404: OpenApiResponse(description='Page invalide')
+        }
+    )
+    @action(detail=False, methods=['get'], url_path='worklist')
+    def worklist(self, request):
+        """Prescriptions sans resultat (NOT EXISTS), triees par anciennete."""
+        try:
+            en_attente = PrescriptionExamen.objects.sans_resultat()
+            service = request.query_params.get('service', '').strip()
+            if service:
+                en_attente = en_attente.filter(
+                    id_session__service_id=Service.objects.id_par_nom(service)
+                )
+
+            # Compteurs sur toute la liste (avant le filtre par examen)
+            par_examen = list(
+                en_attente.values('nom_examen')
+                .annotate(nombre=Count('id'), plus_ancienne=Min('date_heure'))
+                .order_by('nom_examen')
+            )
+
+            nom_examen = request.query_params.get('nom_examen', '').strip()
+            if nom_examen:
+                en_attente = en_attente.filter(nom_examen=nom_examen)
+
+            # Pagination sur la requete NOT EXISTS seule (COUNT sans jointure),
+            # puis jointures patient/medecin/service pour la page uniquement
+            paginator = WorklistPagination()
+            ids = paginator.paginate_queryset(
+                en_attente.order_by('date_heure', 'id').values_list('id', flat=True),
+                request,
+                view=self
+            )
+            page = list(
+                PrescriptionExamen.objects.filter(id__in=ids).values(
+                    'id', 'nom_examen', 'date_heure', 'id_session', 'id_medecin',
+                    medecin_nom=F('id_medecin__nom'),
+                    patient_nom=F('id_session__id_patient__nom'),
+                    patient_prenom=F('id_session__id_patient__prenom'),
+                    patient_matricule=F('id_session__id_patient__matricule'),
+                    service=F('id_session__service__nom_service'),
+                ).order_by('date_heure', 'id')
+            )
+
+            return Response({
+                'success': True,
+                'count': paginator.page.paginator.count,
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+                'par_examen': par_examen,
+                'data': page
+            }, status=status.HTTP_200_OK)
+
+        except NotFound as e:
+            # ?page= non numerique ou au-dela de la derniere page
+            return Response({
+                'error': 'Page invalide',
+                'detail': str(e.detail)
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        except Exception as e:
+            return Response({
+                'error': 'Erreur lors de la recuperation',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @extend_schema(
+        summary="Enregistrer un lot de resultats",
+        description="Verifie tous les IDs du lot en une requete par table puis insere "
+                    "les resultats en une seule requete. Rien n'est enregistre si une "
+                    "ligne est invalide (prescription inconnue, deja renseignee ou "
+                    "repetee dans le lot).",
+        request=ResultatsExamenLotSerializer,
+        responses={
+            201: OpenApiResponse(description='Resultats enregistres'),
+            400: OpenApiResponse(description='Donnees invalides')
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='resultats')
+    def resultats(self, request):
+        """Enregistre un lot de resultats d'examens (bulk_create)."""
+        serializer = ResultatsExamenLotSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'error': 'Donnees invalides',
+                'detail': 'Veuillez verifier les donnees fournies.',
+                'erreurs': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            resultats = serializer.save()
+            return Response({
+                'success': True,
+                'message': f'{len(resultats)} resultat(s) enregistre(s).',
+                'count': len(resultats),
+                'data': [
+                    {'id': resultat.id, 'id_prescription': resultat.id_prescription_id}
+                    for resultat in resultats
+                ]
+            }, status=status.HTTP_201_CREATED)
+
+        except Exception as e:
+            return Response({
+                'error': 'Erreur lors de l\'enregistrement',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
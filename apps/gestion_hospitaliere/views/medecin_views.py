@@ -15,6 +15,7 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from django.utils import timezone
 from datetime import timedelta
 
+from api.champs import ChampsDynamiquesMixin
 from apps.gestion_hospitaliere.models import Medecin, Personnel
 from apps.gestion_hospitaliere.serializers import (
     MedecinSerializer,
@@ -67,7 +68,7 @@ from drf_spectacular.types import OpenApiTypes
         tags=['Medecins']
     ),
 )
-class MedecinViewSet(viewsets.ModelViewSet):
+class MedecinViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les operations CRUD sur Medecin.
 
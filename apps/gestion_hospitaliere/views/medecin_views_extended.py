@@ -11,7 +11,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+from api.optimisation import OptimisationRequetesMixin, optimiser_pour
 from apps.suivi_patient.models import Session, ObservationMedicale, Patient
+from apps.gestion_hospitaliere.models import Service
 from apps.gestion_hospitaliere.serializers import (
     SessionSerializer,
     PatientEnAttenteSerializer,
@@ -23,7 +25,7 @@ from apps.gestion_hospitaliere.serializers import (
 )
 
 
-class MedecinExtendedViewSet(viewsets.ViewSet):
+class MedecinExtendedViewSet(OptimisationRequetesMixin, viewsets.ViewSet):
     """
     ViewSet pour les endpoints du medecin.
 
@@ -35,6 +37,8 @@ class MedecinExtendedViewSet(viewsets.ViewSet):
     """
 
     permission_classes = [IsAuthenticated]
+    # Journal d'audit: {pk} de dossier-patient est un patient
+    modele_audite = Patient
 
     @extend_schema(
         summary="Liste patients en attente (medecin)",
@@ -75,13 +79,13 @@ class MedecinExtendedViewSet(viewsets.ViewSet):
                 )
 
             # Rechercher les sessions selon criteres
-            sessions = Session.objects.select_related('id_patient').filter(
-                service_courant=service,
+            sessions = optimiser_pour(Session.objects.filter(
+                service_id=Service.objects.id_par_nom(service),
                 personnel_responsable='medecin',
                 situation_patient='en attente'
             ).exclude(
                 statut='terminee'
-            )
+            ), PatientSerializer, chemin='id_patient')
 
             # Construire la reponse avec id_session pour chaque patient
             result = []
@@ -118,7 +122,8 @@ class MedecinExtendedViewSet(viewsets.ViewSet):
         responses={
             200: SessionSerializer,
             400: OpenApiResponse(description='Donnees invalides'),
-            404: OpenApiResponse(description='Session non trouvee')
+            404: OpenApiResponse(description='Session non trouvee'),
+            409: OpenApiResponse(description='Patient deja selectionne par un autre personnel')
         }
     )
     @action(detail=False, methods=['post'], url_path='selectionner-patient')
@@ -129,7 +134,7 @@ class MedecinExtendedViewSet(viewsets.ViewSet):
         Selon description.md ligne 171:
         - Identique a l'infirmier
         - Prend en entree l'id de la session
-        - Change situation_patient a 'recu'
+        - Change situation_patient a 'recu' si le patient est encore en attente
         """
         try:
             serializer = SelectionnerPatientSerializer(data=request.data)
@@ -147,10 +152,19 @@ class MedecinExtendedViewSet(viewsets.ViewSet):
             id_session = serializer.validated_data['id_session']
 
             try:
-                session = Session.objects.get(id=id_session)
-                session.situation_patient = 'recu'
-                session.save(update_fields=['situation_patient'])
-
+                # UPDATE conditionnel: un seul personnel obtient le patient
+                if not Session.objects.selectionner(id_session):
+                    if not Session.objects.filter(id=id_session).exists():
+                        raise Session.DoesNotExist
+                    return Response(
+                        {
+                            'error': 'Patient deja selectionne',
+                            'detail': f'Le patient de la session {id_session} a deja ete recu par un autre personnel.'
+                        },
+                        status=status.HTTP_409_CONFLICT
+                    )
+
+                session = Session.objects.select_related('id_patient', 'id_personnel', 'service').get(id=id_session)
                 response_serializer = SessionSerializer(session)
 
                 return Response(
@@ -268,7 +282,11 @@ class MedecinExtendedViewSet(viewsets.ViewSet):
             patient_data = PatientSerializer(patient).data
 
             # Recuperer toutes les sessions du patient
-            sessions = Session.objects.filter(id_patient=patient).order_by('-debut')
+            sessions = (
+                Session.objects.filter(id_patient=patient)
+                .select_related('id_patient', 'id_personnel', 'service')
+                .order_by('-debut')
+            )
             sessions_data = SessionSerializer(sessions, many=True).data
 
             # Recuperer toutes les observations medicales du patient
@@ -13,17 +13,22 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+from api.champs import ChampsDynamiquesMixin
+from api.idempotence import PARAMETRE_IDEMPOTENCE, idempotent
+from api.optimisation import optimiser_pour
 from apps.suivi_patient.models import Patient, RendezVous, Session
+from apps.suivi_patient.models.patient import AGE_MAX
 from apps.gestion_hospitaliere.models import Service
 from apps.gestion_hospitaliere.serializers import (
     PatientSerializer,
     PatientCreateSerializer,
     RendezVousSerializer,
     RendezVousCreateSerializer,
+    PatientFastSerializer,
 )
 
 
-class PatientViewSet(viewsets.ModelViewSet):
+class PatientViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des patients.
 
@@ -35,10 +40,12 @@ class PatientViewSet(viewsets.ModelViewSet):
     - DELETE /api/patients/{id}/ - Supprime un patient
     - GET /api/patients/search/?q=<text> - Recherche patients par nom/prenom
     - GET /api/patients/hospitalises/ - Liste patients hospitalises
+    - GET /api/patients/demographie/?mois=YYYY-MM - Repartition tranche d'age x service
     """
 
     queryset = Patient.objects.all().select_related('id_personnel')
     permission_classes = [IsAuthenticated]
+    throttle_scope = None  # portee api.throttling, redefinie par action
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     search_fields = ['nom', 'prenom', 'matricule', 'contact', 'email']
     ordering_fields = ['date_inscription', 'nom']
@@ -50,22 +57,65 @@ class PatientViewSet(viewsets.ModelViewSet):
             return PatientCreateSerializer
         return PatientSerializer
 
+    def get_queryset(self):
+        """
+        Annote l'age calcule en SQL pour les lectures.
+
+        Les ecritures n'ont pas l'annotation: une date de naissance modifiee
+        rendrait l'age annote obsolete dans la reponse.
+        """
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.avec_age()
+        return queryset
+
+    @staticmethod
+    def _lire_age(request, nom):
+        """Lit un parametre d'age entre 0 et AGE_MAX; leve ValueError s'il est invalide."""
+        valeur = request.query_params.get(nom)
+        if valeur in (None, ''):
+            return None
+        age = int(valeur)
+        if not 0 <= age <= AGE_MAX:
+            raise ValueError(valeur)
+        return age
+
     @extend_schema(
         summary="Liste tous les patients",
-        description="Retourne la liste complete des patients",
+        description="Retourne la liste complete des patients, filtrable par tranche d'age",
+        parameters=[
+            OpenApiParameter(
+                name='age_min', description=f'Age minimum (inclus, 0 a {AGE_MAX})', required=False, type=int
+            ),
+            OpenApiParameter(
+                name='age_max', description=f'Age maximum (inclus, 0 a {AGE_MAX})', required=False, type=int
+            ),
+        ],
         responses={200: PatientSerializer(many=True)}
     )
     def list(self, request, *args, **kwargs):
         """Liste tous les patients."""
         try:
-            queryset = self.filter_queryset(self.get_queryset())
-            serializer = self.get_serializer(queryset, many=True)
+            try:
+                age_min = self._lire_age(request, 'age_min')
+                age_max = self._lire_age(request, 'age_max')
+            except ValueError:
+                return Response(
+                    {
+                        'error': 'Parametres invalides',
+                        'detail': f'age_min et age_max doivent etre des entiers entre 0 et {AGE_MAX}.'
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            queryset = self.filter_queryset(self.get_queryset()).age_entre(age_min, age_max)
+            data = self.serialiser_valeurs(queryset, PatientFastSerializer)
 
             return Response(
                 {
                     'success': True,
-                    'count': queryset.count(),
-                    'data': serializer.data
+                    'count': len(data),
+                    'data': data
                 },
                 status=status.HTTP_200_OK
             )
@@ -83,11 +133,13 @@ class PatientViewSet(viewsets.ModelViewSet):
         summary="Cree un nouveau patient",
         description="Enregistre un nouveau patient avec toutes ses informations",
         request=PatientCreateSerializer,
+        parameters=[PARAMETRE_IDEMPOTENCE],
         responses={
             201: PatientSerializer,
             400: OpenApiResponse(description='Donnees invalides')
         }
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         """Cree un nouveau patient."""
         try:
@@ -290,7 +342,7 @@ class PatientViewSet(viewsets.ModelViewSet):
         ],
         responses={200: PatientSerializer(many=True)}
     )
-    @action(detail=False, methods=['get'], url_path='search')
+    @action(detail=False, methods=['get'], url_path='search', throttle_scope='recherche')
     def search_patients(self, request):
         """Recherche patients par nom ou prenom."""
         try:
@@ -306,11 +358,11 @@ class PatientViewSet(viewsets.ModelViewSet):
                 )
 
             # Recherche dans nom et prenom
-            patients = Patient.objects.filter(
+            patients = optimiser_pour(Patient.objects.filter(
                 nom__icontains=query
             ) | Patient.objects.filter(
                 prenom__icontains=query
-            )
+            ), PatientSerializer)
 
             serializer = PatientSerializer(patients, many=True)
 
@@ -352,11 +404,12 @@ class PatientViewSet(viewsets.ModelViewSet):
             from apps.suivi_patient.models import Hospitalisation
 
             # Recuperer toutes les hospitalisations en cours (pas de date de fin)
-            hospitalisations = Hospitalisation.objects.select_related(
-                'id_session__id_patient',
-                'id_chambre'
-            ).filter(
-                statut='en cours'  # Hospitalisations en cours
+            hospitalisations = optimiser_pour(
+                Hospitalisation.objects.select_related('id_chambre').filter(
+                    statut='en cours'  # Hospitalisations en cours
+                ),
+                PatientSerializer,
+                chemin='id_session__id_patient'
             )
 
             # Construire la reponse avec informations supplementaires
@@ -395,6 +448,122 @@ class PatientViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @extend_schema(
+        summary="Repartition demographique des patients",
+        description=(
+            "Nombre de patients distincts vus sur le mois, par tranche d'age et par service "
+            "(service de leurs sessions). Calcule en une seule requete groupee."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='mois',
+                description='Mois du rapport au format YYYY-MM (defaut: mois courant)',
+                required=False,
+                type=str
+            )
+        ],
+        responses={
+            200: OpenApiResponse(description='Comptes par tranche d\'age et service'),
+            400: OpenApiResponse(description='Mois invalide')
+        }
+    )
+    @action(detail=False, methods=['get'], url_path='demographie')
+    def demographie(self, request):
+        """
+        Repartition tranche d'age x service pour les rapports mensuels.
+
+        Le modele Patient ne porte pas de sexe: la repartition se fait
+        par service. L'age est celui au dernier jour du mois (ou aujourd'hui
+        pour le mois courant).
+        """
+        try:
+            from datetime import date, timedelta
+            from django.db.models import Case, CharField, Count, Value, When
+            from django.utils import timezone
+            from apps.suivi_patient.models.patient import TRANCHES_AGE, date_naissance_limite
+
+            today = timezone.localdate()
+            mois = request.query_params.get('mois')
+            try:
+                if mois:
+                    annee, numero = (int(partie) for partie in mois.split('-'))
+                    debut_mois = date(annee, numero, 1)
+                else:
+                    debut_mois = today.replace(day=1)
+            except ValueError:
+                return Response(
+                    {
+                        'error': 'Mois invalide',
+                        'detail': 'Le parametre "mois" doit etre au format YYYY-MM.'
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            fin_mois = (debut_mois + timedelta(days=32)).replace(day=1)
+            reference = min(today, fin_mois - timedelta(days=1))
+
+            # Tranche d'age exprimee en bornes de date de naissance
+            champ = 'id_patient__date_naissance'
+            tranche = Case(
+                *[
+                    When(
+                        **{f'{champ}__lte': date_naissance_limite(age_min, reference)},
+                        **(
+                            {f'{champ}__gt': date_naissance_limite(age_max + 1, reference)}
+                            if age_max is not None else {}
+                        ),
+                        then=Value(libelle),
+                    )
+                    for libelle, age_min, age_max in TRANCHES_AGE
+                ],
+                default=Value('inconnu'),
+                output_field=CharField(),
+            )
+
+            lignes = (
+                Session.objects
+                .filter(
+                    debut__date__gte=debut_mois,
+                    debut__date__lt=fin_mois,
+                )
+                .annotate(tranche=tranche)
+                .values('tranche', 'service__nom_service')
+                .annotate(total=Count('id_patient', distinct=True))
+                .order_by()
+            )
+
+            ordre = {libelle: index for index, (libelle, _, _) in enumerate(TRANCHES_AGE)}
+            data = sorted(
+                (
+                    {
+                        'tranche': ligne['tranche'],
+                        'service': ligne['service__nom_service'],
+                        'total': ligne['total'],
+                    }
+                    for ligne in lignes
+                ),
+                key=lambda ligne: (ligne['service'], ordre.get(ligne['tranche'], len(ordre))),
+            )
+
+            return Response(
+                {
+                    'success': True,
+                    'mois': debut_mois.strftime('%Y-%m'),
+                    'tranches': [libelle for libelle, _, _ in TRANCHES_AGE],
+                    'count': len(data),
+                    'data': data
+                },
+                status=status.HTTP_200_OK
+            )
+
+        except Exception as e:
+            return Response(
+                {
+                    'error': 'Erreur lors du calcul de la repartition demographique',
+                    'detail': str(e)
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
     @extend_schema(
         summary="Ouvre une session pour un patient",
         description="Cree une nouvelle session de suivi pour un patient dans un service specifique",
@@ -407,6 +576,7 @@ class PatientViewSet(viewsets.ModelViewSet):
             },
             'required': ['id_patient', 'id_service']
         },
+        parameters=[PARAMETRE_IDEMPOTENCE],
         responses={
             201: OpenApiResponse(description='Session creee avec succes'),
             400: OpenApiResponse(description='Donnees invalides'),
@@ -414,6 +584,7 @@ class PatientViewSet(viewsets.ModelViewSet):
         }
     )
     @action(detail=False, methods=['post'], url_path='ouvrir-session')
+    @idempotent
     def ouvrir_session(self, request):
         """
         Ouvre une session pour un patient.
@@ -421,7 +592,7 @@ class PatientViewSet(viewsets.ModelViewSet):
         Cree une session avec:
         - id_patient: patient concerne
         - id_personnel: personnel qui ouvre la session (utilisateur authentifie)
-        - service_courant: nom du service
+        - service: service d'accueil
         - personnel_responsable: poste de base du service (infirmier par defaut)
         - statut: 'en cours'
         - situation_patient: 'en attente'
@@ -469,7 +640,7 @@ class PatientViewSet(viewsets.ModelViewSet):
             session = Session.objects.create(
                 id_patient_id=id_patient,
                 id_personnel=request.user,
-                service_courant=service.nom_service,
+                service=service,
                 personnel_responsable='infirmier',  # Par defaut, le patient va voir l'infirmier en premier
                 statut='en cours',
                 situation_patient='en attente'
@@ -485,7 +656,8 @@ class PatientViewSet(viewsets.ModelViewSet):
                         'patient_nom': session.id_patient.nom,
                         'patient_prenom': session.id_patient.prenom,
                         'patient_matricule': session.id_patient.matricule,
-                        'service_courant': session.service_courant,
+                        'service': service.id,
+                        'service_courant': service.nom_service,
                         'personnel_responsable': session.personnel_responsable,
                         'statut': session.statut,
                         'situation_patient': session.situation_patient,
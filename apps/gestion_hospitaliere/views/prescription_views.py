@@ -6,19 +6,24 @@ Email: dedjomokarlyn@gmail.com
 Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
 Date: 2025-12-15
 """
+from django.db.models import F, Sum
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+from api.champs import ChampsDynamiquesMixin
 from apps.suivi_patient.models import (
     PrescriptionMedicament,
+    LignePrescription,
     PrescriptionExamen,
     ResultatExamen,
     Hospitalisation,
 )
-from apps.gestion_hospitaliere.models import Chambre
+from apps.suivi_patient.models.ligne_prescription import StockInsuffisant
+from apps.gestion_hospitaliere.models import Chambre, Personnel
 from apps.gestion_hospitaliere.serializers import (
     PrescriptionMedicamentSerializer,
     PrescriptionMedicamentCreateSerializer,
@@ -30,10 +35,11 @@ from apps.gestion_hospitaliere.serializers import (
     HospitalisationCreateSerializer,
     ChambreSerializer,
     ChambreCreateSerializer,
+    MedecinSerializer,
 )
 
 
-class PrescriptionMedicamentViewSet(viewsets.ModelViewSet):
+class PrescriptionMedicamentViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les prescriptions de medicaments.
 
@@ -41,9 +47,13 @@ class PrescriptionMedicamentViewSet(viewsets.ModelViewSet):
     - GET /api/prescriptions-medicaments/ - Liste toutes
     - GET /api/prescriptions-medicaments/?id_medecin=<id> - Par medecin
     - POST /api/prescriptions-medicaments/ - Creer
+    - GET /api/prescriptions-medicaments/a-dispenser/ - Liste de travail de la pharmacie
+    - POST /api/prescriptions-medicaments/{id}/dispenser/ - Dispenser toutes les lignes
     """
 
-    queryset = PrescriptionMedicament.objects.all().select_related('id_medecin', 'id_session')
+    queryset = PrescriptionMedicament.objects.all().select_related(
+        'id_medecin', 'id_session__id_patient'
+    ).prefetch_related('lignes__id_materiel')
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['id_medecin', 'id_session']
@@ -73,8 +83,149 @@ class PrescriptionMedicamentViewSet(viewsets.ModelViewSet):
             'data': response_serializer.data
         }, status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        summary="Liste de travail de la pharmacie",
+        description="Lignes de prescription en attente de dispensation (les plus anciennes "
+                    "d'abord) et demande totale par medicament comparee au stock",
+        parameters=[
+            OpenApiParameter(
+                name='id_materiel',
+                description='Limiter a un medicament',
+                required=False,
+                type=int
+            )
+        ],
+        responses={
+            200: OpenApiResponse(description='Lignes en attente et demande par medicament'),
+            400: OpenApiResponse(description='id_materiel invalide')
+        }
+    )
+    @action(detail=False, methods=['get'], url_path='a-dispenser')
+    def a_dispenser(self, request):
+        """Liste les lignes en attente en lisant l'index partiel ligne_presc_attente_idx."""
+        try:
+            en_attente = LignePrescription.objects.en_attente()
+            id_materiel = request.query_params.get('id_materiel')
+            if id_materiel:
+                try:
+                    id_materiel = int(id_materiel)
+                except ValueError:
+                    return Response({
+                        'error': 'Parametre invalide',
+                        'detail': 'id_materiel doit etre un entier.'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                en_attente = en_attente.filter(id_materiel_id=id_materiel)
+
+            lignes = list(
+                en_attente.values(
+                    'id', 'id_prescription', 'quantite', 'posologie', 'id_materiel',
+                    date_prescription=F('id_prescription__date_heure'),
+                    id_session=F('id_prescription__id_session'),
+                    patient_nom=F('id_prescription__id_session__id_patient__nom'),
+                    patient_matricule=F('id_prescription__id_session__id_patient__matricule'),
+                    nom_materiel=F('id_materiel__nom_Materiel'),
+                ).order_by('id_prescription__date_heure', 'id')
+            )
+            demande = list(
+                en_attente.values('id_materiel')
+                .annotate(
+                    nom_materiel=F('id_materiel__nom_Materiel'),
+                    quantite_stock=F('id_materiel__quantite_stock'),
+                    quantite_demandee=Sum('quantite'),
+                )
+                .order_by('id_materiel')
+            )
+            for ligne in demande:
+                ligne['manque'] = max(0, ligne['quantite_demandee'] - ligne['quantite_stock'])
+
+            return Response({
+                'success': True,
+                'count': len(lignes),
+                'data': lignes,
+                'demande': demande
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response({
+                'error': 'Erreur lors de la recuperation',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @extend_schema(
+        summary="Dispenser une prescription",
+        description="Dispense toutes les lignes en attente de la prescription dans une seule "
+                    "transaction: decremente le stock, cree la sortie (motif VENTE) et marque "
+                    "les lignes dispensees. Rien n'est modifie si le stock est insuffisant. "
+                    "id_personnel est optionnel (par defaut: utilisateur connecte).",
+        responses={
+            200: OpenApiResponse(description='Prescription dispensee'),
+            400: OpenApiResponse(description='Personnel invalide'),
+            404: OpenApiResponse(description='Prescription introuvable'),
+            409: OpenApiResponse(description='Stock insuffisant ou rien a dispenser')
+        }
+    )
+    @action(detail=True, methods=['post'], url_path='dispenser')
+    def dispenser(self, request, pk=None):
+        """Dispense la prescription en quelques requetes (voir LignePrescription.objects.dispenser)."""
+        try:
+            try:
+                id_prescription = int(pk)
+            except ValueError:
+                id_prescription = None
+            if id_prescription is None or not PrescriptionMedicament.objects.filter(pk=id_prescription).exists():
+                return Response({
+                    'error': 'Prescription introuvable',
+                    'detail': f'Aucune prescription trouvee avec l\'ID {pk}.'
+                }, status=status.HTTP_404_NOT_FOUND)
+
+            id_personnel = request.data.get('id_personnel')
+            if id_personnel is None and hasattr(request.user, 'poste'):
+                id_personnel = request.user.pk
+            try:
+                id_personnel = int(id_personnel)
+            except (TypeError, ValueError):
+                id_personnel = None
+            if id_personnel is None or not Personnel.objects.filter(pk=id_personnel).exists():
+                return Response({
+                    'error': 'Personnel invalide',
+                    'detail': 'id_personnel doit designer un personnel existant.'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                resultat = LignePrescription.objects.dispenser(id_prescription, id_personnel)
+            except StockInsuffisant as e:
+                return Response({
+                    'error': 'Stock insuffisant',
+                    'detail': 'Aucune ligne n\'a ete dispensee.',
+                    'manques': e.manques
+                }, status=status.HTTP_409_CONFLICT)
+
+            if resultat is None:
+                return Response({
+                    'error': 'Rien a dispenser',
+                    'detail': 'Cette prescription n\'a aucune ligne en attente.'
+                }, status=status.HTTP_409_CONFLICT)
+
+            sortie, nombre = resultat
+            return Response({
+                'success': True,
+                'message': f'{nombre} ligne(s) dispensee(s).',
+                'data': {
+                    'id_prescription': id_prescription,
+                    'idSortie': sortie.idSortie,
+                    'numero_sortie': sortie.numero_sortie,
+                    'lignes_dispensees': nombre
+                }
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response({
+                'error': 'Erreur lors de la dispensation',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class PrescriptionExamenViewSet(viewsets.ModelViewSet):
+
+class PrescriptionExamenViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """ViewSet pour les prescriptions d'examens."""
 
     queryset = PrescriptionExamen.objects.all().select_related('id_medecin', 'id_session')
@@ -108,7 +259,7 @@ class PrescriptionExamenViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_201_CREATED)
 
 
-class ResultatExamenViewSet(viewsets.ModelViewSet):
+class ResultatExamenViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """ViewSet pour les resultats d'examens."""
 
     queryset = ResultatExamen.objects.all().select_related('id_medecin', 'id_prescription')
@@ -142,10 +293,13 @@ class ResultatExamenViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_201_CREATED)
 
 
-class HospitalisationViewSet(viewsets.ModelViewSet):
+class HospitalisationViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les hospitalisations.
 
+    Endpoints supplementaires:
+    - GET /api/hospitalisations/frais/ - Frais courus des hospitalisations en cours
+
     Note: La creation decremente automatiquement nombre_places_dispo.
     """
 
@@ -157,6 +311,8 @@ class HospitalisationViewSet(viewsets.ModelViewSet):
     filterset_fields = ['id_medecin', 'id_session', 'id_chambre', 'statut']
     ordering_fields = ['debut']
     ordering = ['-debut']
+    # ?expand=id_chambre,id_medecin (api.champs)
+    champs_extensibles = {'id_chambre': ChambreSerializer, 'id_medecin': MedecinSerializer}
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -189,8 +345,48 @@ class HospitalisationViewSet(viewsets.ModelViewSet):
                 'detail': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
 
+    @extend_schema(
+        summary="Frais courus des hospitalisations en cours",
+        description="Calcule en SQL, pour chaque hospitalisation en cours, le nombre de "
+                    "jours factures (jour d'entree compris), le tarif journalier, le montant "
+                    "du et le montant deja genere en lignes de frais. Accepte les memes "
+                    "filtres que la liste (id_medecin, id_session, id_chambre).",
+        responses={200: OpenApiResponse(description='Frais courus et total')}
+    )
+    @action(detail=False, methods=['get'], url_path='frais')
+    def frais(self, request):
+        """Frais courus de toutes les hospitalisations en cours."""
+        try:
+            hospitalisations = self.filter_queryset(
+                Hospitalisation.objects.filter(statut='en cours')
+            ).avec_frais()
+
+            data = list(
+                hospitalisations.values(
+                    'id', 'id_session', 'id_chambre', 'debut', 'jours',
+                    'tarif_journalier', 'montant_du', 'montant_genere',
+                    chambre_numero=F('id_chambre__numero_chambre'),
+                    patient_nom=F('id_session__id_patient__nom'),
+                    patient_matricule=F('id_session__id_patient__matricule'),
+                )
+            )
+            total = hospitalisations.aggregate(total=Sum('montant_du'))['total']
+
+            return Response({
+                'success': True,
+                'count': len(data),
+                'total_du': total or 0,
+                'data': data
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response({
+                'error': 'Erreur lors du calcul des frais',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 
-class ChambreViewSet(viewsets.ModelViewSet):
+class ChambreViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les chambres.
 
@@ -12,14 +12,18 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
 from drf_spectacular.utils import extend_schema, OpenApiResponse
+from api.champs import ChampsDynamiquesMixin
 from apps.suivi_patient.models import RendezVous
 from apps.gestion_hospitaliere.serializers import (
     RendezVousSerializer,
     RendezVousCreateSerializer,
+    RendezVousFastSerializer,
+    PatientSerializer,
+    MedecinSerializer,
 )
 
 
-class RendezVousViewSet(viewsets.ModelViewSet):
+class RendezVousViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des rendez-vous.
 
@@ -37,6 +41,8 @@ class RendezVousViewSet(viewsets.ModelViewSet):
     filterset_fields = ['id_patient', 'id_medecin']
     ordering_fields = ['date_heure']
     ordering = ['date_heure']
+    # ?expand=id_patient,id_medecin (api.champs)
+    champs_extensibles = {'id_patient': PatientSerializer, 'id_medecin': MedecinSerializer}
 
     def get_serializer_class(self):
         """Retourne le serializer approprie selon l'action."""
@@ -53,13 +59,13 @@ class RendezVousViewSet(viewsets.ModelViewSet):
         """Liste tous les rendez-vous."""
         try:
             queryset = self.filter_queryset(self.get_queryset())
-            serializer = self.get_serializer(queryset, many=True)
+            data = self.serialiser_valeurs(queryset, RendezVousFastSerializer)
 
             return Response(
                 {
                     'success': True,
-                    'count': queryset.count(),
-                    'data': serializer.data
+                    'count': len(data),
+                    'data': data
                 },
                 status=status.HTTP_200_OK
             )
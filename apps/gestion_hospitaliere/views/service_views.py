@@ -10,7 +10,9 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import ProtectedError, Q
+from api.champs import ChampsDynamiquesMixin
 from apps.gestion_hospitaliere.models import Service, Personnel, Medecin
 from apps.gestion_hospitaliere.serializers import (
     ServiceSerializer,
@@ -18,7 +20,7 @@ from apps.gestion_hospitaliere.serializers import (
     PersonnelSerializer,
     MedecinSerializer,
 )
-from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiResponse
 from drf_spectacular.types import OpenApiTypes
 
 
@@ -52,11 +54,15 @@ from drf_spectacular.types import OpenApiTypes
     ),
     destroy=extend_schema(
         summary="Supprimer un service",
-        description="Supprime un service.",
-        tags=['Services']
+        description="Supprime un service. Refuse (409) si des sessions de patients y sont encore rattachees.",
+        tags=['Services'],
+        responses={
+            200: OpenApiResponse(description='Service supprime'),
+            409: OpenApiResponse(description='Sessions encore rattachees au service')
+        }
     ),
 )
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des services de l'hopital.
 
@@ -72,6 +78,8 @@ class ServiceViewSet(viewsets.ModelViewSet):
 
     queryset = Service.objects.all().select_related('chef_service')
     permission_classes = [IsAuthenticated]
+    # ?expand=chef_service (api.champs); ?fields= sans chef_service_details evite la jointure
+    champs_extensibles = {'chef_service': PersonnelSerializer}
 
     def get_serializer_class(self):
         """Retourne le serializer approprie selon l'action."""
@@ -176,44 +184,57 @@ class ServiceViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         service_nom = instance.nom_service
 
-        # Suppression en cascade manuelle des objets liés
-        # 1. Supprimer tous les personnels du service (qui supprimera leurs patients, sessions, etc.)
-        personnels_count = instance.personnels.count()
-        for personnel in instance.personnels.all():
-            # Supprimer les objets liés au personnel
-            for patient in personnel.patients_enregistres.all():
-                patient.rendez_vous.all().delete()
-                patient.sessions.all().delete()
-                patient.delete()
-            personnel.sessions_ouvertes.all().delete()
-            if hasattr(personnel, 'besoins_emis'):
-                personnel.besoins_emis.all().delete()
-            if hasattr(personnel, 'sorties_effectuees'):
-                personnel.sorties_effectuees.all().delete()
-            personnel.delete()
-
-        # 2. Supprimer tous les médecins du service (héritage de Personnel)
-        medecins_count = Medecin.objects.filter(service=instance).count()
-        for medecin in Medecin.objects.filter(service=instance):
-            # Supprimer les rendez-vous du médecin
-            medecin.rendez_vous.all().delete()
-            # Supprimer les hospitalisations supervisées par ce médecin
-            if hasattr(medecin, 'hospitalisations'):
-                medecin.hospitalisations.all().delete()
-            # Supprimer les objets liés au personnel (patients, sessions, etc.)
-            for patient in medecin.patients_enregistres.all():
-                patient.rendez_vous.all().delete()
-                patient.sessions.all().delete()
-                patient.delete()
-            medecin.sessions_ouvertes.all().delete()
-            if hasattr(medecin, 'besoins_emis'):
-                medecin.besoins_emis.all().delete()
-            if hasattr(medecin, 'sorties_effectuees'):
-                medecin.sorties_effectuees.all().delete()
-            medecin.delete()
-
-        # 3. Supprimer le service
-        self.perform_destroy(instance)
+        # Tout ou rien: un service encore reference par des sessions (historique
+        # clinique, cle PROTECT) n'est pas supprime et rien n'est efface
+        try:
+            with transaction.atomic():
+                # Suppression en cascade manuelle des objets liés
+                # 1. Supprimer tous les personnels du service (qui supprimera leurs patients, sessions, etc.)
+                personnels_count = instance.personnels.count()
+                for personnel in instance.personnels.all():
+                    # Supprimer les objets liés au personnel
+                    for patient in personnel.patients_enregistres.all():
+                        patient.rendez_vous.all().delete()
+                        patient.sessions.all().delete()
+                        patient.delete()
+                    personnel.sessions_ouvertes.all().delete()
+                    if hasattr(personnel, 'besoins_emis'):
+                        personnel.besoins_emis.all().delete()
+                    if hasattr(personnel, 'sorties_effectuees'):
+                        personnel.sorties_effectuees.all().delete()
+                    personnel.delete()
+
+                # 2. Supprimer tous les médecins du service (héritage de Personnel)
+                medecins_count = Medecin.objects.filter(service=instance).count()
+                for medecin in Medecin.objects.filter(service=instance):
+                    # Supprimer les rendez-vous du médecin
+                    medecin.rendez_vous.all().delete()
+                    # Supprimer les hospitalisations supervisées par ce médecin
+                    if hasattr(medecin, 'hospitalisations'):
+                        medecin.hospitalisations.all().delete()
+                    # Supprimer les objets liés au personnel (patients, sessions, etc.)
+                    for patient in medecin.patients_enregistres.all():
+                        patient.rendez_vous.all().delete()
+                        patient.sessions.all().delete()
+                        patient.delete()
+                    medecin.sessions_ouvertes.all().delete()
+                    if hasattr(medecin, 'besoins_emis'):
+                        medecin.besoins_emis.all().delete()
+                    if hasattr(medecin, 'sorties_effectuees'):
+                        medecin.sorties_effectuees.all().delete()
+                    medecin.delete()
+
+                # 3. Supprimer le service (refuse si des sessions y sont encore rattachees)
+                self.perform_destroy(instance)
+        except ProtectedError:
+            return Response(
+                {
+                    'error': 'Service utilise',
+                    'detail': f'{instance.sessions.count()} session(s) de patients sont encore rattachees '
+                              f'au service "{service_nom}". Reaffectez-les avant de le supprimer.'
+                },
+                status=status.HTTP_409_CONFLICT
+            )
 
         return Response(
             {
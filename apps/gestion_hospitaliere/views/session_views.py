@@ -13,16 +13,24 @@ from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
-from apps.suivi_patient.models import Session
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from api.champs import ChampsDynamiquesMixin
+from api.idempotence import PARAMETRE_IDEMPOTENCE, idempotent
+from apps.suivi_patient.models import Session, SigneVital
+from apps.suivi_patient.models.signe_vital import POINTS_PAR_SERIE, RESOLUTIONS, TYPES_SIGNES_VITAUX
 from apps.gestion_hospitaliere.models import Service
+from apps.gestion_hospitaliere.serializers import PatientSerializer, PersonnelSerializer, ServiceSerializer
 from apps.gestion_hospitaliere.serializers.session_serializers import (
     SessionSerializer,
     SessionCreateSerializer,
     SessionUpdateSerializer,
 )
+from apps.gestion_hospitaliere.serializers.fast_serializers import SessionFastSerializer
+from apps.gestion_hospitaliere.serializers.signe_vital_serializers import SignesVitauxCreateSerializer
 
 
-class SessionViewSet(viewsets.ModelViewSet):
+class SessionViewSet(ChampsDynamiquesMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des sessions.
 
@@ -37,14 +45,31 @@ class SessionViewSet(viewsets.ModelViewSet):
     - POST /api/sessions/{id}/rediriger/ - Redirige un patient
     - POST /api/sessions/{id}/selectionner/ - Selectionne un patient (situation -> recu)
     - GET /api/sessions/patients-attente/{service}/ - Liste patients en attente pour un service
+    - GET /api/sessions/{id}/vitals/ - Series de signes vitaux (sous-echantillonnees)
+    - POST /api/sessions/{id}/vitals/ - Enregistre un lot de mesures
     """
 
-    queryset = Session.objects.all().select_related('id_patient', 'id_personnel')
+    queryset = Session.objects.all().select_related('id_patient', 'id_personnel', 'service')
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
-    filterset_fields = ['id_patient', 'statut', 'situation_patient', 'service_courant']
+    filterset_fields = ['id_patient', 'statut', 'situation_patient', 'service']
     ordering_fields = ['debut', 'id_patient']
     ordering = ['-debut']
+    # ?fields= / ?expand=id_patient,id_personnel,service (api.champs)
+    actions_champs_dynamiques = ('list', 'retrieve', 'en_cours')
+    champs_extensibles = {
+        'id_patient': PatientSerializer,
+        'id_personnel': PersonnelSerializer,
+        'service': ServiceSerializer,
+    }
+
+    def filter_queryset(self, queryset):
+        """Accepte aussi ?service_courant=<nom du service> (ancien filtre par nom)."""
+        queryset = super().filter_queryset(queryset)
+        nom_service = self.request.query_params.get('service_courant')
+        if nom_service:
+            queryset = queryset.filter(service_id=Service.objects.id_par_nom(nom_service))
+        return queryset
 
     def get_serializer_class(self):
         """Retourne le serializer approprie selon l'action."""
@@ -63,13 +88,13 @@ class SessionViewSet(viewsets.ModelViewSet):
         """Liste toutes les sessions."""
         try:
             queryset = self.filter_queryset(self.get_queryset())
-            serializer = self.get_serializer(queryset, many=True)
+            data = self.serialiser_valeurs(queryset, SessionFastSerializer)
 
             return Response(
                 {
                     'success': True,
-                    'count': queryset.count(),
-                    'data': serializer.data
+                    'count': len(data),
+                    'data': data
                 },
                 status=status.HTTP_200_OK
             )
@@ -87,11 +112,13 @@ class SessionViewSet(viewsets.ModelViewSet):
         summary="Ouvre une nouvelle session",
         description="Cree une nouvelle session pour un patient",
         request=SessionCreateSerializer,
+        parameters=[PARAMETRE_IDEMPOTENCE],
         responses={
             201: SessionSerializer,
             400: OpenApiResponse(description='Donnees invalides')
         }
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         """Cree une nouvelle session."""
         try:
@@ -109,9 +136,7 @@ class SessionViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Recuperer le service pour prendre le nom
             id_service = serializer.validated_data['id_service']
-            service = Service.objects.get(id=id_service)
 
             # Determiner le personnel qui ouvre la session
             id_personnel = request.data.get('id_personnel')
@@ -146,7 +171,7 @@ class SessionViewSet(viewsets.ModelViewSet):
             session = Session.objects.create(
                 id_patient_id=serializer.validated_data['id_patient'],
                 id_personnel=personnel,
-                service_courant=service.nom_service,
+                service_id=id_service,
                 personnel_responsable='infirmier',  # Par defaut selon description.md
                 statut='en cours',
                 situation_patient='en attente'
@@ -182,13 +207,13 @@ class SessionViewSet(viewsets.ModelViewSet):
         """Liste les sessions en cours."""
         try:
             queryset = self.get_queryset().exclude(statut='terminee')
-            serializer = SessionSerializer(queryset, many=True)
+            data = self.serialiser_valeurs(queryset, SessionFastSerializer)
 
             return Response(
                 {
                     'success': True,
-                    'count': queryset.count(),
-                    'data': serializer.data
+                    'count': len(data),
+                    'data': data
                 },
                 status=status.HTTP_200_OK
             )
@@ -215,7 +240,7 @@ class SessionViewSet(viewsets.ModelViewSet):
             session = self.get_object()
             session.statut = 'terminee'
             session.fin = timezone.now()
-            session.save()
+            session.save(update_fields=['statut', 'fin'])
 
             serializer = SessionSerializer(session)
 
@@ -248,17 +273,32 @@ class SessionViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         summary="Selectionne un patient",
-        description="Met la situation_patient a 'recu' (infirmier/medecin selectionne un patient)",
-        responses={200: SessionSerializer}
+        description=(
+            "Met la situation_patient a 'recu' (infirmier/medecin selectionne un patient). "
+            "Si plusieurs personnels selectionnent le meme patient, un seul obtient 200, "
+            "les autres recoivent 409."
+        ),
+        responses={
+            200: SessionSerializer,
+            409: OpenApiResponse(description='Patient deja selectionne')
+        }
     )
     @action(detail=True, methods=['post'], url_path='selectionner')
     def selectionner(self, request, pk=None):
         """Selectionne un patient - met situation_patient a 'recu'."""
         try:
             session = self.get_object()
-            session.situation_patient = 'recu'
-            session.save()
 
+            if not Session.objects.selectionner(session.id):
+                return Response(
+                    {
+                        'error': 'Patient deja selectionne',
+                        'detail': f'Le patient de la session {session.id} a deja ete recu par un autre personnel.'
+                    },
+                    status=status.HTTP_409_CONFLICT
+                )
+
+            session.refresh_from_db(fields=['situation_patient', 'updated_at'])
             serializer = SessionSerializer(session)
 
             return Response(
@@ -316,7 +356,8 @@ class SessionViewSet(viewsets.ModelViewSet):
 
             if type_redir == 'service':
                 # Verifier que le service existe
-                if not Service.objects.filter(nom_service__iexact=valeur).exists():
+                id_service = Service.objects.id_par_nom(valeur)
+                if id_service is None:
                     return Response(
                         {
                             'error': 'Service non trouve',
@@ -324,7 +365,8 @@ class SessionViewSet(viewsets.ModelViewSet):
                         },
                         status=status.HTTP_400_BAD_REQUEST
                     )
-                session.service_courant = valeur
+                session.service_id = id_service
+                champ = 'service'
             elif type_redir == 'personnel':
                 postes_valides = ['receptioniste', 'caissier', 'infirmier', 'medecin',
                                 'laborantin', 'pharmacien', 'comptable', 'directeur']
@@ -337,6 +379,7 @@ class SessionViewSet(viewsets.ModelViewSet):
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 session.personnel_responsable = valeur.lower()
+                champ = 'personnel_responsable'
             else:
                 return Response(
                     {
@@ -347,8 +390,9 @@ class SessionViewSet(viewsets.ModelViewSet):
                 )
 
             # Remettre situation_patient a 'en attente' apres redirection
+            # (seules les colonnes modifiees sont ecrites)
             session.situation_patient = 'en attente'
-            session.save()
+            session.save(update_fields=[champ, 'situation_patient'])
 
             serializer = SessionSerializer(session)
 
@@ -463,8 +507,8 @@ class SessionViewSet(viewsets.ModelViewSet):
                 )
 
             queryset = self.get_queryset().filter(
-                service_courant__iexact=service,
-                personnel_responsable__iexact=poste,
+                service_id=Service.objects.id_par_nom(service),
+                personnel_responsable=poste.lower(),
                 situation_patient='en attente'
             ).exclude(statut='terminee')
 
@@ -479,7 +523,7 @@ class SessionViewSet(viewsets.ModelViewSet):
                     'prenom': patient.prenom,
                     'contact': patient.contact,
                     'id_session': session.id,
-                    'service_courant': session.service_courant,
+                    'service_courant': session.service.nom_service,
                     'debut_session': session.debut
                 })
 
@@ -536,9 +580,9 @@ class SessionViewSet(viewsets.ModelViewSet):
             # - statut != 'terminee'
             # - situation_patient = 'en attente'
             # - personnel_responsable = 'infirmier'
-            # - service_courant = service fourni
+            # - service = service fourni (nom resolu en id)
             queryset = self.get_queryset().filter(
-                service_courant__iexact=service,
+                service_id=Service.objects.id_par_nom(service),
                 personnel_responsable='infirmier',
                 situation_patient='en attente'
             ).exclude(statut='terminee')
@@ -555,7 +599,7 @@ class SessionViewSet(viewsets.ModelViewSet):
                     'date_naissance': patient.date_naissance,
                     'contact': patient.contact,
                     'id_session': session.id,
-                    'service_courant': session.service_courant,
+                    'service_courant': session.service.nom_service,
                     'debut_session': session.debut
                 })
 
@@ -612,9 +656,9 @@ class SessionViewSet(viewsets.ModelViewSet):
             # - statut != 'terminee'
             # - situation_patient = 'en attente'
             # - personnel_responsable = 'medecin'
-            # - service_courant = service fourni
+            # - service = service fourni (nom resolu en id)
             queryset = self.get_queryset().filter(
-                service_courant__iexact=service,
+                service_id=Service.objects.id_par_nom(service),
                 personnel_responsable='medecin',
                 situation_patient='en attente'
             ).exclude(statut='terminee')
@@ -631,7 +675,7 @@ class SessionViewSet(viewsets.ModelViewSet):
                     'date_naissance': patient.date_naissance,
                     'contact': patient.contact,
                     'id_session': session.id,
-                    'service_courant': session.service_courant,
+                    'service_courant': session.service.nom_service,
                     'debut_session': session.debut
                 })
 
@@ -667,7 +711,7 @@ class SessionViewSet(viewsets.ModelViewSet):
         try:
             session = self.get_object()
             session.statut = 'en attente'
-            session.save()
+            session.save(update_fields=['statut'])
 
             serializer = SessionSerializer(session)
 
@@ -697,3 +741,184 @@ class SessionViewSet(viewsets.ModelViewSet):
                 },
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+    @extend_schema(
+        methods=['GET'],
+        summary="Series de signes vitaux d'une session",
+        description=(
+            "Retourne une serie par type de mesure. Avec une resolution minute, heure ou jour, "
+            "les mesures sont regroupees par intervalle en base (moyenne, min, max, nombre). "
+            "La resolution auto choisit la plus fine donnant au plus 500 points par serie. "
+            "En resolution brut, seules les 500 mesures les plus recentes de chaque serie sont "
+            "retournees (tronquee: true si des mesures plus anciennes existent)."
+        ),
+        parameters=[
+            OpenApiParameter(name='type', description='Type(s) de mesure, separes par des virgules', required=False, type=str),
+            OpenApiParameter(
+                name='resolution', required=False, type=str,
+                enum=['auto', 'brut', *RESOLUTIONS],
+                description='Intervalle de regroupement (defaut: auto)'
+            ),
+            OpenApiParameter(name='debut', description='Debut de la periode (ISO 8601)', required=False, type=str),
+            OpenApiParameter(name='fin', description='Fin de la periode (ISO 8601)', required=False, type=str),
+        ],
+        responses={
+            200: OpenApiResponse(description='Series de signes vitaux'),
+            400: OpenApiResponse(description='Parametres invalides'),
+            404: OpenApiResponse(description='Session non trouvee')
+        }
+    )
+    @extend_schema(
+        methods=['POST'],
+        summary="Enregistre des signes vitaux",
+        description="Enregistre un lot de mesures pour la session en une seule insertion",
+        request=SignesVitauxCreateSerializer,
+        responses={
+            201: OpenApiResponse(description='Mesures enregistrees'),
+            400: OpenApiResponse(description='Donnees invalides'),
+            404: OpenApiResponse(description='Session non trouvee')
+        }
+    )
+    @action(detail=True, methods=['get', 'post'], url_path='vitals')
+    def vitals(self, request, pk=None):
+        """Lit (GET) ou enregistre (POST) les signes vitaux d'une session."""
+        try:
+            session = Session.objects.only('id').get(id=pk)
+        except (Session.DoesNotExist, ValueError):
+            return Response(
+                {
+                    'error': 'Session non trouvee',
+                    'detail': f'Aucune session trouvee avec l\'ID {pk}.'
+                },
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        try:
+            if request.method == 'POST':
+                return self._enregistrer_vitals(request, session)
+
+            queryset = SigneVital.objects.filter(id_session=session)
+
+            types = [t for t in request.query_params.get('type', '').split(',') if t]
+            inconnus = [t for t in types if t not in TYPES_SIGNES_VITAUX]
+            if inconnus:
+                return Response(
+                    {
+                        'error': 'Type de mesure invalide',
+                        'detail': f'Types inconnus: {", ".join(inconnus)}. '
+                                  f'Valeurs acceptees: {", ".join(TYPES_SIGNES_VITAUX)}'
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if types:
+                queryset = queryset.filter(type_mesure__in=types)
+
+            for parametre, lookup in (('debut', 'date_heure__gte'), ('fin', 'date_heure__lte')):
+                valeur = request.query_params.get(parametre)
+                if not valeur:
+                    continue
+                date_heure = parse_datetime(valeur)
+                if date_heure is None:
+                    return Response(
+                        {
+                            'error': 'Date invalide',
+                            'detail': f'Le parametre "{parametre}" doit etre une date ISO 8601.'
+                        },
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                if timezone.is_naive(date_heure):
+                    date_heure = timezone.make_aware(date_heure)
+                queryset = queryset.filter(**{lookup: date_heure})
+
+            resolution = request.query_params.get('resolution', 'auto')
+            if resolution not in ('auto', 'brut', *RESOLUTIONS):
+                return Response(
+                    {
+                        'error': 'Resolution invalide',
+                        'detail': f'Valeurs acceptees: auto, brut, {", ".join(RESOLUTIONS)}'
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if resolution == 'auto':
+                resolution = queryset.resolution_auto()
+
+            series = {}
+            tronquees = set()
+            if resolution == 'brut':
+                # Un point de plus que la limite pour savoir si la serie est tronquee
+                for type_mesure, date_heure, valeur in queryset.dernieres_mesures(POINTS_PAR_SERIE + 1):
+                    series.setdefault(type_mesure, []).append(
+                        {'date_heure': date_heure, 'valeur': valeur}
+                    )
+                for type_mesure, points in series.items():
+                    if len(points) > POINTS_PAR_SERIE:
+                        del points[0]
+                        tronquees.add(type_mesure)
+            else:
+                for ligne in queryset.agreger(resolution):
+                    series.setdefault(ligne['type_mesure'], []).append({
+                        'date_heure': ligne['periode'],
+                        'moyenne': round(ligne['moyenne'], 2),
+                        'min': ligne['minimum'],
+                        'max': ligne['maximum'],
+                        'nombre': ligne['nombre'],
+                    })
+
+            data = [
+                {
+                    'type': type_mesure,
+                    'libelle': TYPES_SIGNES_VITAUX[type_mesure][0],
+                    'unite': TYPES_SIGNES_VITAUX[type_mesure][1],
+                    'points': points,
+                    'tronquee': type_mesure in tronquees,
+                }
+                for type_mesure, points in series.items()
+            ]
+
+            return Response(
+                {
+                    'success': True,
+                    'id_session': session.id,
+                    'resolution': resolution,
+                    'count': len(data),
+                    'data': data
+                },
+                status=status.HTTP_200_OK
+            )
+
+        except Exception as e:
+            return Response(
+                {
+                    'error': 'Erreur lors de la recuperation des signes vitaux',
+                    'detail': str(e)
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def _enregistrer_vitals(self, request, session):
+        """Valide et insere un lot de mesures (bulk_create)."""
+        serializer = SignesVitauxCreateSerializer(
+            data=request.data,
+            context={'request': request, 'session': session}
+        )
+
+        if not serializer.is_valid():
+            return Response(
+                {
+                    'error': 'Donnees invalides',
+                    'detail': 'Veuillez verifier les donnees fournies.',
+                    'erreurs': serializer.errors
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        mesures = serializer.save()
+
+        return Response(
+            {
+                'success': True,
+                'message': f'{len(mesures)} mesure(s) enregistree(s) avec succes.',
+                'count': len(mesures)
+            },
+            status=status.HTTP_201_CREATED
+        )
@@ -0,0 +1,192 @@
+"""
+Views pour la synchronisation incrementale (delta-sync) des listes.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
+from apps.suivi_patient.models import Patient, Session, RendezVous, SyncTombstone
+from apps.gestion_hospitaliere.serializers import PatientSerializer, RendezVousSerializer
+from apps.gestion_hospitaliere.serializers.session_serializers import SessionSerializer
+
+
+SYNC_TOKEN_SALT = 'apps.gestion_hospitaliere.sync'
+
+# resource -> (modele, serializer, relations a joindre)
+SYNC_RESOURCES = {
+    'patients': (Patient, PatientSerializer, ('id_personnel',)),
+    'sessions': (Session, SessionSerializer, ('id_patient', 'id_personnel', 'service')),
+    'rendez-vous': (RendezVous, RendezVousSerializer, ('id_patient', 'id_medecin')),
+}
+
+
+def _encoder_curseur(curseur):
+    """Serialise un curseur (horodatage, id) pour le jeton."""
+    if curseur is None:
+        return None
+    return [curseur[0].isoformat(), curseur[1]]
+
+
+def _decoder_curseur(valeur):
+    """Reconstruit un curseur (horodatage, id) depuis le jeton."""
+    if valeur is None:
+        return None
+    horodatage = parse_datetime(valeur[0])
+    if horodatage is None:
+        raise ValueError('Horodatage invalide dans le jeton.')
+    return horodatage, int(valeur[1])
+
+
+def _apres(queryset, champ, curseur):
+    """Filtre strictement apres le curseur (pagination par cle sur champ, id)."""
+    if curseur is None:
+        return queryset
+    horodatage, pk = curseur
+    return queryset.filter(
+        Q(**{f'{champ}__gt': horodatage}) | Q(**{champ: horodatage, 'id__gt': pk})
+    )
+
+
+def _lire_limite(request):
+    """Retourne la taille de page demandee, bornee par SYNC_MAX_PAGE_SIZE."""
+    defaut = getattr(settings, 'SYNC_PAGE_SIZE', 500)
+    maximum = getattr(settings, 'SYNC_MAX_PAGE_SIZE', 1000)
+    try:
+        limite = int(request.query_params.get('limit', defaut))
+    except (TypeError, ValueError):
+        limite = defaut
+    return max(1, min(limite, maximum))
+
+
+@extend_schema(
+    summary="Flux de synchronisation incrementale",
+    description=(
+        "Retourne uniquement les objets modifies et les identifiants supprimes "
+        "depuis le jeton 'since'. Sans jeton, retourne un instantane complet pagine. "
+        "Ressources: patients, sessions, rendez-vous."
+    ),
+    parameters=[
+        OpenApiParameter(name='since', description='Jeton retourne par l\'appel precedent', required=False, type=str),
+        OpenApiParameter(name='limit', description='Nombre maximum d\'objets par page', required=False, type=int),
+    ],
+    responses={
+        200: OpenApiResponse(description='Objets modifies, suppressions et nouveau jeton'),
+        400: OpenApiResponse(description='Jeton invalide'),
+        404: OpenApiResponse(description='Ressource inconnue'),
+        410: OpenApiResponse(description='Jeton expire, resynchronisation complete requise'),
+    },
+    tags=['Synchronisation'],
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync_feed(request, resource):
+    """
+    Endpoint: GET /api/sync/<resource>/?since=<jeton>
+
+    Les objets sont parcourus dans l'ordre (updated_at, id) et les suppressions
+    dans l'ordre (deleted_at, id), ce qui permet des parcours d'index par plage.
+    Une fenetre de stabilisation (SYNC_SETTLE_SECONDS) exclut les ecritures
+    trop recentes dont la transaction pourrait ne pas encore etre validee.
+    """
+    if resource not in SYNC_RESOURCES:
+        return Response(
+            {
+                'error': 'Ressource inconnue',
+                'detail': f'Ressources disponibles: {", ".join(SYNC_RESOURCES)}.'
+            },
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    model, serializer_class, relations = SYNC_RESOURCES[resource]
+    limite = _lire_limite(request)
+    maintenant = timezone.now()
+    horizon = maintenant - timedelta(seconds=getattr(settings, 'SYNC_SETTLE_SECONDS', 2))
+
+    since = request.query_params.get('since')
+    if since:
+        try:
+            jeton = signing.loads(since, salt=SYNC_TOKEN_SALT)
+            curseur_maj = _decoder_curseur(jeton.get('u'))
+            curseur_sup = _decoder_curseur(jeton.get('d'))
+        except (signing.BadSignature, ValueError, TypeError, AttributeError, IndexError):
+            return Response(
+                {
+                    'error': 'Jeton invalide',
+                    'detail': 'Le parametre "since" est invalide. Relancez une synchronisation complete.'
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        retention = timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+        if curseur_sup is not None and curseur_sup[0] < maintenant - retention:
+            return Response(
+                {
+                    'error': 'Jeton expire',
+                    'detail': 'Les suppressions anterieures ont ete purgees. '
+                              'Relancez une synchronisation complete (sans "since").'
+                },
+                status=status.HTTP_410_GONE
+            )
+    else:
+        # Instantane complet: les suppressions anterieures sont sans objet
+        curseur_maj = None
+        curseur_sup = (horizon, 0)
+
+    # Objets modifies
+    queryset = _apres(
+        model.objects.filter(updated_at__lte=horizon), 'updated_at', curseur_maj
+    ).select_related(*relations).order_by('updated_at', 'id')
+    objets = list(queryset[:limite + 1])
+    objets_restants = len(objets) > limite
+    objets = objets[:limite]
+    if objets:
+        curseur_maj = (objets[-1].updated_at, objets[-1].id)
+    elif curseur_maj is None:
+        curseur_maj = (horizon, 0)
+
+    # Suppressions
+    tombstones = _apres(
+        SyncTombstone.objects.filter(resource=resource, deleted_at__lte=horizon),
+        'deleted_at',
+        curseur_sup,
+    ).order_by('deleted_at', 'id').values_list('id', 'object_id', 'deleted_at')
+    suppressions = list(tombstones[:limite + 1])
+    suppressions_restantes = len(suppressions) > limite
+    suppressions = suppressions[:limite]
+    if suppressions_restantes:
+        curseur_sup = (suppressions[-1][2], suppressions[-1][0])
+    else:
+        # Toutes les suppressions jusqu'a l'horizon sont transmises: le curseur
+        # avance meme sans nouvelle suppression (pas de 410 pour un client a jour)
+        curseur_sup = (horizon, 0)
+
+    prochain_jeton = signing.dumps(
+        {'u': _encoder_curseur(curseur_maj), 'd': _encoder_curseur(curseur_sup)},
+        salt=SYNC_TOKEN_SALT,
+    )
+
+    return Response(
+        {
+            'success': True,
+            'resource': resource,
+            'count': len(objets),
+            'data': serializer_class(objets, many=True).data,
+            'deleted': [object_id for _, object_id, _ in suppressions],
+            'next': prochain_jeton,
+            'has_more': objets_restants or suppressions_restantes,
+        },
+        status=status.HTTP_200_OK
+    )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SuiviPatientConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.suivi_patient"
+
+    def ready(self):
+        from apps.suivi_patient import signals  # noqa: F401
@@ -0,0 +1,274 @@
+"""
+Detection et fusion des doublons de patients.
+
+Les patients sont regroupes par cles de blocage (nom normalise + annee de
+naissance, codes phonetiques, date de naissance exacte): seules les paires
+d'un meme bloc sont comparees, ce qui rend la detection quasi lineaire au
+lieu de comparer toutes les paires (O(n^2)). Les paires dont le score de
+similarite depasse le seuil alimentent la file de revue DoublonPatient.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from api import audit
+
+
+# Score minimal pour proposer une paire a la revue
+SEUIL_DOUBLON = 0.85
+# Au-dela, un bloc est trop peu selectif (nom tres courant) et est ignore
+TAILLE_MAX_BLOC = 50
+# Poids du score: nom complet, date de naissance, proche
+POIDS_NOM, POIDS_NAISSANCE, POIDS_PROCHE = 0.6, 0.3, 0.1
+
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6',
+}
+
+
+def normaliser(texte):
+    """Minuscules sans accents ni ponctuation, espaces simples."""
+    texte = unicodedata.normalize('NFKD', texte or '')
+    texte = ''.join(c for c in texte if not unicodedata.combining(c)).lower()
+    return ' '.join(re.sub(r'[^a-z]+', ' ', texte).split())
+
+
+def soundex(mot):
+    """Code phonetique Soundex (lettre initiale + 3 chiffres) d'un mot normalise."""
+    if not mot:
+        return ''
+    code = mot[0].upper()
+    precedent = SOUNDEX_CODES.get(mot[0], '')
+    for lettre in mot[1:]:
+        chiffre = SOUNDEX_CODES.get(lettre, '')
+        if chiffre and chiffre != precedent:
+            code += chiffre
+            if len(code) == 4:
+                break
+        # h et w ne separent pas deux consonnes de meme code
+        if lettre not in 'hw':
+            precedent = chiffre
+    return code.ljust(4, '0')
+
+
+def cles_de_blocage(nom, prenom, date_naissance):
+    """
+    Cles de blocage d'un patient.
+
+    Les mots du nom complet sont tries: une inversion nom/prenom donne
+    les memes cles.
+    """
+    mots = sorted(normaliser(f'{nom} {prenom}').split())
+    if not mots:
+        return []
+    annee = date_naissance.year
+    return [
+        f'n:{" ".join(mots)}|{annee}',
+        f'p:{" ".join(sorted(soundex(mot) for mot in mots))}|{annee}',
+        f'd:{date_naissance.isoformat()}|{normaliser(nom)[:1]}',
+    ]
+
+
+def similarite(a, b):
+    """Similarite de deux chaines normalisees (0 a 1)."""
+    if not a or not b:
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def score_naissance(a, b):
+    """1 si identiques, 0.8 si jour/mois inverses ou un seul element differe, sinon 0."""
+    if a == b:
+        return 1.0
+    if a.year == b.year and (a.month, a.day) == (b.day, b.month):
+        return 0.8
+    differences = (a.year != b.year) + (a.month != b.month) + (a.day != b.day)
+    return 0.8 if differences == 1 else 0.0
+
+
+def score_paire(a, b):
+    """
+    Score de similarite de deux patients (0 a 1).
+
+    a et b sont des dictionnaires: nom_complet (normalise, mots tries),
+    date_naissance, nom_proche (normalise), contact_proche.
+    """
+    proche = 1.0 if a['contact_proche'] == b['contact_proche'] else similarite(
+        a['nom_proche'], b['nom_proche']
+    )
+    return (
+        POIDS_NOM * similarite(a['nom_complet'], b['nom_complet'])
+        + POIDS_NAISSANCE * score_naissance(a['date_naissance'], b['date_naissance'])
+        + POIDS_PROCHE * proche
+    )
+
+
+def detecter_doublons(seuil=SEUIL_DOUBLON, taille_max_bloc=TAILLE_MAX_BLOC):
+    """
+    Parcourt tous les patients et ajoute les paires probables a la file de revue.
+
+    Les paires deja presentes dans la file (quel que soit leur statut) ne
+    sont pas reproposees. Retourne les statistiques de l'execution.
+    """
+    from apps.suivi_patient.models import DoublonPatient, Patient
+
+    patients = {}
+    blocs = defaultdict(list)
+    lignes = Patient.objects.order_by('id').values_list(
+        'id', 'matricule', 'nom', 'prenom', 'date_naissance', 'nom_proche', 'contact_proche'
+    )
+    for id_patient, matricule, nom, prenom, naissance, nom_proche, contact_proche in lignes.iterator(
+        chunk_size=2000
+    ):
+        patients[id_patient] = {
+            'matricule': matricule,
+            'nom_complet': ' '.join(sorted(normaliser(f'{nom} {prenom}').split())),
+            'date_naissance': naissance,
+            'nom_proche': normaliser(nom_proche),
+            'contact_proche': contact_proche,
+        }
+        for cle in cles_de_blocage(nom, prenom, naissance):
+            blocs[cle].append(id_patient)
+
+    paires = {}
+    ignores = 0
+    for cle, membres in blocs.items():
+        if len(membres) < 2:
+            continue
+        if len(membres) > taille_max_bloc:
+            ignores += 1
+            continue
+        for paire in combinations(membres, 2):
+            paires.setdefault(paire, cle)
+
+    existantes = set(DoublonPatient.objects.values_list('id_patient_a', 'id_patient_b'))
+    candidats = []
+    for (id_a, id_b), cle in paires.items():
+        if (id_a, id_b) in existantes:
+            continue
+        score = score_paire(patients[id_a], patients[id_b])
+        if score >= seuil:
+            candidats.append(DoublonPatient(
+                id_patient_a_id=id_a,
+                id_patient_b_id=id_b,
+                matricule_a=patients[id_a]['matricule'],
+                matricule_b=patients[id_b]['matricule'],
+                score=round(score, 4),
+                cle_blocage=cle[:150],
+            ))
+    DoublonPatient.objects.bulk_create(candidats, batch_size=1000, ignore_conflicts=True)
+
+    return {
+        'patients': len(patients),
+        'blocs': sum(1 for membres in blocs.values() if len(membres) > 1),
+        'blocs_ignores': ignores,
+        'comparaisons': len(paires),
+        'nouveaux_doublons': len(candidats),
+    }
+
+
+def fusionner_patients(id_doublon, id_conserve, personnel=None):
+    """
+    Fusionne une paire de la file de revue dans le patient conserve.
+
+    Dans une transaction: les sessions et rendez-vous du patient absorbe
+    sont rattaches au patient conserve par un UPDATE chacun, le dossier
+    medical est deplace ou complete, les champs vides du patient conserve
+    sont completes, puis le patient absorbe est supprime.
+    Leve ValueError si la paire n'est plus a examiner ou si id_conserve
+    n'en fait pas partie.
+    """
+    from apps.suivi_patient.models import DossierPatient, DoublonPatient, Patient, RendezVous, Session
+
+    with transaction.atomic():
+        doublon = DoublonPatient.objects.select_for_update().get(pk=id_doublon)
+        if doublon.statut != 'a examiner' or None in (doublon.id_patient_a_id, doublon.id_patient_b_id):
+            raise ValueError('Cette paire a deja ete traitee.')
+        if id_conserve == doublon.id_patient_a_id:
+            id_absorbe = doublon.id_patient_b_id
+        elif id_conserve == doublon.id_patient_b_id:
+            id_absorbe = doublon.id_patient_a_id
+        else:
+            raise ValueError('Le patient conserve doit faire partie de la paire.')
+
+        maintenant = timezone.now()
+        # update() n'emet pas post_save: objets rattaches journalises explicitement
+        ids_sessions = list(Session.objects.filter(id_patient_id=id_absorbe).values_list('id', flat=True))
+        ids_rendez_vous = list(RendezVous.objects.filter(id_patient_id=id_absorbe).values_list('id', flat=True))
+        sessions = Session.objects.filter(id_patient_id=id_absorbe).update(
+            id_patient_id=id_conserve, updated_at=maintenant
+        )
+        rendez_vous = RendezVous.objects.filter(id_patient_id=id_absorbe).update(
+            id_patient_id=id_conserve, updated_at=maintenant
+        )
+        audit.auditer('modification', 'suivi_patient.session', [(pk, id_conserve) for pk in ids_sessions])
+        audit.auditer('modification', 'suivi_patient.rendezvous', [(pk, id_conserve) for pk in ids_rendez_vous])
+
+        dossiers = DossierPatient.objects.in_bulk([id_conserve, id_absorbe])
+        if id_absorbe in dossiers and id_conserve not in dossiers:
+            DossierPatient.objects.filter(pk=id_absorbe).update(id_patient_id=id_conserve)
+            audit.auditer('modification', 'suivi_patient.dossierpatient', [(id_conserve, id_conserve)])
+        elif id_absorbe in dossiers:
+            _completer(dossiers[id_conserve], dossiers[id_absorbe], textes=['allergies', 'antecedents'])
+
+        # Autres paires en attente du patient absorbe: redetectees avec le patient conserve
+        DoublonPatient.objects.filter(
+            Q(id_patient_a_id=id_absorbe) | Q(id_patient_b_id=id_absorbe),
+            statut='a examiner',
+        ).exclude(pk=doublon.pk).delete()
+
+        conserve = Patient.objects.select_for_update().get(pk=id_conserve)
+        absorbe = Patient.objects.get(pk=id_absorbe)
+        # Supprime avant de recopier l'email (unique)
+        absorbe.delete()
+        _completer(conserve, absorbe, champs=['prenom', 'adresse', 'email'])
+
+        doublon.statut = 'fusionne'
+        doublon.date_decision = maintenant
+        doublon.id_personnel = personnel
+        doublon.save(update_fields=['statut', 'date_decision', 'id_personnel'])
+
+    return {
+        'id_patient': id_conserve,
+        'patient_supprime': id_absorbe,
+        'sessions_rattachees': sessions,
+        'rendez_vous_rattaches': rendez_vous,
+    }
+
+
+def _completer(cible, source, champs=None, textes=()):
+    """
+    Copie dans cible les champs vides renseignes dans source; les champs
+    `textes` renseignes des deux cotes sont concatenes.
+    """
+    champs = champs or [
+        f.name for f in cible._meta.concrete_fields if not f.primary_key
+    ]
+    modifies = []
+    for champ in champs:
+        valeur_cible, valeur_source = getattr(cible, champ), getattr(source, champ)
+        if valeur_source in (None, ''):
+            continue
+        if valeur_cible in (None, ''):
+            setattr(cible, champ, valeur_source)
+            modifies.append(champ)
+        elif champ in textes and valeur_source != valeur_cible:
+            setattr(cible, champ, f'{valeur_cible}\n{valeur_source}')
+            modifies.append(champ)
+    if modifies:
+        cible.save(update_fields=modifies)
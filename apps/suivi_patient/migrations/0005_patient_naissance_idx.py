@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("suivi_patient", "0004_sync_updated_at_and_tombstone"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="patient",
+            index=models.Index(
+                fields=["date_naissance"], name="patient_naissance_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def renseigner_service(apps, schema_editor):
+    """
+    Relie chaque session au service dont le nom correspond a service_courant.
+
+    La correspondance est insensible a la casse; un service est cree pour
+    chaque nom sans correspondance afin de ne perdre aucune file d'attente.
+    updated_at est mis a jour pour que les clients de synchronisation
+    recoivent le nouveau champ.
+    """
+    Session = apps.get_model("suivi_patient", "Session")
+    Service = apps.get_model("gestion_hospitaliere", "Service")
+    maintenant = timezone.now()
+
+    services = {service.nom_service.lower(): service.id for service in Service.objects.all()}
+    noms = Session.objects.order_by().values_list("service_courant", flat=True).distinct()
+    for nom in list(noms):
+        cle = nom.strip().lower()
+        if cle not in services:
+            services[cle] = Service.objects.create(nom_service=nom.strip()).id
+        Session.objects.filter(service_courant=nom).update(
+            service_id=services[cle], updated_at=maintenant
+        )
+
+
+class Migration(migrations.Migration):
+    # Les modifications de schema suivent dans 0007 (transaction distincte:
+    # PostgreSQL refuse ALTER TABLE apres des mises a jour de cles etrangeres
+    # dont les contraintes sont differees). Le retour arriere de
+    # service_courant est fait dans 0007.
+    dependencies = [
+        ("gestion_hospitaliere", "0004_service_nom_upper_idx"),
+        ("suivi_patient", "0005_patient_naissance_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="session",
+            name="service",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="sessions",
+                to="gestion_hospitaliere.service",
+            ),
+        ),
+        migrations.RunPython(renseigner_service, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def renseigner_service_courant(apps, schema_editor):
+    """Recopie le nom du service dans service_courant (retour arriere)."""
+    Session = apps.get_model("suivi_patient", "Session")
+    Service = apps.get_model("gestion_hospitaliere", "Service")
+    for service_id, nom in Service.objects.values_list("id", "nom_service"):
+        Session.objects.filter(service_id=service_id).update(service_courant=nom)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("suivi_patient", "0006_session_service"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="session",
+            name="service",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="sessions",
+                to="gestion_hospitaliere.service",
+            ),
+        ),
+        # Colonne rendue nullable puis supprimee: en retour arriere elle est
+        # recreee vide, remplie depuis le service, puis redevient obligatoire
+        migrations.AlterField(
+            model_name="session",
+            name="service_courant",
+            field=models.CharField(max_length=100, null=True),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, renseigner_service_courant),
+        migrations.RemoveField(
+            model_name="session",
+            name="service_courant",
+        ),
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(
+                fields=["service", "personnel_responsable", "situation_patient"],
+                name="session_file_attente_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("suivi_patient", "0007_session_service_requis"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SigneVital",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "type_mesure",
+                    models.CharField(
+                        choices=[
+                            ("temperature", "Temperature"),
+                            ("tension_systolique", "Tension arterielle systolique"),
+                            ("tension_diastolique", "Tension arterielle diastolique"),
+                            ("frequence_cardiaque", "Frequence cardiaque"),
+                            ("frequence_respiratoire", "Frequence respiratoire"),
+                            ("saturation_o2", "Saturation en oxygene"),
+                            ("glycemie", "Glycemie"),
+                            ("douleur", "Echelle de douleur"),
+                            ("poids", "Poids"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("valeur", models.FloatField()),
+                (
+                    "date_heure",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "id_personnel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="signes_vitaux",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "id_session",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="signes_vitaux",
+                        to="suivi_patient.session",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Signe Vital",
+                "verbose_name_plural": "Signes Vitaux",
+                "ordering": ["date_heure"],
+                "indexes": [
+                    models.Index(
+                        fields=["id_session", "type_mesure", "date_heure"],
+                        name="signe_vital_serie_idx",
+                    )
+                ],
+            },
+        ),
+    ]
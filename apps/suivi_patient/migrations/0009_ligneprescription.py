@@ -0,0 +1,90 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:10
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comptabilite_matiere", "0003_livraison_sortie"),
+        ("suivi_patient", "0008_signevital"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LignePrescription",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "quantite",
+                    models.PositiveIntegerField(
+                        validators=[django.core.validators.MinValueValidator(1)]
+                    ),
+                ),
+                ("posologie", models.CharField(blank=True, max_length=255)),
+                (
+                    "statut",
+                    models.CharField(
+                        choices=[
+                            ("en attente", "En attente"),
+                            ("dispensee", "Dispensee"),
+                            ("annulee", "Annulee"),
+                        ],
+                        default="en attente",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "date_dispensation",
+                    models.DateTimeField(blank=True, null=True),
+                ),
+                (
+                    "id_materiel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="lignes_prescription",
+                        to="comptabilite_matiere.materielmedical",
+                    ),
+                ),
+                (
+                    "id_prescription",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lignes",
+                        to="suivi_patient.prescriptionmedicament",
+                    ),
+                ),
+                (
+                    "id_sortie",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="lignes_prescription",
+                        to="comptabilite_matiere.sortie",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ligne de Prescription",
+                "verbose_name_plural": "Lignes de Prescription",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("statut", "en attente")),
+                        fields=["id_materiel", "quantite"],
+                        name="ligne_presc_attente_idx",
+                    )
+                ],
+            },
+        ),
+    ]
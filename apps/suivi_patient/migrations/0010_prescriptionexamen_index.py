@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("suivi_patient", "0009_ligneprescription"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="prescriptionexamen",
+            index=models.Index(
+                fields=["date_heure", "id"], name="presc_examen_age_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="prescriptionexamen",
+            index=models.Index(
+                fields=["nom_examen", "date_heure"], name="presc_examen_nom_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comptabilite_financiere", "0001_initial"),
+        ("suivi_patient", "0010_prescriptionexamen_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FraisHospitalisation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("jour", models.DateField()),
+                ("montant", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("date_creation", models.DateTimeField(auto_now_add=True)),
+                (
+                    "id_hospitalisation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="frais",
+                        to="suivi_patient.hospitalisation",
+                    ),
+                ),
+                (
+                    "id_quittance",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="frais_hospitalisation",
+                        to="comptabilite_financiere.quittance",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Frais Hospitalisation",
+                "verbose_name_plural": "Frais Hospitalisations",
+                "ordering": ["id_hospitalisation", "jour"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="fraishospitalisation",
+            constraint=models.UniqueConstraint(
+                fields=("id_hospitalisation", "jour"),
+                name="frais_hospitalisation_jour_unique",
+            ),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("suivi_patient", "0011_fraishospitalisation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DoublonPatient",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("matricule_a", models.CharField(max_length=10)),
+                ("matricule_b", models.CharField(max_length=10)),
+                ("score", models.FloatField()),
+                ("cle_blocage", models.CharField(max_length=150)),
+                (
+                    "statut",
+                    models.CharField(
+                        choices=[
+                            ("a examiner", "A examiner"),
+                            ("fusionne", "Fusionne"),
+                            ("rejete", "Rejete"),
+                        ],
+                        default="a examiner",
+                        max_length=20,
+                    ),
+                ),
+                ("date_detection", models.DateTimeField(auto_now_add=True)),
+                ("date_decision", models.DateTimeField(blank=True, null=True)),
+                (
+                    "id_patient_a",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="doublons_a",
+                        to="suivi_patient.patient",
+                    ),
+                ),
+                (
+                    "id_patient_b",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="doublons_b",
+                        to="suivi_patient.patient",
+                    ),
+                ),
+                (
+                    "id_personnel",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="doublons_traites",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Doublon Patient",
+                "verbose_name_plural": "Doublons Patients",
+                "ordering": ["-score", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["statut", "-score"], name="doublon_patient_revue_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="doublonpatient",
+            constraint=models.UniqueConstraint(
+                fields=("id_patient_a", "id_patient_b"),
+                name="doublon_patient_paire_unique",
+            ),
+        ),
+    ]
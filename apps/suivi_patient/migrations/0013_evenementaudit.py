@@ -0,0 +1,104 @@
+# Generated by Django 4.2.7 on 2026-10-19 20:12
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+TABLE = "suivi_patient_evenementaudit"
+MOIS_CREES = 3
+
+
+def creer_table(apps, schema_editor):
+    """
+    PostgreSQL: table partitionnee par mois sur horodatage (la cle primaire
+    inclut la cle de partition), partition par defaut et partitions du mois
+    courant et des suivants. Autres bases: table ordinaire.
+    """
+    EvenementAudit = apps.get_model("suivi_patient", "EvenementAudit")
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.create_model(EvenementAudit)
+        return
+
+    schema_editor.execute(
+        f"""
+        CREATE TABLE {TABLE} (
+            id bigserial NOT NULL,
+            horodatage timestamp with time zone NOT NULL,
+            id_personnel bigint NULL,
+            action varchar(20) NOT NULL,
+            modele varchar(50) NOT NULL,
+            objet_id varchar(64) NOT NULL,
+            id_patient bigint NULL,
+            PRIMARY KEY (id, horodatage)
+        ) PARTITION BY RANGE (horodatage)
+        """
+    )
+    schema_editor.execute(f"CREATE INDEX audit_patient_idx ON {TABLE} (id_patient, horodatage)")
+    schema_editor.execute(f"CREATE INDEX audit_personnel_idx ON {TABLE} (id_personnel, horodatage)")
+    schema_editor.execute(f"CREATE TABLE {TABLE}_defaut PARTITION OF {TABLE} DEFAULT")
+
+    debut = timezone.now().date().replace(day=1)
+    for _ in range(MOIS_CREES):
+        fin = (debut.replace(day=28) + timedelta(days=4)).replace(day=1)
+        schema_editor.execute(
+            f"CREATE TABLE {TABLE}_p{debut:%Y%m} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{debut.isoformat()}') TO ('{fin.isoformat()}')"
+        )
+        debut = fin
+
+
+def supprimer_table(apps, schema_editor):
+    """Supprime la table (et ses partitions)."""
+    schema_editor.delete_model(apps.get_model("suivi_patient", "EvenementAudit"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("suivi_patient", "0012_doublonpatient"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="EvenementAudit",
+                    fields=[
+                        ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                        ("horodatage", models.DateTimeField()),
+                        ("id_personnel", models.BigIntegerField(blank=True, null=True)),
+                        (
+                            "action",
+                            models.CharField(
+                                choices=[
+                                    ("consultation", "Consultation"),
+                                    ("creation", "Creation"),
+                                    ("modification", "Modification"),
+                                    ("suppression", "Suppression"),
+                                ],
+                                max_length=20,
+                            ),
+                        ),
+                        ("modele", models.CharField(max_length=50)),
+                        ("objet_id", models.CharField(max_length=64)),
+                        ("id_patient", models.BigIntegerField(blank=True, null=True)),
+                    ],
+                    options={
+                        "verbose_name": "Evenement d'audit",
+                        "verbose_name_plural": "Evenements d'audit",
+                        "ordering": ["-horodatage", "-id"],
+                        "indexes": [
+                            models.Index(
+                                fields=["id_patient", "horodatage"], name="audit_patient_idx"
+                            ),
+                            models.Index(
+                                fields=["id_personnel", "horodatage"], name="audit_personnel_idx"
+                            ),
+                        ],
+                    },
+                ),
+            ],
+        ),
+        migrations.RunPython(creer_table, supprimer_table),
+    ]
@@ -10,20 +10,32 @@ from .patient import Patient
 from .session import Session
 from .observation_medicale import ObservationMedicale
 from .prescription_medicament import PrescriptionMedicament
+from .ligne_prescription import LignePrescription
 from .prescription_examen import PrescriptionExamen
 from .resultat_examen import ResultatExamen
 from .hospitalisation import Hospitalisation
+from .frais_hospitalisation import FraisHospitalisation
 from .rendez_vous import RendezVous
 from .dossier_patient import DossierPatient
+from .doublon_patient import DoublonPatient
+from .sync import SyncTombstone
+from .signe_vital import SigneVital
+from .audit import EvenementAudit
 
 __all__ = [
     'Patient',
     'Session',
     'ObservationMedicale',
     'PrescriptionMedicament',
+    'LignePrescription',
     'PrescriptionExamen',
     'ResultatExamen',
     'Hospitalisation',
+    'FraisHospitalisation',
     'RendezVous',
     'DossierPatient',
+    'DoublonPatient',
+    'SyncTombstone',
+    'SigneVital',
+    'EvenementAudit',
 ]
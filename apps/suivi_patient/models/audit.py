@@ -0,0 +1,88 @@
+"""
+Modele EvenementAudit pour l'application suivi_patient.
+
+Journal d'audit medical en ajout seul: qui a consulte, cree, modifie ou
+supprime quel objet du dossier patient, et quand. Les evenements sont
+ecrits par lots (voir api.audit), jamais modifies ni supprimes un a un.
+Sur PostgreSQL, la table est partitionnee par mois sur horodatage
+(migration 0013, tache creer_partitions_audit).
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from django.db import models
+
+
+# Chemin de chaque modele audite vers le patient concerne
+CHEMINS_PATIENT = {
+    'suivi_patient.patient': 'id',
+    'suivi_patient.session': 'id_patient',
+    'suivi_patient.rendezvous': 'id_patient',
+    'suivi_patient.dossierpatient': 'id_patient',
+    'suivi_patient.observationmedicale': 'id_session__id_patient',
+    'suivi_patient.prescriptionmedicament': 'id_session__id_patient',
+    'suivi_patient.prescriptionexamen': 'id_session__id_patient',
+    'suivi_patient.hospitalisation': 'id_session__id_patient',
+    'suivi_patient.signevital': 'id_session__id_patient',
+    'suivi_patient.ligneprescription': 'id_prescription__id_session__id_patient',
+    'suivi_patient.resultatexamen': 'id_prescription__id_session__id_patient',
+}
+
+
+class JournalAjoutSeulError(Exception):
+    """Modification ou suppression d'un evenement du journal d'audit."""
+
+
+class EvenementAuditQuerySet(models.QuerySet):
+    """QuerySet du journal: ni update() ni delete()."""
+
+    def update(self, **kwargs):
+        raise JournalAjoutSeulError('Le journal d\'audit est en ajout seul.')
+
+    def delete(self):
+        raise JournalAjoutSeulError('Le journal d\'audit est en ajout seul.')
+
+
+class EvenementAudit(models.Model):
+    """Modele pour un evenement du journal d'audit medical."""
+
+    ACTION_CHOICES = [
+        ('consultation', 'Consultation'),
+        ('creation', 'Creation'),
+        ('modification', 'Modification'),
+        ('suppression', 'Suppression'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    horodatage = models.DateTimeField()
+    # Identifiants sans cle etrangere: le journal survit aux suppressions
+    id_personnel = models.BigIntegerField(null=True, blank=True)
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    modele = models.CharField(max_length=50)
+    objet_id = models.CharField(max_length=64)
+    id_patient = models.BigIntegerField(null=True, blank=True)
+
+    objects = EvenementAuditQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-horodatage', '-id']
+        verbose_name = 'Evenement d\'audit'
+        verbose_name_plural = 'Evenements d\'audit'
+        indexes = [
+            models.Index(fields=['id_patient', 'horodatage'], name='audit_patient_idx'),
+            models.Index(fields=['id_personnel', 'horodatage'], name='audit_personnel_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.modele} #{self.objet_id} par {self.id_personnel} ({self.horodatage})"
+
+    def save(self, *args, **kwargs):
+        """Seule l'insertion est autorisee."""
+        if not self._state.adding:
+            raise JournalAjoutSeulError('Le journal d\'audit est en ajout seul.')
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise JournalAjoutSeulError('Le journal d\'audit est en ajout seul.')
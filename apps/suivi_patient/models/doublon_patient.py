@@ -0,0 +1,74 @@
+"""
+Modele DoublonPatient pour l'application suivi_patient.
+
+File de revue des paires de patients probablement identiques, alimentee
+par la detection par cles de blocage (voir apps.suivi_patient.doublons).
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from django.conf import settings
+from django.db import models
+from .patient import Patient
+
+
+class DoublonPatient(models.Model):
+    """Modele pour une paire de patients candidats a la fusion."""
+
+    STATUT_CHOICES = [
+        ('a examiner', 'A examiner'),
+        ('fusionne', 'Fusionne'),
+        ('rejete', 'Rejete'),
+    ]
+
+    # SET_NULL: la paire reste lisible (matricules) apres la fusion
+    id_patient_a = models.ForeignKey(
+        Patient,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='doublons_a'
+    )
+    id_patient_b = models.ForeignKey(
+        Patient,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='doublons_b'
+    )
+    matricule_a = models.CharField(max_length=10)
+    matricule_b = models.CharField(max_length=10)
+    score = models.FloatField()
+    cle_blocage = models.CharField(max_length=150)
+    statut = models.CharField(
+        max_length=20,
+        choices=STATUT_CHOICES,
+        default='a examiner'
+    )
+    date_detection = models.DateTimeField(auto_now_add=True)
+    date_decision = models.DateTimeField(null=True, blank=True)
+    id_personnel = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='doublons_traites'
+    )
+
+    class Meta:
+        ordering = ['-score', 'id']
+        verbose_name = 'Doublon Patient'
+        verbose_name_plural = 'Doublons Patients'
+        constraints = [
+            # Une paire n'est proposee qu'une fois, meme apres un rejet
+            models.UniqueConstraint(
+                fields=['id_patient_a', 'id_patient_b'],
+                name='doublon_patient_paire_unique',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['statut', '-score'], name='doublon_patient_revue_idx'),
+        ]
+
+    def __str__(self):
+        return f"Doublon {self.matricule_a} / {self.matricule_b} ({self.score:.2f})"
@@ -0,0 +1,48 @@
+"""
+Modele FraisHospitalisation pour l'application suivi_patient.
+
+Une ligne par hospitalisation et par jour d'occupation d'un lit, au tarif
+journalier de la chambre, prete a etre reglee par une Quittance.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from django.db import models
+from .hospitalisation import Hospitalisation
+
+
+class FraisHospitalisation(models.Model):
+    """Modele pour une ligne de frais journaliers d'hospitalisation."""
+
+    id_hospitalisation = models.ForeignKey(
+        Hospitalisation,
+        on_delete=models.CASCADE,
+        related_name='frais'
+    )
+    jour = models.DateField()
+    montant = models.DecimalField(max_digits=10, decimal_places=2)
+    id_quittance = models.ForeignKey(
+        'comptabilite_financiere.Quittance',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='frais_hospitalisation'
+    )
+    date_creation = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id_hospitalisation', 'jour']
+        verbose_name = 'Frais Hospitalisation'
+        verbose_name_plural = 'Frais Hospitalisations'
+        constraints = [
+            # Une seule ligne par jour: relancer la generation ne facture pas deux fois
+            models.UniqueConstraint(
+                fields=['id_hospitalisation', 'jour'],
+                name='frais_hospitalisation_jour_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Frais {self.jour} - Hospitalisation {self.id_hospitalisation_id}: {self.montant}"
@@ -7,11 +7,71 @@ Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
 Date: 2025-12-14
 """
 from django.db import models
+from django.db.models import DecimalField, ExpressionWrapper, F, Func, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from apps.gestion_hospitaliere.models import Medecin, Chambre
 from .session import Session
 
 
+class JoursEntre(Func):
+    """Nombre de jours entre deux dates (fin - debut), calcule en SQL."""
+
+    arg_joiner = ' - '
+    template = '(%(expressions)s)'
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template='CAST(JULIANDAY(%(expressions)s) AS INTEGER)',
+            arg_joiner=') - JULIANDAY(',
+            **extra_context
+        )
+
+
+class HospitalisationQuerySet(models.QuerySet):
+    """QuerySet des hospitalisations avec calcul des frais en SQL."""
+
+    def avec_frais(self, jour=None):
+        """
+        Annote les frais courus jusqu'au jour donne (par defaut: aujourd'hui).
+
+        Tout jour commence est facture, jour d'entree compris:
+        - jours: (jour - date d'entree) + 1
+        - tarif_journalier: tarif de la chambre
+        - montant_du: jours x tarif_journalier
+        - montant_genere: somme des lignes FraisHospitalisation deja generees
+        """
+        from .frais_hospitalisation import FraisHospitalisation
+
+        jour = jour or timezone.localdate()
+        montant = DecimalField(max_digits=12, decimal_places=2)
+        lignes = (
+            FraisHospitalisation.objects.filter(id_hospitalisation=OuterRef('pk'))
+            .order_by()
+            .values('id_hospitalisation')
+            .annotate(total=Sum('montant'))
+            .values('total')
+        )
+        return self.annotate(
+            jours=JoursEntre(Value(jour, output_field=models.DateField()), TruncDate('debut')) + 1,
+            tarif_journalier=F('id_chambre__tarif_journalier'),
+        ).annotate(
+            montant_du=ExpressionWrapper(F('jours') * F('tarif_journalier'), output_field=montant),
+            montant_genere=Coalesce(Subquery(lignes, output_field=montant), Value(0), output_field=montant),
+        )
+
+    def occupant_le(self, jour):
+        """Hospitalisations ayant occupe un lit a un moment du jour donne."""
+        return self.filter(
+            Q(fin__isnull=True) | Q(fin__date__gte=jour),
+            debut__date__lte=jour,
+        )
+
+
 class Hospitalisation(models.Model):
     """Modele pour les hospitalisations."""
 
@@ -43,6 +103,8 @@ class Hospitalisation(models.Model):
         related_name='hospitalisations'
     )
 
+    objects = HospitalisationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-debut']
         verbose_name = 'Hospitalisation'
@@ -0,0 +1,157 @@
+"""
+Modele LignePrescription pour l'application suivi_patient.
+
+Une ligne par medicament prescrit, reliee au stock de la pharmacie
+(MaterielMedical), avec quantite et posologie.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from collections import Counter
+
+from django.core.validators import MinValueValidator
+from django.db import models, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+from .prescription_medicament import PrescriptionMedicament
+
+
+class StockInsuffisant(Exception):
+    """Le stock ne couvre pas toutes les lignes d'une prescription."""
+
+    def __init__(self, manques):
+        super().__init__('Stock insuffisant')
+        # [{'id_materiel', 'nom', 'quantite_demandee', 'quantite_stock'}]
+        self.manques = manques
+
+
+class LignePrescriptionQuerySet(models.QuerySet):
+    """QuerySet des lignes de prescription."""
+
+    def en_attente(self):
+        """Lignes non encore dispensees (index partiel ligne_presc_attente_idx)."""
+        return self.filter(statut='en attente')
+
+    def dispenser(self, id_prescription, id_personnel):
+        """
+        Dispense toutes les lignes en attente d'une prescription.
+
+        Dans une transaction: verrouille les lignes, decremente le stock de
+        chaque medicament par un seul UPDATE conditionnel (stock >= quantite),
+        cree la Sortie (motif VENTE) et marque les lignes dispensees.
+        Leve StockInsuffisant (rien n'est modifie) si un medicament manque.
+        Retourne (sortie, nombre de lignes), ou None si aucune ligne n'est
+        en attente.
+        """
+        from apps.comptabilite_matiere.models import Materiel, MaterielMedical, Sortie
+
+        with transaction.atomic():
+            lignes = list(
+                self.select_for_update()
+                .en_attente()
+                .filter(id_prescription_id=id_prescription)
+                .values_list('id', 'id_materiel_id', 'quantite')
+            )
+            if not lignes:
+                return None
+
+            quantites = Counter()
+            for _, id_materiel, quantite in lignes:
+                quantites[id_materiel] += quantite
+
+            maintenant = timezone.now()
+            disponibles = Q()
+            for id_materiel, quantite in quantites.items():
+                disponibles |= Q(pk=id_materiel, quantite_stock__gte=quantite)
+            modifies = Materiel.objects.filter(disponibles).update(
+                quantite_stock=Case(
+                    *[
+                        When(pk=id_materiel, then=F('quantite_stock') - Value(quantite))
+                        for id_materiel, quantite in quantites.items()
+                    ],
+                    default=F('quantite_stock'),
+                ),
+                date_derniere_modification=maintenant,
+            )
+            if modifies != len(quantites):
+                manques = [
+                    {
+                        'id_materiel': materiel.pk,
+                        'nom': materiel.nom_Materiel,
+                        'quantite_demandee': quantites[materiel.pk],
+                        'quantite_stock': materiel.quantite_stock,
+                    }
+                    for materiel in MaterielMedical.objects.filter(pk__in=quantites)
+                    if materiel.quantite_stock < quantites[materiel.pk]
+                ]
+                transaction.set_rollback(True)
+                raise StockInsuffisant(manques)
+
+            sortie = Sortie.objects.create(
+                numero_sortie=f'VENTE-P{id_prescription}-{maintenant:%Y%m%d%H%M%S%f}',
+                date_sortie=maintenant,
+                motif_sortie=Sortie.MotifSortieChoices.VENTE,
+                idPersonnel_id=id_personnel,
+            )
+            self.filter(id__in=[id_ligne for id_ligne, _, _ in lignes]).update(
+                statut='dispensee',
+                id_sortie=sortie,
+                date_dispensation=maintenant,
+            )
+            return sortie, len(lignes)
+
+
+class LignePrescription(models.Model):
+    """Modele pour une ligne de prescription de medicament."""
+
+    STATUT_CHOICES = [
+        ('en attente', 'En attente'),
+        ('dispensee', 'Dispensee'),
+        ('annulee', 'Annulee'),
+    ]
+
+    id_prescription = models.ForeignKey(
+        PrescriptionMedicament,
+        on_delete=models.CASCADE,
+        related_name='lignes'
+    )
+    id_materiel = models.ForeignKey(
+        'comptabilite_matiere.MaterielMedical',
+        on_delete=models.PROTECT,
+        related_name='lignes_prescription'
+    )
+    quantite = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+    posologie = models.CharField(max_length=255, blank=True)
+    statut = models.CharField(
+        max_length=20,
+        choices=STATUT_CHOICES,
+        default='en attente'
+    )
+    id_sortie = models.ForeignKey(
+        'comptabilite_matiere.Sortie',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='lignes_prescription'
+    )
+    date_dispensation = models.DateTimeField(null=True, blank=True)
+
+    objects = LignePrescriptionQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Ligne de Prescription'
+        verbose_name_plural = 'Lignes de Prescription'
+        indexes = [
+            # Liste de travail et demande de la pharmacie: lignes en attente seulement
+            models.Index(
+                fields=['id_materiel', 'quantite'],
+                name='ligne_presc_attente_idx',
+                condition=Q(statut='en attente'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Ligne {self.id} - Prescription {self.id_prescription_id} ({self.quantite})"
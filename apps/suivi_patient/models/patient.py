@@ -6,13 +6,94 @@ Email: dedjomokarlyn@gmail.com
 Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
 Date: 2025-12-14
 """
+from datetime import date
+
 from django.db import models
 from django.core.validators import RegexValidator, EmailValidator
 from django.utils import timezone
 from django.conf import settings
+from django.db.models.functions import ExtractYear
+from .sync import SyncTrackedModel
+
+
+# Age maximal accepte par les filtres age_min et age_max
+AGE_MAX = 150
+
+# Tranches d'age des rapports de la direction: (libelle, age min, age max inclus)
+TRANCHES_AGE = [
+    ('0-4', 0, 4),
+    ('5-14', 5, 14),
+    ('15-24', 15, 24),
+    ('25-44', 25, 44),
+    ('45-64', 45, 64),
+    ('65+', 65, None),
+]
+
+
+def date_naissance_limite(age, today=None):
+    """
+    Retourne la date de naissance la plus recente donnant au moins `age` ans.
+
+    age >= n  <=>  date_naissance <= date_naissance_limite(n)
+    Le 29 fevrier est ramene au 28 pour les annees non bissextiles; une
+    annee anterieure a l'an 1 donne date.min.
+    """
+    today = today or timezone.now().date()
+    annee = today.year - age
+    if annee < date.min.year:
+        return date.min
+    try:
+        return today.replace(year=annee)
+    except ValueError:
+        return today.replace(year=annee, day=28)
+
+
+def age_expression(champ='date_naissance', today=None):
+    """
+    Expression SQL calculant l'age en annees revolues a partir de `champ`.
 
+    Equivalent SQL de: annee courante - annee de naissance, moins 1 si
+    l'anniversaire n'est pas encore passe cette annee.
+    """
+    today = today or timezone.now().date()
+    anniversaire_a_venir = (
+        models.Q(**{f'{champ}__month__gt': today.month})
+        | models.Q(**{f'{champ}__month': today.month, f'{champ}__day__gt': today.day})
+    )
+    return models.ExpressionWrapper(
+        models.Value(today.year)
+        - ExtractYear(champ)
+        - models.Case(
+            models.When(anniversaire_a_venir, then=models.Value(1)),
+            default=models.Value(0),
+        ),
+        output_field=models.IntegerField(),
+    )
+
+
+class PatientQuerySet(models.QuerySet):
+    """QuerySet des patients avec calculs d'age cote base de donnees."""
+
+    def avec_age(self, today=None):
+        """Annote chaque patient avec son age (champ `age`)."""
+        return self.annotate(age=age_expression('date_naissance', today))
 
-class Patient(models.Model):
+    def age_entre(self, age_min=None, age_max=None, today=None):
+        """
+        Filtre les patients par tranche d'age (bornes incluses).
+
+        Le filtre porte sur date_naissance afin d'utiliser son index.
+        """
+        today = today or timezone.now().date()
+        queryset = self
+        if age_min is not None:
+            queryset = queryset.filter(date_naissance__lte=date_naissance_limite(age_min, today))
+        if age_max is not None:
+            queryset = queryset.filter(date_naissance__gt=date_naissance_limite(age_max + 1, today))
+        return queryset
+
+
+class Patient(SyncTrackedModel):
     """Modele pour les patients."""
 
     phone_validator = RegexValidator(
@@ -36,10 +117,16 @@ class Patient(models.Model):
         related_name='patients_enregistres'
     )
 
+    objects = PatientQuerySet.as_manager()
+
     class Meta:
         ordering = ['-date_inscription']
         verbose_name = 'Patient'
         verbose_name_plural = 'Patients'
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='patient_sync_idx'),
+            models.Index(fields=['date_naissance'], name='patient_naissance_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         """Genere automatiquement le matricule."""
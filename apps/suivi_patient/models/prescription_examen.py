@@ -7,10 +7,25 @@ Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
 Date: 2025-12-14
 """
 from django.db import models
+from django.db.models import Exists, OuterRef
 from apps.gestion_hospitaliere.models import Medecin
 from .session import Session
 
 
+class PrescriptionExamenQuerySet(models.QuerySet):
+    """QuerySet des prescriptions d'examens."""
+
+    def sans_resultat(self):
+        """
+        Prescriptions sans aucun resultat (NOT EXISTS sur l'index de
+        ResultatExamen.id_prescription).
+        """
+        from .resultat_examen import ResultatExamen
+        return self.filter(
+            ~Exists(ResultatExamen.objects.filter(id_prescription=OuterRef('pk')))
+        )
+
+
 class PrescriptionExamen(models.Model):
     """Modele pour les prescriptions d'examens."""
 
@@ -27,10 +42,17 @@ class PrescriptionExamen(models.Model):
     )
     date_heure = models.DateTimeField(auto_now_add=True)
 
+    objects = PrescriptionExamenQuerySet.as_manager()
+
     class Meta:
         ordering = ['-date_heure']
         verbose_name = 'Prescription Examen'
         verbose_name_plural = 'Prescriptions Examens'
+        indexes = [
+            # Liste de travail du laboratoire: plus anciennes d'abord, par examen
+            models.Index(fields=['date_heure', 'id'], name='presc_examen_age_idx'),
+            models.Index(fields=['nom_examen', 'date_heure'], name='presc_examen_nom_idx'),
+        ]
 
     def __str__(self):
         return f"Prescription Examen {self.id} - {self.nom_examen}"
@@ -9,9 +9,10 @@ Date: 2025-12-14
 from django.db import models
 from apps.gestion_hospitaliere.models import Medecin
 from .patient import Patient
+from .sync import SyncTrackedModel
 
 
-class RendezVous(models.Model):
+class RendezVous(SyncTrackedModel):
     """Modele pour les rendez-vous."""
 
     STATUT_CHOICES = [
@@ -41,6 +42,9 @@ class RendezVous(models.Model):
         ordering = ['date_heure']
         verbose_name = 'Rendez-vous'
         verbose_name_plural = 'Rendez-vous'
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='rendezvous_sync_idx'),
+        ]
 
     def __str__(self):
         return f"RDV {self.id} - {self.id_patient.matricule} avec Dr. {self.id_medecin.nom}"
@@ -8,10 +8,35 @@ Date: 2025-12-14
 """
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from .patient import Patient
+from .sync import SyncTrackedModel
 
 
-class Session(models.Model):
+class SessionQuerySet(models.QuerySet):
+    """QuerySet des sessions avec les transitions atomiques."""
+
+    def selectionner(self, id_session):
+        """
+        Prend en charge un patient en attente (situation_patient -> 'recu').
+
+        Une seule requete UPDATE ... WHERE situation_patient = 'en attente':
+        parmi plusieurs appels concurrents sur la meme session, un seul
+        modifie la ligne. Retourne True si cet appel a obtenu le patient.
+        """
+        from api import audit
+
+        selectionne = self.filter(id=id_session, situation_patient='en attente').update(
+            situation_patient='recu',
+            updated_at=timezone.now(),
+        ) == 1
+        if selectionne:
+            # update() n'emet pas post_save: journalisation explicite
+            audit.auditer('modification', self.model._meta.label_lower, [(id_session, None)], self.db)
+        return selectionne
+
+
+class Session(SyncTrackedModel):
     """Modele pour les sessions de suivi patient."""
 
     STATUT_CHOICES = [
@@ -37,7 +62,11 @@ class Session(models.Model):
         on_delete=models.PROTECT,
         related_name='sessions_ouvertes'
     )
-    service_courant = models.CharField(max_length=100)
+    service = models.ForeignKey(
+        'gestion_hospitaliere.Service',
+        on_delete=models.PROTECT,
+        related_name='sessions'
+    )
     personnel_responsable = models.CharField(max_length=20)
     statut = models.CharField(
         max_length=20,
@@ -50,10 +79,20 @@ class Session(models.Model):
         default='en attente'
     )
 
+    objects = SessionQuerySet.as_manager()
+
     class Meta:
         ordering = ['-debut']
         verbose_name = 'Session'
         verbose_name_plural = 'Sessions'
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='session_sync_idx'),
+            # Files d'attente: service + poste + situation
+            models.Index(
+                fields=['service', 'personnel_responsable', 'situation_patient'],
+                name='session_file_attente_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Session {self.id} - {self.id_patient.matricule} ({self.statut})"
@@ -0,0 +1,139 @@
+"""
+Modele SigneVital pour l'application suivi_patient.
+
+Une ligne par mesure (session, type, horodatage, valeur numerique), pour
+tracer les courbes de constantes sans analyser le texte des observations.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from django.db import models
+from django.db.models import Avg, Count, F, Max, Min, Window
+from django.db.models.functions import RowNumber, TruncDay, TruncHour, TruncMinute
+from django.conf import settings
+from django.utils import timezone
+from .session import Session
+
+
+# type: (libelle, unite, valeur minimale plausible, valeur maximale plausible)
+TYPES_SIGNES_VITAUX = {
+    'temperature': ('Temperature', '°C', 25, 45),
+    'tension_systolique': ('Tension arterielle systolique', 'mmHg', 40, 300),
+    'tension_diastolique': ('Tension arterielle diastolique', 'mmHg', 20, 200),
+    'frequence_cardiaque': ('Frequence cardiaque', 'bpm', 20, 300),
+    'frequence_respiratoire': ('Frequence respiratoire', '/min', 4, 80),
+    'saturation_o2': ('Saturation en oxygene', '%', 40, 100),
+    'glycemie': ('Glycemie', 'g/L', 0.1, 10),
+    'douleur': ('Echelle de douleur', '/10', 0, 10),
+    'poids': ('Poids', 'kg', 0.3, 400),
+}
+
+# resolution: (fonction de troncature, duree d'un intervalle en secondes)
+RESOLUTIONS = {
+    'minute': (TruncMinute, 60),
+    'heure': (TruncHour, 3600),
+    'jour': (TruncDay, 86400),
+}
+
+# Nombre de points par serie vise par la resolution automatique
+POINTS_PAR_SERIE = 500
+
+
+class SigneVitalQuerySet(models.QuerySet):
+    """QuerySet des signes vitaux avec sous-echantillonnage cote base."""
+
+    def resolution_auto(self):
+        """
+        Choisit la resolution la plus fine donnant au plus POINTS_PAR_SERIE
+        points par serie: 'brut' si les mesures sont peu nombreuses, sinon
+        minute, heure ou jour selon l'etendue de la periode.
+        """
+        bornes = self.aggregate(
+            debut=Min('date_heure'),
+            fin=Max('date_heure'),
+            total=Count('id'),
+            series=Count('type_mesure', distinct=True),
+        )
+        if not bornes['total'] or bornes['total'] <= POINTS_PAR_SERIE * bornes['series']:
+            return 'brut'
+        etendue = (bornes['fin'] - bornes['debut']).total_seconds()
+        for resolution, (_, secondes) in RESOLUTIONS.items():
+            if etendue / secondes <= POINTS_PAR_SERIE:
+                return resolution
+        return 'jour'
+
+    def dernieres_mesures(self, limite=POINTS_PAR_SERIE):
+        """
+        Les `limite` mesures les plus recentes de chaque type (ROW_NUMBER()
+        par type en SQL), en tuples (type_mesure, date_heure, valeur) tries
+        par type puis par date.
+        """
+        return (
+            self.annotate(rang=Window(
+                RowNumber(), partition_by=F('type_mesure'), order_by=F('date_heure').desc()
+            ))
+            .filter(rang__lte=limite)
+            .order_by('type_mesure', 'date_heure')
+            .values_list('type_mesure', 'date_heure', 'valeur')
+        )
+
+    def agreger(self, resolution):
+        """
+        Regroupe les mesures par type et par intervalle (GROUP BY en SQL).
+
+        Chaque ligne contient type_mesure, periode (debut de l'intervalle),
+        moyenne, minimum, maximum et nombre.
+        """
+        tronquer, _ = RESOLUTIONS[resolution]
+        return (
+            self.annotate(periode=tronquer('date_heure'))
+            .values('type_mesure', 'periode')
+            .annotate(
+                moyenne=Avg('valeur'),
+                minimum=Min('valeur'),
+                maximum=Max('valeur'),
+                nombre=Count('id'),
+            )
+            .order_by('type_mesure', 'periode')
+        )
+
+
+class SigneVital(models.Model):
+    """Modele pour une mesure de signe vital."""
+
+    TYPE_CHOICES = [(code, infos[0]) for code, infos in TYPES_SIGNES_VITAUX.items()]
+
+    # Pas d'index propre: signe_vital_serie_idx commence par id_session
+    id_session = models.ForeignKey(
+        Session,
+        on_delete=models.CASCADE,
+        related_name='signes_vitaux',
+        db_index=False
+    )
+    id_personnel = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name='signes_vitaux'
+    )
+    type_mesure = models.CharField(max_length=30, choices=TYPE_CHOICES)
+    valeur = models.FloatField()
+    date_heure = models.DateTimeField(default=timezone.now)
+
+    objects = SigneVitalQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['date_heure']
+        verbose_name = 'Signe Vital'
+        verbose_name_plural = 'Signes Vitaux'
+        indexes = [
+            # Series: une session, un type, ordonne dans le temps
+            models.Index(
+                fields=['id_session', 'type_mesure', 'date_heure'],
+                name='signe_vital_serie_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.type_mesure}={self.valeur} - Session {self.id_session_id}"
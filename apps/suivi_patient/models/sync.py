@@ -0,0 +1,64 @@
+"""
+Modeles de support pour la synchronisation incrementale (delta-sync).
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class SyncTrackedModel(models.Model):
+    """
+    Modele abstrait ajoutant un horodatage de derniere modification.
+
+    Le champ updated_at est maintenu a chaque save(), y compris lorsque
+    update_fields est fourni (Django ignore sinon les champs auto_now).
+    Les mises a jour via QuerySet.update() doivent renseigner
+    updated_at explicitement.
+    """
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        """Ajoute updated_at aux update_fields si une liste est fournie."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'updated_at' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['updated_at']
+        super().save(*args, **kwargs)
+
+
+class SyncTombstone(models.Model):
+    """
+    Trace d'une suppression pour les flux de synchronisation.
+
+    Une ligne est creee par signal post_delete pour chaque Patient,
+    Session ou RendezVous supprime, afin que les clients puissent
+    retirer l'objet de leur cache local.
+    """
+
+    RESOURCE_CHOICES = [
+        ('patients', 'Patients'),
+        ('sessions', 'Sessions'),
+        ('rendez-vous', 'Rendez-vous'),
+    ]
+
+    resource = models.CharField(max_length=20, choices=RESOURCE_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        verbose_name = 'Suppression (synchronisation)'
+        verbose_name_plural = 'Suppressions (synchronisation)'
+        indexes = [
+            models.Index(fields=['resource', 'deleted_at', 'id'], name='tombstone_sync_idx'),
+        ]
+
+    def __str__(self):
+        return f"Suppression {self.resource} #{self.object_id} ({self.deleted_at})"
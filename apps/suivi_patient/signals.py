@@ -0,0 +1,58 @@
+"""
+Signaux pour l'application suivi_patient.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from api import audit
+from apps.suivi_patient.models import Patient, Session, RendezVous, SyncTombstone
+from apps.suivi_patient.models.audit import CHEMINS_PATIENT
+
+
+SYNC_RESOURCES = {
+    Patient: 'patients',
+    Session: 'sessions',
+    RendezVous: 'rendez-vous',
+}
+
+
+@receiver(post_delete, sender=Patient)
+@receiver(post_delete, sender=Session)
+@receiver(post_delete, sender=RendezVous)
+def enregistrer_suppression(sender, instance, **kwargs):
+    """Cree une tombstone pour que les flux de synchronisation propagent la suppression."""
+    SyncTombstone.objects.create(
+        resource=SYNC_RESOURCES[sender],
+        object_id=instance.pk,
+    )
+
+
+def auditer_ecriture(sender, instance, created, using, raw=False, **kwargs):
+    """Journalise la creation ou la modification d'un objet du dossier patient."""
+    if not raw:
+        audit.auditer_instances('creation' if created else 'modification', [instance], using)
+
+
+def preparer_suppression(sender, instance, **kwargs):
+    """Annonce l'objet supprime pour resoudre les patients de la cascade en bloc."""
+    audit.preparer_suppression(instance)
+
+
+def auditer_suppression(sender, instance, using, **kwargs):
+    """Journalise la suppression d'un objet du dossier patient."""
+    audit.auditer(
+        'suppression', instance._meta.label_lower,
+        [(instance.pk, audit.patient_supprime(instance))], using
+    )
+
+
+for label in CHEMINS_PATIENT:
+    modele = apps.get_model(label)
+    post_save.connect(auditer_ecriture, sender=modele, dispatch_uid=f'audit_ecriture_{label}')
+    pre_delete.connect(preparer_suppression, sender=modele, dispatch_uid=f'audit_preparation_{label}')
+    post_delete.connect(auditer_suppression, sender=modele, dispatch_uid=f'audit_suppression_{label}')
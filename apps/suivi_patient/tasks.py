@@ -0,0 +1,141 @@
+"""
+Taches Celery pour l'application suivi_patient.
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from api.db_router import sur_replica
+
+
+@shared_task
+def purge_sync_tombstones():
+    """
+    Tache periodique supprimant les tombstones de synchronisation expirees.
+
+    Les clients dont le jeton est plus ancien que la retention recoivent
+    un 410 et doivent refaire une synchronisation complete.
+
+    Returns:
+        str: Nombre de tombstones supprimees
+    """
+    from apps.suivi_patient.models import SyncTombstone
+
+    retention = getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30)
+    limite = timezone.now() - timedelta(days=retention)
+    count, _ = SyncTombstone.objects.filter(deleted_at__lt=limite).delete()
+
+    return f"Supprime {count} tombstone(s) de synchronisation"
+
+
+@shared_task
+def generer_frais_hospitalisation(jour=None):
+    """
+    Tache periodique generant les lignes de frais de la veille pour chaque lit occupe.
+
+    Executee peu apres minuit, elle facture le jour qui vient de se terminer:
+    une admission de fin de soiree est ainsi facturee pour son jour d'entree.
+    Une ligne par hospitalisation ayant occupe un lit ce jour-la, au tarif
+    journalier de la chambre, inseree en une seule requete (bulk_create).
+    Idempotente: les hospitalisations deja facturees pour ce jour sont
+    ignorees et la contrainte frais_hospitalisation_jour_unique ecarte les
+    doublons d'une execution concurrente.
+
+    Args:
+        jour (str): Date ISO (AAAA-MM-JJ) a facturer (defaut: hier, pour les rattrapages
+            passer la date explicitement)
+
+    Returns:
+        str: Nombre de lignes generees
+    """
+    from datetime import date
+
+    from django.db.models import Exists, OuterRef
+    from apps.suivi_patient.models import FraisHospitalisation, Hospitalisation
+
+    jour = date.fromisoformat(jour) if jour else timezone.localdate() - timedelta(days=1)
+    a_facturer = (
+        Hospitalisation.objects.occupant_le(jour)
+        .filter(
+            ~Exists(FraisHospitalisation.objects.filter(id_hospitalisation=OuterRef('pk'), jour=jour))
+        )
+        .order_by()
+        .values_list('id', 'id_chambre__tarif_journalier')
+    )
+    lignes = FraisHospitalisation.objects.bulk_create(
+        [
+            FraisHospitalisation(id_hospitalisation_id=id_hospitalisation, jour=jour, montant=tarif)
+            for id_hospitalisation, tarif in a_facturer
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+    return f"Genere {len(lignes)} ligne(s) de frais d'hospitalisation pour le {jour.isoformat()}"
+
+
+@shared_task
+@sur_replica
+def detecter_doublons_patients():
+    """
+    Tache periodique alimentant la file de revue des doublons de patients.
+
+    Les lectures (parcours de tous les patients) vont sur la replique; la
+    contrainte d'unicite des paires ecarte un doublon deja insere mais non
+    encore replique.
+
+    Returns:
+        str: Statistiques de la detection
+    """
+    from apps.suivi_patient.doublons import detecter_doublons
+
+    stats = detecter_doublons()
+
+    return (
+        f"{stats['nouveaux_doublons']} doublon(s) detecte(s) sur {stats['patients']} patient(s) "
+        f"({stats['comparaisons']} comparaison(s))"
+    )
+
+
+@shared_task
+def ecrire_journal_audit():
+    """
+    Tache periodique ecrivant le journal d'audit medical.
+
+    Transfere les lots d'evenements mis en attente dans Redis par les
+    processus de l'API vers la table EvenementAudit (bulk_create).
+
+    Returns:
+        str: Nombre d'evenements ecrits
+    """
+    from api.audit import transferer_vers_base
+
+    count = transferer_vers_base()
+
+    return f"Ecrit {count} evenement(s) d'audit"
+
+
+@shared_task
+def creer_partitions_audit():
+    """
+    Tache periodique creant les partitions mensuelles du journal d'audit.
+
+    Le mois courant et les AUDIT_PARTITIONS_AHEAD mois suivants ont leur
+    partition (PostgreSQL uniquement), les evenements ne tombent donc pas
+    dans la partition par defaut.
+
+    Returns:
+        str: Partitions creees
+    """
+    from api.audit import creer_partitions
+
+    creees = creer_partitions()
+
+    return f"Cree {len(creees)} partition(s) d'audit: {', '.join(creees) or 'aucune'}"
@@ -6,83 +6,107 @@
 set -e  # Arrêter le script en cas d'erreur
 
 # ============================================
-# 1. Attendre que la base de données soit prête
+# Mode de démarrage
 # ============================================
-echo "Verification de la disponibilite de la base de donnees..."
+# FAST_START=True : une seule commande Django (fast_start) attend la base,
+# verifie le plan de migrations, ne collecte les statiques que si leur
+# empreinte a change et construit le schema OpenAPI (un echec du schema
+# n'est qu'un avertissement, comme en mode standard).
+DEMARRAGE_MS=$(date +%s%3N)
 
-# Utiliser netcat pour vérifier si PostgreSQL est accessible
-# Essayer plusieurs fois avec un délai entre chaque tentative
-max_attempts=30
-attempt=1
-
-while [ $attempt -le $max_attempts ]; do
-    if nc -z -w 2 "$DB_HOST" "$DB_PORT"; then
-        echo "Base de donnees PostgreSQL disponible sur $DB_HOST:$DB_PORT"
-        break
-    fi
-    
-    echo "Tentative $attempt/$max_attempts - Base de donnees non disponible, nouvel essai dans 2 secondes..."
-    sleep 2
-    attempt=$((attempt + 1))
-done
-
-if [ $attempt -gt $max_attempts ]; then
-    echo "ERREUR : Impossible de se connecter à la base de donnees apres $max_attempts tentatives"
-    echo "   Verifiez que:"
-    echo "   1. Le service PostgreSQL est demarre"
-    echo "   2. Les variables DB_HOST et DB_PORT sont correctes"
-    echo "   3. Le reseau Docker est correctement configure"
-    exit 1
-fi
-
-# ============================================
-# 2. Attendre que PostgreSQL accepte les connexions
-# ============================================
-echo "Verification que PostgreSQL accepte les connexions..."
-
-# Utiliser pg_isready pour vérifier l'état de PostgreSQL
-for i in {1..10}; do
-    if pg_isready -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER"; then
-        echo "PostgreSQL pret a accepter les connexions"
-        break
-    fi
+if [ "$FAST_START" = "True" ]; then
+    echo "Demarrage rapide (FAST_START=True)..."
+    python manage.py fast_start --db-timeout "${DB_WAIT_TIMEOUT:-60}"
+else
+    # ============================================
+    # 1. Attendre que la base de données soit prête
+    # ============================================
+    echo "Verification de la disponibilite de la base de donnees..."
+
+    # Utiliser netcat pour vérifier si PostgreSQL est accessible
+    # Essayer plusieurs fois avec un délai entre chaque tentative
+    max_attempts=30
+    attempt=1
+
+    while [ $attempt -le $max_attempts ]; do
+        if nc -z -w 2 "$DB_HOST" "$DB_PORT"; then
+            echo "Base de donnees PostgreSQL disponible sur $DB_HOST:$DB_PORT"
+            break
+        fi
     
-    if [ $i -eq 10 ]; then
-        echo "ERREUR : PostgreSQL ne repond pas après 10 tentatives"
+        echo "Tentative $attempt/$max_attempts - Base de donnees non disponible, nouvel essai dans 2 secondes..."
+        sleep 2
+        attempt=$((attempt + 1))
+    done
+
+    if [ $attempt -gt $max_attempts ]; then
+        echo "ERREUR : Impossible de se connecter à la base de donnees apres $max_attempts tentatives"
+        echo "   Verifiez que:"
+        echo "   1. Le service PostgreSQL est demarre"
+        echo "   2. Les variables DB_HOST et DB_PORT sont correctes"
+        echo "   3. Le reseau Docker est correctement configure"
         exit 1
     fi
-    
-    echo "PostgreSQL ne repond pas encore, nouvel essai dans 3 secondes... ($i/10)"
-    sleep 3
-done
 
-# ============================================
-# 3. Créer et appliquer les migrations de base de données
-# ============================================
-echo "Creation des migrations si necessaire..."
+    # ============================================
+    # 2. Attendre que PostgreSQL accepte les connexions
+    # ============================================
+    echo "Verification que PostgreSQL accepte les connexions..."
+
+    # Utiliser pg_isready pour vérifier l'état de PostgreSQL
+    for i in {1..10}; do
+        if pg_isready -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER"; then
+            echo "PostgreSQL pret a accepter les connexions"
+            break
+        fi
+    
+        if [ $i -eq 10 ]; then
+            echo "ERREUR : PostgreSQL ne repond pas après 10 tentatives"
+            exit 1
+        fi
+    
+        echo "PostgreSQL ne repond pas encore, nouvel essai dans 3 secondes... ($i/10)"
+        sleep 3
+    done
+
+    # ============================================
+    # 3. Appliquer les migrations de base de données
+    # ============================================
+    # Aucune migration n'est generee au demarrage : seules les migrations
+    # livrees avec le code sont appliquees.
+    if ! python manage.py makemigrations --check --dry-run > /dev/null 2>&1; then
+        echo "ATTENTION : des modifications de modeles n'ont pas de migration livree"
+    fi
 
-# Créer les migrations pour toutes les apps
-# Répond automatiquement 'y' aux questions de renommage de champs
-yes | python manage.py makemigrations
+    echo "Application des migrations de base de donnees..."
 
-echo "Application des migrations de base de donnees..."
+    # Appliquer les migrations
+    python manage.py migrate --noinput
 
-# Appliquer les migrations
-python manage.py migrate --noinput
+    echo "Migrations appliquees avec succes"
 
-echo "Migrations appliquees avec succes"
+    # ============================================
+    # 4. Collecter les fichiers statiques
+    # ============================================
+    echo "Collecte des fichiers statiques..."
 
-# ============================================
-# 4. Collecter les fichiers statiques
-# ============================================
-echo "Collecte des fichiers statiques..."
+    # Mode développement : pas besoin de collectstatic à chaque fois
+    if [ "$DJANGO_DEBUG" = "False" ] || [ "$COLLECT_STATIC" = "True" ]; then
+        python manage.py collectstatic --noinput --clear
+        echo "Fichiers statiques collectes"
+    else
+        echo "Mode développement : collectstatic ignoré"
+    fi
 
-# Mode développement : pas besoin de collectstatic à chaque fois
-if [ "$DJANGO_DEBUG" = "False" ] || [ "$COLLECT_STATIC" = "True" ]; then
-    python manage.py collectstatic --noinput --clear
-    echo "Fichiers statiques collectes"
-else
-    echo "Mode développement : collectstatic ignoré"
+    # ============================================
+    # 4 bis. Construire le schema OpenAPI servi par /api/schema/
+    # ============================================
+    echo "Construction du schema OpenAPI..."
+    if python manage.py build_openapi_schema; then
+        echo "Schema OpenAPI construit"
+    else
+        echo "Schema OpenAPI non construit : /api/schema/ sera genere a la demande"
+    fi
 fi
 
 # ============================================
@@ -109,21 +133,31 @@ else:
 fi
 
 # ============================================
-# 6. Vérification de la santé de l'application
+# 6. Vérification de la santé de l'application (mode standard)
 # ============================================
-echo "🔍 Verification de la sante de l'application..."
+if [ "$FAST_START" != "True" ]; then
+    echo "🔍 Verification de la sante de l'application..."
 
-# Vérifier si Django peut se lancer correctement
-if python manage.py check --deploy 2>/dev/null || python manage.py check 2>/dev/null; then
-    echo "Application Django en bonne sante"
-else
-    echo " Avertissements lors de la verification de l'application"
+    # Vérifier si Django peut se lancer correctement
+    if python manage.py check --deploy 2>/dev/null || python manage.py check 2>/dev/null; then
+        echo "Application Django en bonne sante"
+    else
+        echo " Avertissements lors de la verification de l'application"
+    fi
+fi
+
+# ============================================
+# 7. Réinitialiser les métriques Prometheus multiprocess
+# ============================================
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
 fi
 
 # ============================================
-# 7. Exécuter la commande passée
+# 8. Exécuter la commande passée
 # ============================================
-echo "Demarrage de l'application Django..."
+echo "Demarrage de l'application Django (preparation: $(( $(date +%s%3N) - DEMARRAGE_MS )) ms)..."
 echo "========================================"
 
 # Exécuter la commande passée en paramètre (ou la commande par défaut)
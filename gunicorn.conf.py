@@ -0,0 +1,16 @@
+"""
+Configuration gunicorn (chargee automatiquement depuis le repertoire courant).
+
+Author: DeDjomo
+Email: dedjomokarlyn@gmail.com
+Organization: ENSPY (Ecole Nationale Superieure Polytechnique de Yaounde)
+Date: 2026-10-19
+"""
+import os
+
+
+def child_exit(server, worker):
+    """Libere les fichiers de metriques Prometheus d'un worker termine."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)